@@ -0,0 +1,77 @@
+"""
+Import-time budget of the pipeline entry points, measured with `python -X importtime`
+in a fresh interpreter (the cold start of an ECS task).
+
+The predict path must only import the dependencies of the configured backend: with the
+default csv_s3 source and CSV storage, neither the MySQL client (sqlalchemy, pymysql),
+requests, sklearn, mlflow, joblib (model artifacts) nor pyarrow's Parquet module may be
+imported by `mlops_project.predict_pipeline` (pyarrow itself is imported by pandas when it
+is installed). Forbidden names match the module and its submodules. The script prints the
+slowest imports and exits with status 1 when the cumulative import time exceeds
+`--budget-ms` (best of `--repeat` runs) or a forbidden module is imported.
+
+Usage:
+    PYTHONPATH=src python benchmarks/import_time.py --budget-ms 1500
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+FORBIDDEN = ["sqlalchemy", "pymysql", "requests", "sklearn", "scipy", "mlflow", "joblib", "pyarrow.parquet"]
+
+
+def import_times(module: str) -> dict:
+    """Cumulative import time (microseconds) of every module imported by `module`."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, env=os.environ)
+    if result.returncode != 0:
+        sys.exit(f"❌ import {module} failed:\n{result.stderr}")
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="mlops_project.predict_pipeline")
+    parser.add_argument("--budget-ms", type=float, default=1500)
+    parser.add_argument("--forbidden", default=",".join(FORBIDDEN),
+                        help="modules (and their submodules) the module must not import, comma separated (empty to skip)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs, the fastest one is kept")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    runs = [import_times(args.module) for _ in range(args.repeat)]
+    times = min(runs, key=lambda run: run[args.module])
+    total_ms = times[args.module] / 1000
+    forbidden = [name for name in args.forbidden.split(",") if name]
+    imported = sorted({name for name in times
+                       if any(name == module or name.startswith(f"{module}.") for module in forbidden)})
+
+    print(json.dumps({
+        "module": args.module,
+        "total_ms": round(total_ms, 1),
+        "budget_ms": args.budget_ms,
+        "slowest": {name: round(us / 1000, 1) for name, us in
+                    sorted(times.items(), key=lambda item: -item[1])[1:args.top + 1]},
+    }, indent=2))
+
+    failures = []
+    if total_ms > args.budget_ms:
+        failures.append(f"import {args.module} took {total_ms:.0f}ms, over the {args.budget_ms:.0f}ms budget")
+    if imported:
+        failures.append(f"forbidden modules imported: {', '.join(imported)}")
+    if failures:
+        print("❌ " + "\n❌ ".join(failures))
+        sys.exit(1)
+    print(f"✅ import {args.module}: {total_ms:.0f}ms (budget {args.budget_ms:.0f}ms)")
+
+
+if __name__ == "__main__":
+    main()
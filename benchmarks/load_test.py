@@ -0,0 +1,85 @@
+"""
+Local load test for the scoring service (`python src/mlops_project/serve.py`).
+
+Sends single-row requests from concurrent clients and reports p50/p99 latency and throughput.
+
+Usage:
+    python benchmarks/load_test.py --url http://localhost:8080/predict \
+        --payload '{"Pclass": 3, "Sex": "male", "Age": 22}' --concurrency 32 --requests 2000
+"""
+import argparse
+import json
+import threading
+import time
+import urllib.request
+
+import numpy as np
+
+
+def send(url: str, body: bytes) -> float:
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def run(url: str, payload: dict, concurrency: int, n_requests: int) -> dict:
+    body = json.dumps(payload).encode("utf-8")
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    counter = iter(range(n_requests))
+
+    def client():
+        while True:
+            with lock:
+                if next(counter, None) is None:
+                    return
+            try:
+                latency = send(url, body)
+                with lock:
+                    latencies.append(latency)
+            except Exception as e:
+                with lock:
+                    errors.append(str(e))
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "concurrency": concurrency,
+        "p50_ms": float(np.percentile(latencies_ms, 50)) if len(latencies_ms) else None,
+        "p99_ms": float(np.percentile(latencies_ms, 99)) if len(latencies_ms) else None,
+        "throughput_rps": len(latencies) / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8080/predict")
+    parser.add_argument("--payload", required=True, help="JSON row, or @path/to/row.json")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.payload.startswith("@"):
+        with open(args.payload[1:]) as f:
+            payload = json.load(f)
+    else:
+        payload = json.loads(args.payload)
+
+    send(args.url, json.dumps(payload).encode("utf-8"))  # Warm-up
+    print(json.dumps(run(args.url, payload, args.concurrency, args.requests), indent=2))
+
+
+if __name__ == "__main__":
+    main()
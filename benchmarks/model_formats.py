@@ -0,0 +1,108 @@
+"""
+Compares the model artifact formats of S3Handler (see `dump_model`): plain pickle and
+joblib, uncompressed (memory-mappable) or compressed with each available codec.
+
+Measures the artifact size, save time, load time and the private memory a fresh process
+gains by loading the model (Linux, memory-mapped pages are shared through the page cache
+and not counted) on a forest trained on a synthetic dataset.
+
+Usage:
+    python benchmarks/model_formats.py --rows 100000 --features 20 --trees 200
+"""
+import argparse
+import importlib.util
+import json
+import multiprocessing
+import os
+import pickle
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+from mlops_project.utils.s3_handler import MODEL_COMPRESSIONS, dump_model, load_model
+
+
+def timed(fn, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+LOADERS = {}  # Format name -> load function, inherited by the forked processes
+
+
+def private_mb() -> float:
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            fields = dict(line.split(":", 1) for line in f if line.startswith("Private"))
+    except OSError:
+        return float("nan")
+    return sum(int(value.split()[0]) for value in fields.values()) / 1024
+
+
+def load_private_mb(name: str, path: str) -> float:
+    before = private_mb()
+    model = LOADERS[name](path)
+    private = private_mb() - before
+    del model  # Held until measured, or its pages would be freed before the reading
+    return private
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--features", type=int, default=20)
+    parser.add_argument("--trees", type=int, default=100)
+    parser.add_argument("--level", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    X = rng.normal(size=(args.rows, args.features))
+    y = (X[:, 0] + rng.normal(size=args.rows) > 0).astype(int)
+    model = RandomForestClassifier(n_estimators=args.trees, random_state=42, n_jobs=-1).fit(X, y)
+
+    def save_pickle(path):
+        with open(path, "wb") as f:
+            pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def load_pickle(path):
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    formats = {"pickle": (save_pickle, load_pickle)}
+    for compress in MODEL_COMPRESSIONS:
+        if compress == "lz4" and importlib.util.find_spec("lz4") is None:
+            continue
+        name = f"joblib-{compress}" if compress else "joblib"
+        formats[name] = (lambda path, c=compress: dump_model(model, path, c, args.level), load_model)
+    formats["joblib-mmap"] = (formats["joblib"][0], lambda path: load_model(path, mmap_mode="r"))
+
+    LOADERS.update({name: load for name, (_, load) in formats.items()})
+    pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("fork"))
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp, pool:
+        for name, (save, load) in formats.items():
+            path = os.path.join(tmp, name)
+            _, save_s = timed(lambda: save(path), args.repeat)
+            loaded, load_s = timed(lambda: load(path), args.repeat)
+            results[name] = {
+                "size_mb": round(os.path.getsize(path) / 1024 ** 2, 2),
+                "save_s": round(save_s, 4),
+                "load_s": round(load_s, 4),
+                "load_private_mb": round(pool.submit(load_private_mb, name, path).result(), 2),
+                "same_predictions": bool((loaded.predict(X[:1000]) == model.predict(X[:1000])).all()),
+            }
+
+    print(json.dumps({"rows": args.rows, "trees": args.trees, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+End-to-end benchmark of the pipelines on synthetic datasets.
+
+Generates classification and regression datasets at scaled sizes (rows x numeric x
+categorical columns), then runs DataLoader, DataProcessor, ModelTrainer and Predictor
+against local stand-ins:
+
+- S3: moto, in process (default), or any S3 compatible endpoint such as MinIO with
+  `--s3 env` (AWS_ENDPOINT_URL, AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, S3_BUCKET_NAME).
+- MySQL: with `--mysql`, the dataset is written to the `pima_diabetes` table of
+  MYSQL_DB_DATASETS (MYSQL_HOST, MYSQL_PORT, ...) and loaded through the mysql source.
+  Point it to a scratch database (e.g. a local MariaDB): the table is replaced.
+- MLflow: MLFLOW_TRACKING_URI, by default a temporary file store.
+
+Every stage is measured with `Instrumentation` (best of `--repeat` runs). The results
+are written to a JSON file and, with `--baseline`, compared to a previous results file:
+the script exits with status 1 when a stage is slower than the baseline by more than
+`--tolerance` (and `--min-delta` seconds).
+
+Usage:
+    PYTHONPATH=src python benchmarks/pipeline.py --sizes 10000x10x3,100000x20x5 \\
+        --output benchmarks/results.json --baseline benchmarks/baseline.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+BUCKET = "mlops-benchmark"
+PROJECT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "mlops_project")
+STAGES = ["load", "process", "train", "predict"]
+
+
+def make_dataset(task: str, rows: int, numeric: int, categorical: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    data = {"id": np.arange(1, rows + 1)}
+    signal = np.zeros(rows)
+    for i in range(numeric):
+        values = rng.normal(loc=i, scale=1 + i % 3, size=rows)
+        signal += (values - i) * rng.normal()
+        values[rng.random(rows) < 0.05] = np.nan  # Exercise the imputation
+        data[f"num_{i}"] = values
+    for i in range(categorical):
+        levels = np.array([f"level_{level}" for level in range(3 + i % 5)])
+        codes = rng.integers(0, len(levels), size=rows)
+        signal += (codes == 0) * rng.normal()
+        values = levels[codes].astype(object)
+        values[rng.random(rows) < 0.05] = None
+        data[f"cat_{i}"] = values
+
+    noise = rng.normal(scale=0.5, size=rows)
+    if task == "classification":
+        data["target"] = (signal + noise > np.median(signal)).astype(int)
+    else:
+        data["target"] = signal + noise
+    return pd.DataFrame(data)
+
+
+def parse_sizes(sizes: str) -> list:
+    parsed = []
+    for size in sizes.split(","):
+        rows, numeric, categorical = (int(value) for value in size.lower().split("x"))
+        parsed.append((rows, numeric, categorical))
+    return parsed
+
+
+def s3_stand_in(mode: str):
+    if mode == "env":
+        return contextlib.nullcontext()
+    try:
+        from moto import mock_aws
+    except ImportError:
+        sys.exit("moto is required for the in-process S3 stand-in (pip install moto), or use --s3 env")
+    for name, value in {"AWS_ACCESS_KEY_ID": "benchmark", "AWS_SECRET_ACCESS_KEY": "benchmark",
+                        "AWS_DEFAULT_REGION": "us-east-1"}.items():
+        os.environ.setdefault(name, value)
+    return mock_aws()
+
+
+def run_scenario(config: dict, df: pd.DataFrame, mysql: bool) -> dict:
+    from mlops_project.utils.data_loader import DataLoader
+    from mlops_project.utils.data_processing import DataProcessor
+    from mlops_project.utils.instrumentation import Instrumentation
+    from mlops_project.utils.model_training import ModelTrainer
+    from mlops_project.utils.mysql_handler import MySQLHandler
+    from mlops_project.utils.prediction import Predictor
+    from mlops_project.utils.s3_handler import FORMAT_EXTENSIONS, S3Handler
+
+    bucket = os.environ["S3_BUCKET_NAME"]
+    project = config["project_name"]
+    extension = FORMAT_EXTENSIONS[config.get("storage_format") or "csv"]
+    if mysql:
+        with MySQLHandler(config, os.getenv("MYSQL_DB_DATASETS")).engine.begin() as conn:
+            df.to_sql("pima_diabetes", conn, if_exists="replace", index=False, chunksize=10000)
+    else:
+        S3Handler(bucket, config).save_dataframe_to_s3(df, config["s3_csv_key"], index=False)
+
+    instrumentation = Instrumentation("benchmark", config)
+    with instrumentation.stage("load") as stage:
+        df_raw = DataLoader(config).run()
+        stage["rows_out"] = len(df_raw)
+    with instrumentation.stage("process") as stage:
+        processor = DataProcessor(bucket=bucket, raw_data=df_raw, config=config)
+        df_processed = processor.run()
+        stage["rows_in"], stage["rows_out"] = len(df_raw), len(df_processed)
+    with instrumentation.stage("train") as stage:
+        trainer = ModelTrainer(bucket=bucket, df_processed=df_processed, model_key=f"models/{project}_model.pkl",
+                               X_train_key=f"datasets/{project}_X_train.{extension}", config=config)
+        trainer.run()
+        stage["rows_in"] = len(df_processed)
+    with instrumentation.stage("predict") as stage:
+        predictor = Predictor(bucket=bucket, model_key=f"models/{project}_model.pkl", processed_data=df_processed,
+                              prediction_output_key=f"predictions/{project}_preds.{extension}", config=config)
+        stage["rows_out"] = len(predictor.run())
+    return {record["stage"]: record for record in instrumentation.stages}
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_delta: float) -> list:
+    regressions = []
+    for scenario, stages in results["scenarios"].items():
+        for stage, record in stages.items():
+            reference = baseline.get("scenarios", {}).get(scenario, {}).get(stage)
+            if not reference or not reference.get("wall_s"):
+                continue
+            ratio = record["wall_s"] / reference["wall_s"]
+            record["baseline_ratio"] = round(ratio, 3)
+            if ratio > 1 + tolerance and record["wall_s"] - reference["wall_s"] > min_delta:
+                regressions.append(f"{scenario}/{stage}: {record['wall_s']:.3f}s vs {reference['wall_s']:.3f}s "
+                                   f"(x{ratio:.2f})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000x10x3,50000x20x5", help="rows x numeric x categorical, comma separated")
+    parser.add_argument("--tasks", default="classification,regression")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per scenario, the best time of each stage is kept")
+    parser.add_argument("--s3", choices=["moto", "env"], default="moto")
+    parser.add_argument("--mysql", action="store_true", help="load the datasets through MySQL instead of S3")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="previous results file to compare to")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown over the baseline (0.2 -> 20%%)")
+    parser.add_argument("--min-delta", type=float, default=0.05,
+                        help="slowdowns below this many seconds are ignored (timer noise of short stages)")
+    args = parser.parse_args()
+
+    from mlops_project.config.config_loader import load_config
+
+    # Relative paths are resolved like in the pipelines (config/dev.yaml, config/queries.sql)
+    output = os.path.abspath(args.output)
+    baseline = os.path.abspath(args.baseline) if args.baseline else None
+    os.chdir(PROJECT_DIR)
+    os.environ.setdefault("S3_BUCKET_NAME", BUCKET)
+    os.environ.setdefault("MLFLOW_TRACKING_URI", "file://" + tempfile.mkdtemp(prefix="mlruns_"))
+    base_config = load_config("./config/dev.yaml")
+    results = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "source": "mysql" if args.mysql else "csv_s3",
+        "scenarios": {},
+    }
+
+    with s3_stand_in(args.s3):
+        import boto3
+        s3 = boto3.client("s3")
+        if os.environ["S3_BUCKET_NAME"] not in {bucket["Name"] for bucket in s3.list_buckets()["Buckets"]}:
+            s3.create_bucket(Bucket=os.environ["S3_BUCKET_NAME"])
+
+        for task in args.tasks.split(","):
+            for rows, numeric, categorical in parse_sizes(args.sizes):
+                scenario = f"{task}_{rows}x{numeric}x{categorical}"
+                df = make_dataset(task, rows, numeric, categorical)
+                best = {}
+                for i in range(args.repeat):
+                    # A fresh project per run, so every run trains from scratch with cold caches
+                    project = f"benchmark-{scenario}-{i}"
+                    config = dict(base_config, project_name=project, type=task, target="target", id_column="id",
+                                  data_source="mysql" if args.mysql else "csv_s3",
+                                  s3_csv_key=f"benchmarks/{project}.csv", mysql_incremental={"enabled": False},
+                                  search={"enabled": False}, instrumentation={"mlflow": False},
+                                  model_cache={"dir": tempfile.mkdtemp(prefix="model_cache_")})
+                    for stage, record in run_scenario(config, df, args.mysql).items():
+                        if stage not in best or record["wall_s"] < best[stage]["wall_s"]:
+                            best[stage] = record
+                results["scenarios"][scenario] = {
+                    stage: {key: value for key, value in best[stage].items() if key not in ("event", "pipeline", "stage")}
+                    for stage in STAGES
+                }
+                print(f"⏱ {scenario}: " + ", ".join(f"{stage} {best[stage]['wall_s']:.3f}s" for stage in STAGES))
+
+    regressions = []
+    if baseline:
+        with open(baseline, "r") as f:
+            regressions = compare(results, json.load(f), args.tolerance, args.min_delta)
+        results["regressions"] = regressions
+
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"✅ Results written to {output}")
+
+    if regressions:
+        print("❌ Regressions over the baseline:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Compares the CSV, Parquet and Arrow IPC dataset formats of S3Handler.
+
+Measures the serialized size, write (serialize) time, full read time and projected read
+time (a quarter of the columns) on a synthetic processed-like dataset. The S3 transfer
+itself is left out: it scales with the size column.
+
+Usage:
+    python benchmarks/storage_formats.py --rows 500000 --numeric 20 --categorical 5
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from mlops_project.utils.s3_handler import FORMAT_EXTENSIONS, dataframe_from_bytes, dataframe_to_bytes
+
+
+def make_dataset(rows: int, numeric: int, categorical: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    data = {f"num_{i}": rng.normal(size=rows) for i in range(numeric)}
+    for i in range(categorical):
+        for level in range(4):
+            data[f"cat_{i}_{level}"] = rng.random(rows) < 0.25
+    df = pd.DataFrame(data, index=pd.RangeIndex(rows, name="id") + 1000)
+    return df.sample(frac=1, random_state=seed)  # Non-trivial index
+
+
+def timed(fn, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--numeric", type=int, default=20)
+    parser.add_argument("--categorical", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_dataset(args.rows, args.numeric, args.categorical)
+    projection = list(df.columns[: max(1, len(df.columns) // 4)])
+
+    results = {}
+    for fmt in FORMAT_EXTENSIONS:
+        raw, write_s = timed(lambda: dataframe_to_bytes(df, fmt), args.repeat)
+        loaded, read_s = timed(lambda: dataframe_from_bytes(raw, fmt), args.repeat)
+        _, projected_read_s = timed(lambda: dataframe_from_bytes(raw, fmt, columns=projection), args.repeat)
+        results[fmt] = {
+            "size_mb": round(len(raw) / 1024 ** 2, 2),
+            "write_s": round(write_s, 4),
+            "read_s": round(read_s, 4),
+            "projected_read_s": round(projected_read_s, 4),
+            "dtypes_preserved": bool((loaded.dtypes.reindex(df.columns) == df.dtypes).all()),
+            "index_preserved": loaded.index.equals(df.index),
+        }
+
+    print(json.dumps({"rows": args.rows, "columns": df.shape[1], "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -14,3 +14,6 @@ CREATE TABLE IF NOT EXISTS pima_diabetes (
 
 -- name: select_all
 SELECT * FROM pima_diabetes;
+
+-- name: select_since
+SELECT * FROM pima_diabetes WHERE id > :watermark ORDER BY id;
@@ -4,42 +4,108 @@ from dotenv import load_dotenv
 from mlops_project.config.config_loader import load_config
 from mlops_project.utils.data_loader import DataLoader
 from mlops_project.utils.data_processing import DataProcessor
+from mlops_project.utils.instrumentation import Instrumentation
 from mlops_project.utils.prediction import Predictor
+from mlops_project.utils.prefetch import Prefetcher, PrefetchIterator
+from mlops_project.utils.s3_handler import FORMAT_EXTENSIONS
 
 def main():
     # Load env + config
     load_dotenv()
     config = load_config("./config/dev.yaml")
+    chunksize = config.get("predict_chunksize")
+    extension = FORMAT_EXTENSIONS[config.get("storage_format") or "csv"]
+    prediction_output_key = f"predictions/{config['project_name']}_preds.{extension}"
+    model_key = f"models/{config['project_name']}_model.pkl"
+    instrumentation = Instrumentation("predict", config)
 
-
-    # Step 1: Download
-    print("⬇️ Step 1: Downloading Data...")
     data_loader = DataLoader(config)
-    df_raw = data_loader.run()
-
-    # Step 2: Preprocessing
-    print("🧹 Step 2: Preprocessing data...")
     processor = DataProcessor(
         bucket=os.getenv("S3_BUCKET_NAME"),
-        raw_data=df_raw,
+        raw_data=None,
         config=config
     )
-    df_processed = processor.run()
-
-    # Step 3: Training
-    print("🔮 Step 3: Prediction ...")
-    prediction_output_key = f"predictions/{config['project_name']}_preds.csv"
-    model_key = f"models/{config['project_name']}_model.pkl"
     predictor = Predictor(
         bucket=os.getenv("S3_BUCKET_NAME"),
         model_key=model_key,
-        processed_data=df_processed,
+        processed_data=None,
         prediction_output_key=prediction_output_key,
         config=config
     )
-    predictor.run()
+
+    state_key = f"models/{config['project_name']}_preprocessing.json"
+    prefetch = config.get("prefetch") or {}
+    with Prefetcher() as prefetcher:
+        if prefetch.get("enabled", True):
+            # The model and the fitted state are downloaded while the data is loaded and processed
+            prefetcher.submit("state", processor.load_state, state_key)
+            predictor.prefetch_model(prefetcher)
+        else:
+            # Fitted state from the training run, no statistics recomputed
+            with instrumentation.stage("load_state"):
+                processor.load_state(state_key)
+
+        if chunksize:
+            # Steps 1 to 3 chunk by chunk: only one chunk is held in memory at a time
+            print(f"🔮 Streaming prediction by chunks of {chunksize} rows ...")
+            with instrumentation.stage("stream_predict") as stage:
+                if prefetcher.has("state"):
+                    prefetcher.result("state")
+                chunks = (processor.process_chunk(chunk) for chunk in data_loader.iter_chunks(chunksize))
+                if prefetch.get("enabled", True):
+                    # Chunk N+1 is downloaded and processed while chunk N is scored
+                    chunks = PrefetchIterator(chunks, prefetch.get("chunks", 1))
+                stage["rows_out"] = predictor.run_streaming(chunks)
+                if isinstance(chunks, PrefetchIterator):
+                    stage["chunk_wait_s"] = round(chunks.wait_s, 4)
+                stage.update(prefetcher.stats())
+        else:
+            # Step 1: Download
+            print("⬇️ Step 1: Downloading Data...")
+            with instrumentation.stage("load") as stage:
+                processor.df = data_loader.run()
+                stage["rows_out"] = len(processor.df)
+
+            # Step 2: Preprocessing
+            print("🧹 Step 2: Preprocessing data...")
+            with instrumentation.stage("process") as stage:
+                if prefetcher.has("state"):
+                    prefetcher.result("state")
+                stage["rows_in"] = len(processor.df)
+                predictor.df_processed = processor.run()
+                stage.update(processor.memory_stats)
+                stage["rows_out"] = len(predictor.df_processed)
+
+            # Step 3: Prediction
+            print("🔮 Step 3: Prediction ...")
+            with instrumentation.stage("predict") as stage:
+                stage["rows_in"] = len(predictor.df_processed)
+                predictor.run()
+                stage["rows_out"] = len(predictor.df_processed)
+                stage.update(prefetcher.stats())
+
+    instrumentation.summary()
+    if instrumentation.mlflow:
+        _log_stage_metrics(config, instrumentation)
 
     print("✅ Predict Pipeline completed successfully.")
 
+def _log_stage_metrics(config, instrumentation):
+    # The stage metrics go to a dedicated 'predict' run of the project experiment (mlflow and
+    # sqlalchemy are only imported here). The predictions are already written: an unreachable
+    # tracking store must not fail the job
+    try:
+        from mlops_project.utils.mlflow_handler import MLflowHandler
+        from mlops_project.utils.mysql_handler import MySQLHandler
+
+        mlflow_handler = MLflowHandler(MySQLHandler(config, os.getenv('MYSQL_DB_MLFLOW')), config)
+        experiment_id, _ = mlflow_handler.setup_experiment()
+        run = mlflow_handler.client.create_run(experiment_id, run_name="predict")
+        instrumentation.log_to_mlflow(mlflow_handler.client, run.info.run_id)
+        mlflow_handler.client.set_terminated(run.info.run_id)
+    except Exception as e:
+        print(f"⚠️ Stage metrics not logged to MLflow: {e}")
+
+
 if __name__ == "__main__":
     main()
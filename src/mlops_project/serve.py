@@ -0,0 +1,20 @@
+import os
+from dotenv import load_dotenv
+
+from mlops_project.config.config_loader import load_config
+from mlops_project.utils.scoring_service import ScoringService
+
+def main():
+    # Load env + config
+    load_dotenv()
+    config = load_config("./config/dev.yaml")
+    serving = config.get("serving") or {}
+
+    # Model and preprocessing state are loaded once, then every request reuses them
+    print("📦 Loading model and preprocessing state...")
+    service = ScoringService(bucket=os.getenv("S3_BUCKET_NAME"), config=config)
+
+    service.serve(host=serving.get("host", "0.0.0.0"), port=serving.get("port", 8080))
+
+if __name__ == "__main__":
+    main()
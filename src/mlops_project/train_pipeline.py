@@ -2,41 +2,263 @@ import os
 from dotenv import load_dotenv
 
 from mlops_project.config.config_loader import load_config
+from mlops_project.utils import data_processing, model_training
 from mlops_project.utils.data_loader import DataLoader
 from mlops_project.utils.data_processing import DataProcessor
-from mlops_project.utils.model_training import ModelTrainer
+from mlops_project.utils.instrumentation import Instrumentation
+from mlops_project.utils.model_training import ModelTrainer, lineage_key
+from mlops_project.utils.out_of_core import ReservoirSample, holdout_mask
+from mlops_project.utils.prefetch import PrefetchIterator
+from mlops_project.utils.s3_handler import FORMAT_EXTENSIONS
+from mlops_project.utils.stage_cache import StageCache
 
 def main():
     # Load env + config
     load_dotenv()
     config = load_config("./config/dev.yaml")
+    instrumentation = Instrumentation("train", config)
+    model_key = f"models/{config['project_name']}_model.pkl"
 
-    # Step 1: Download
-    print("⬇️ Step 1: Downloading Data...")
-    data_loader = DataLoader(config)
-    df_raw = data_loader.run()
-
-    # Step 2: Preprocessing
-    print("🧹 Step 2: Preprocessing data...")
+    _check_incremental(config)
+    incremental = (config.get("mysql_incremental") or {}).get("enabled", False)
+    data_loader = DataLoader(config, incremental=incremental)
     processor = DataProcessor(
         bucket=os.getenv("S3_BUCKET_NAME"),
-        raw_data=df_raw,
+        raw_data=None,
         config=config
     )
-    df_processed = processor.run()
+
+    # Incremental retraining updates the model with the new rows, encoded like the previous ones
+    incremental_retrain = (config.get("retrain") or {}).get("mode") == "incremental"
+    if incremental_retrain:
+        processor.load_state(f"models/{config['project_name']}_preprocessing.json", missing_ok=True)
+
+    # Datasets larger than memory are streamed chunk by chunk (the stage cache is not used)
+    if (config.get("out_of_core") or {}).get("enabled"):
+        trainer = _train_out_of_core(config, data_loader, processor, instrumentation, model_key)
+        if trainer is None:
+            print("✅ No new rows since the last run, nothing to train.")
+            return
+        _finish(config, processor, data_loader, instrumentation, None, trainer)
+        return
+
+    # Stage cache: unchanged stages (same input fingerprint, config and code) are skipped
+    stage_cache = StageCache.from_config(config, data_loader.s3_handler)
+    train_cache = None if incremental_retrain else stage_cache  # Each incremental step builds on the current model
+    fingerprint = data_loader.fingerprint() if stage_cache else None
+    df_processed = _load_processed(stage_cache, processor, fingerprint, config) if fingerprint else None
+
+    if df_processed is None:
+        # Step 1: Download
+        print("⬇️ Step 1: Downloading Data...")
+        with instrumentation.stage("load") as stage:
+            df_raw = data_loader.run()
+            stage["rows_out"] = len(df_raw)
+        if df_raw.empty:
+            print("✅ No new rows since the last run, nothing to train.")
+            return
+
+        # Step 2: Preprocessing
+        print("🧹 Step 2: Preprocessing data...")
+        with instrumentation.stage("process") as stage:
+            stage["rows_in"] = len(df_raw)
+            if stage_cache and fingerprint is None:
+                fingerprint = data_loader.fingerprint(df_raw)
+                df_processed = _load_processed(stage_cache, processor, fingerprint, config)
+            if df_processed is None:
+                processor.df = df_raw
+                df_processed = processor.run()
+                stage.update(processor.memory_stats)
+                if stage_cache:
+                    process_key = _process_key(stage_cache, fingerprint, config)
+                    stage_cache.save_frame("process", process_key, df_processed)
+                    stage_cache.save_json("process", process_key, processor.state)
+            stage["rows_out"] = len(df_processed)
+            stage["cache"] = _cache_status(stage_cache, "process")
+    else:
+        print("⏭ Steps 1 and 2 skipped: processed data restored from the stage cache.")
 
     # Step 3: Training
     print("🧠 Step 3: Training model...")
-    trainer = ModelTrainer(
-        bucket=os.getenv("S3_BUCKET_NAME"),
-        df_processed=df_processed,
-        model_key=f"models/{config['project_name']}_model.pkl",
-        X_train_key=f"datasets/{config['project_name']}_X_train.csv",
-        config=config
-    )
-    trainer.run()
+    trainer = None
+    with instrumentation.stage("train") as stage:
+        stage["rows_in"] = len(df_processed)
+        extension = FORMAT_EXTENSIONS[config.get("storage_format") or "csv"]
+        X_train_key = f"datasets/{config['project_name']}_X_train.{extension}"
+        # Outputs of the training run, cached and restored together
+        train_files = {"model.pkl": model_key, "lineage.json": lineage_key(model_key),
+                       f"X_test.{extension}": X_train_key}
+        train_key = _train_key(train_cache, fingerprint, config) if train_cache else None
+        if not (train_cache and train_cache.restore_files("train", train_key, train_files)):
+            trainer = ModelTrainer(
+                bucket=os.getenv("S3_BUCKET_NAME"),
+                df_processed=df_processed,
+                model_key=model_key,
+                X_train_key=X_train_key,
+                config=config,
+                watermark={"from": data_loader.watermark, "to": data_loader.new_watermark}
+            )
+            trainer.run()
+            if train_cache:
+                train_cache.save_files("train", train_key, train_files)
+        else:
+            # No new MLflow run: the model, its metrics and its registered version are those of the cached run
+            run_id = data_loader.s3_handler.load_json_from_s3(train_files["lineage.json"]).get("run_id")
+            print(f"⏭ Training skipped: model, lineage and test set restored from the stage cache "
+                  f"(MLflow run {run_id}).")
+        stage["cache"] = _cache_status(train_cache, "train")
+
+    _finish(config, processor, data_loader, instrumentation, stage_cache, trainer)
+
+
+def _finish(config, processor, data_loader, instrumentation, stage_cache, trainer):
+    # Step 4: Save the fitted preprocessing next to the model
+    print("💾 Step 4: Saving preprocessing state...")
+    with instrumentation.stage("save_state"):
+        processor.save_state(f"models/{config['project_name']}_preprocessing.json")
+        data_loader.commit_watermark()
+
+    instrumentation.summary()
+    if stage_cache:
+        print(f"📊 Stage cache: {stage_cache.stats()}")
+    if trainer is not None:
+        instrumentation.log_to_mlflow(trainer.mlflow_handler.client, trainer.run_id)
 
     print("✅ Train Pipeline completed successfully.")
 
+
+def _check_incremental(config):
+    # Loading only the new rows is sound only when the saved model is updated with them: a full
+    # retrain would replace the model and the preprocessing with ones fitted on the new rows alone.
+    # Conversely, an incremental update on a source without watermark would see the same rows every run
+    retrain_mode = (config.get("retrain") or {}).get("mode", "full")
+    incremental_loading = (config.get("mysql_incremental") or {}).get("enabled", False)
+    if incremental_loading and retrain_mode != "incremental":
+        raise ValueError(f"❌ mysql_incremental.enabled loads only the rows added since the last run, "
+                         f"it needs retrain.mode: incremental (got retrain.mode: {retrain_mode}).")
+    if retrain_mode == "incremental" and not (incremental_loading and config["data_source"] == "mysql"):
+        raise ValueError(f"❌ retrain.mode: incremental updates the model with the new rows only, it needs "
+                         f"data_source: mysql with mysql_incremental.enabled (got data_source: {config['data_source']}, "
+                         f"mysql_incremental.enabled: {incremental_loading}).")
+    if retrain_mode == "incremental" and (config.get("out_of_core") or {}).get("enabled"):
+        raise ValueError("❌ out_of_core trains a new model on the whole stream, it cannot be combined with "
+                         "retrain.mode: incremental (and mysql_incremental).")
+
+
+def _train_out_of_core(config, data_loader, processor, instrumentation, model_key):
+    """
+    Trains on a dataset larger than memory (`out_of_core` section), never held whole in memory.
+
+    A first pass over the stream keeps two bounded reservoir samples: training rows, on
+    which the preprocessing (and the models without partial_fit) is fitted, and held-out
+    rows, selected by a hash of the row id, for the evaluation. Estimators with
+    partial_fit then get the training chunks, preprocessed one at a time, on further passes.
+
+    Returns:
+        ModelTrainer | None: The trainer of the run, None if the stream is empty.
+    """
+    settings = config.get("out_of_core") or {}
+    chunksize = settings.get("chunksize", 100000)
+    test_fraction = settings.get("test_fraction", 0.2)
+    if not 0 < test_fraction < 1:
+        raise ValueError(f"❌ out_of_core.test_fraction must be between 0 and 1 (got {test_fraction}).")
+    target, id_column = config["target"], config.get("id_column")
+    seed = config.get("seed", 42)
+
+    # Step 1: Stream the data once, keeping bounded samples of the training and held-out rows
+    print("⬇️ Step 1: Sampling the data stream...")
+    train_sample = ReservoirSample(settings.get("sample_rows", 200000), seed)
+    test_sample = ReservoirSample(settings.get("test_rows", 50000), seed + 1)
+    classes = set()
+    with instrumentation.stage("load") as stage:
+        for chunk in data_loader.iter_chunks(chunksize):
+            chunk = chunk.dropna(subset=[target])
+            held_out = holdout_mask(chunk, test_fraction, id_column)
+            train_sample.add(chunk[~held_out])
+            test_sample.add(chunk[held_out])
+            if config["type"] == "classification":
+                classes.update(chunk[target].unique())
+        dataset_rows = train_sample.rows_seen + test_sample.rows_seen
+        stage["rows_out"] = len(train_sample.frame()) + len(test_sample.frame())
+        stage["rows_streamed"] = dataset_rows
+    if not train_sample.rows_seen:
+        return None
+    if not test_sample.rows_seen:
+        raise ValueError(f"❌ No held-out row in the {dataset_rows} rows streamed, the model cannot be evaluated: "
+                         f"raise out_of_core.test_fraction ({test_fraction}) or train on more rows.")
+    print(f"🎲 Sampled {len(train_sample.frame())} training and {len(test_sample.frame())} held-out rows "
+          f"out of {dataset_rows}.")
+
+    # Step 2: Fit the preprocessing on the training sample
+    print("🧹 Step 2: Preprocessing data...")
+    with instrumentation.stage("process") as stage:
+        stage["rows_in"] = len(train_sample.frame())
+        processor.df = train_sample.frame()
+        df_processed = processor.run()
+        stage.update(processor.memory_stats)
+        test = processor.process_chunk(test_sample.frame())
+        stage["rows_out"] = len(df_processed)
+
+    def train_chunks():
+        # Training rows of the stream, preprocessed chunk by chunk (same split as the sampling pass)
+        for chunk in data_loader.iter_chunks(chunksize):
+            chunk = chunk.dropna(subset=[target])
+            chunk = chunk[~holdout_mask(chunk, test_fraction, id_column)]
+            if len(chunk):
+                processed = processor.process_chunk(chunk)
+                yield processed.drop(columns=[target]), processed[target]
+
+    # Step 3: Training, the next chunks are read and preprocessed while partial_fit runs
+    print("🧠 Step 3: Training model out of core...")
+    with instrumentation.stage("train") as stage:
+        stage["rows_in"] = dataset_rows
+        extension = FORMAT_EXTENSIONS[config.get("storage_format") or "csv"]
+        trainer = ModelTrainer(
+            bucket=os.getenv("S3_BUCKET_NAME"),
+            df_processed=df_processed,
+            model_key=model_key,
+            X_train_key=f"datasets/{config['project_name']}_X_train.{extension}",
+            config=config,
+            watermark={"from": data_loader.watermark, "to": data_loader.new_watermark}
+        )
+        trainer.run_out_of_core(
+            test.drop(columns=[target]), test[target],
+            chunks=lambda: PrefetchIterator(train_chunks(), depth=settings.get("prefetch_chunks", 1)),
+            classes=sorted(classes) if classes else None,
+            dataset_rows=dataset_rows,
+            train_rows=train_sample.rows_seen
+        )
+    return trainer
+
+
+def _process_key(stage_cache, fingerprint, config):
+    sections = {name: config.get(name) for name in ("target", "id_column", "processing", "retrain")}
+    return stage_cache.key("process", fingerprint, sections, [data_processing])
+
+
+def _train_key(stage_cache, fingerprint, config):
+    sections = {name: config.get(name) for name in ("type", "target", "seed", "search", "estimator", "model_artifact")}
+    upstream = _process_key(stage_cache, fingerprint, config)
+    return stage_cache.key("train", upstream, sections, [model_training])
+
+
+def _load_processed(stage_cache, processor, fingerprint, config):
+    # Processed frame and fitted preprocessing state of a previous run with the same inputs
+    process_key = _process_key(stage_cache, fingerprint, config)
+    df_processed = stage_cache.load_frame("process", process_key)
+    if df_processed is None:
+        return None
+    processor.state = stage_cache.load_json("process", process_key)
+    if processor.state is None:
+        return None
+    processor.df = df_processed
+    return df_processed
+
+
+def _cache_status(stage_cache, stage):
+    if stage_cache is None:
+        return None
+    return "hit" if stage_cache.stats().get(stage, {}).get("hits") else "miss"
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,181 @@
+import os
+import threading
+
+from mlops_project.utils.instrumentation import record_io
+
+# Process-wide registry: one S3 client per settings, one SQLAlchemy engine per database URL,
+# one HTTP session per settings
+_S3_CLIENTS = {}
+_SQL_ENGINES = {}
+_HTTP_SESSIONS = {}
+_LOCK = threading.Lock()
+
+
+def s3_client(config: dict = None):
+    """
+    Returns the process-wide S3 client, created on first use.
+
+    boto3 clients are thread-safe, so every component (loader, processor, trainer,
+    predictor, stage cache) shares one client and its pool of keep-alive connections
+    instead of creating its own. Settings come from the `clients.s3` section of the
+    config. Creations and reuses are counted as 's3_clients_created' / 's3_clients_reused'.
+
+    Args:
+        config (dict, optional): The project configuration.
+
+    Returns:
+        botocore.client.S3: The shared client.
+    """
+    settings = ((config or {}).get("clients") or {}).get("s3") or {}
+    key = tuple(sorted(settings.items()))
+    with _LOCK:
+        client = _S3_CLIENTS.get(key)
+        if client is not None:
+            record_io("s3_clients_reused", 1)
+            return client
+
+        import boto3
+        from botocore.config import Config
+
+        client_config = Config(
+            max_pool_connections=settings.get("max_pool_connections", 32),
+            retries={"max_attempts": settings.get("max_attempts", 5), "mode": settings.get("retry_mode", "standard")},
+            tcp_keepalive=settings.get("tcp_keepalive", True),
+            connect_timeout=settings.get("connect_timeout", 10),
+            read_timeout=settings.get("read_timeout", 60),
+        )
+        client = boto3.client("s3", config=client_config)
+        _S3_CLIENTS[key] = client
+        record_io("s3_clients_created", 1)
+        return client
+
+
+def sql_engine(url: str, config: dict = None, connect_args: dict = None):
+    """
+    Returns the process-wide SQLAlchemy engine of a database URL, created on first use.
+
+    The engine keeps a pool of connections (`clients.mysql` section of the config: pool
+    size, overflow, recycle, pre-ping) shared by every handler of the same database.
+    Engine creations/reuses and pooled connections opened/reused are counted as
+    'mysql_engines_created', 'mysql_engines_reused', 'mysql_connections_opened' and
+    'mysql_connections_reused'.
+
+    Args:
+        url (str): The database URL.
+        config (dict, optional): The project configuration.
+        connect_args (dict, optional): DBAPI connect arguments, part of the registry key.
+
+    Returns:
+        sqlalchemy.engine.Engine: The shared engine.
+    """
+    connect_args = connect_args or {}
+    key = (url, tuple(sorted(connect_args.items())))
+    with _LOCK:
+        engine = _SQL_ENGINES.get(key)
+        if engine is not None:
+            record_io("mysql_engines_reused", 1)
+            return engine
+
+        import sqlalchemy
+
+        settings = ((config or {}).get("clients") or {}).get("mysql") or {}
+        engine = sqlalchemy.create_engine(
+            url,
+            connect_args=connect_args,
+            pool_size=settings.get("pool_size", 5),
+            max_overflow=settings.get("max_overflow", 10),
+            pool_recycle=settings.get("pool_recycle", 3600),
+            pool_pre_ping=settings.get("pool_pre_ping", True),
+        )
+        sqlalchemy.event.listen(engine, "connect", _on_connect)
+        sqlalchemy.event.listen(engine, "checkout", _on_checkout)
+        _SQL_ENGINES[key] = engine
+        record_io("mysql_engines_created", 1)
+        return engine
+
+
+def http_session(config: dict = None):
+    """
+    Returns the process-wide `requests.Session`, created on first use.
+
+    The session keeps a pool of keep-alive connections per host and retries the
+    transient failures (`clients.http` section of the config: pool size, retries).
+    Creations and reuses are counted as 'http_sessions_created' / 'http_sessions_reused'.
+
+    Args:
+        config (dict, optional): The project configuration.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    settings = _http_settings(config)
+    key = (settings.get("pool_size", 10), settings.get("max_retries", 3))
+    with _LOCK:
+        session = _HTTP_SESSIONS.get(key)
+        if session is not None:
+            record_io("http_sessions_reused", 1)
+            return session
+
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        pool_size, max_retries = key
+        session = requests.Session()
+        retries = Retry(total=max_retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _HTTP_SESSIONS[key] = session
+        record_io("http_sessions_created", 1)
+        return session
+
+
+def http_timeout(config: dict = None) -> float:
+    """Connect/read timeout of the HTTP requests in seconds (`clients.http.timeout`)."""
+    return _http_settings(config).get("timeout", 60)
+
+
+def reset_clients():
+    """
+    Drops the registered clients, engines and sessions (the pools are closed), so the
+    next calls create new ones, e.g. after the credentials or the endpoint changed.
+    """
+    with _LOCK:
+        for engine in _SQL_ENGINES.values():
+            engine.dispose()
+        for session in _HTTP_SESSIONS.values():
+            session.close()
+        _S3_CLIENTS.clear()
+        _SQL_ENGINES.clear()
+        _HTTP_SESSIONS.clear()
+
+
+def _http_settings(config: dict = None) -> dict:
+    return ((config or {}).get("clients") or {}).get("http") or {}
+
+
+def _on_connect(dbapi_connection, connection_record):
+    connection_record.info["fresh"] = True
+    record_io("mysql_connections_opened", 1)
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    if not connection_record.info.pop("fresh", False):
+        record_io("mysql_connections_reused", 1)
+
+
+def _after_fork():
+    # Sockets must not be shared with the parent process: a forked child starts with an
+    # empty registry, and the inherited pools are dropped without closing the parent's connections
+    global _LOCK
+    _LOCK = threading.Lock()
+    for engine in _SQL_ENGINES.values():
+        engine.dispose(close=False)
+    _S3_CLIENTS.clear()
+    _SQL_ENGINES.clear()
+    _HTTP_SESSIONS.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
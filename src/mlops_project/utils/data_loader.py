@@ -1,24 +1,38 @@
 import os
-from io import StringIO
 import pandas as pd
-import requests
-from mlops_project.utils.mysql_handler import MySQLHandler
+from mlops_project.utils.clients import http_session, http_timeout
 from mlops_project.utils.s3_handler import S3Handler
+from mlops_project.utils.stage_cache import dataframe_checksum
 
 
 class DataLoader:
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, incremental: bool = False):
         """
         Initialize the DataLoader with the project configuration.
+
+        Args:
+            config (dict): The project configuration.
+            incremental (bool): For the mysql source, only load the rows added since the
+                watermark of the last committed run (see `mysql_incremental` in the config).
         """
         self.config = config
         self.data_source = self.config['data_source']
+        self.incremental = incremental and self.data_source == "mysql"
+        self.watermark_key = f"state/{self.config['project_name']}_watermark.json"
+        self.watermark = None  # Last key value loaded by the previous run
+        self.new_watermark = None  # Last key value loaded by this run
         self.s3_handler = S3Handler(
                 bucket=os.getenv("S3_BUCKET_NAME"),
                 config=self.config
             )
+        # The clients of a source (sqlalchemy/pymysql, requests) are only imported when it is configured
+        self.http_cache = None
         if self.data_source == "mysql":
+            from mlops_project.utils.mysql_handler import MySQLHandler
             self.mysql_handler = MySQLHandler( self.config, os.getenv("MYSQL_DB_DATASETS"))
+        elif self.data_source == "csv_url":
+            from mlops_project.utils.http_cache import HttpCache
+            self.http_cache = HttpCache.from_config(self.config)
 
 
     def run(self) -> pd.DataFrame:
@@ -30,37 +44,175 @@ class DataLoader:
             return self.load_csv_from_url(os.getenv("CSV_URL"))
 
         if self.data_source == 'csv_s3':
-            return self.s3_handler.load_csv_from_s3(self.config['s3_csv_key'])
+            return self.s3_handler.load_dataframe_from_s3(self.config['s3_csv_key'])
 
         elif self.data_source  == 'mysql':
             print(os.getenv("MYSQL_HOST"))
-            df = self.mysql_handler.load_data_from_db("select_all")
+            chunks = list(self.iter_mysql_chunks(self.config.get("mysql_chunksize") or 50000))
+            df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
             print(df.shape)
             return df
         else:
             raise ValueError(f"Unknown data source type: {self.data_source}")
 
 
-    def load_csv_from_url(self, url: str, columns: list = None) -> pd.DataFrame:
+    def fingerprint(self, df: pd.DataFrame = None) -> dict:
+        """
+        Fingerprint of the input dataset, used as the upstream key of the stage cache.
+
+        For the csv_s3 source, the ETag of the object is enough and nothing is downloaded.
+        Other sources are fingerprinted from the loaded data (row count and checksum).
+
+        Args:
+            df (pd.DataFrame, optional): The loaded dataset.
+
+        Returns:
+            dict | None: The fingerprint, or None if it requires the data and `df` is None.
+        """
+        if self.data_source == 'csv_s3':
+            key = self.config['s3_csv_key']
+            return {"source": self.data_source, "key": key, "etag": self.s3_handler.get_etag(key)}
+        if df is None:
+            return None
+
+        fingerprint = {"source": self.data_source, "rows": len(df), "checksum": dataframe_checksum(df)}
+        if self.data_source == 'csv_url':
+            fingerprint["url"] = os.getenv("CSV_URL")
+        elif self.data_source == 'mysql':
+            fingerprint["watermark"] = self.watermark
+        return fingerprint
+
+    def iter_chunks(self, chunksize: int):
+        """
+        Load the dataset as an iterator of DataFrame chunks, so that only one chunk
+        is held in memory at a time.
+
+        Args:
+            chunksize (int): Number of rows per chunk.
+
+        Returns:
+            Iterator[pd.DataFrame]: The DataFrame chunks.
+        """
+        if self.data_source == 'csv_url':
+            return self.load_csv_from_url(os.getenv("CSV_URL"), chunksize=chunksize)
+
+        if self.data_source == 'csv_s3':
+            return self.s3_handler.iter_dataframe_from_s3(self.config['s3_csv_key'], chunksize)
+
+        elif self.data_source == 'mysql':
+            return self.iter_mysql_chunks(chunksize)
+        else:
+            raise ValueError(f"Unknown data source type: {self.data_source}")
+
+    def iter_mysql_chunks(self, chunksize: int):
+        """
+        Streams the mysql dataset through a server-side cursor.
+
+        In incremental mode, only the rows whose key column is above the last committed
+        watermark are loaded, and the new watermark is tracked chunk by chunk.
+
+        Args:
+            chunksize (int): Number of rows per chunk.
+
+        Yields:
+            pd.DataFrame: The DataFrame chunks.
+        """
+        if not self.incremental:
+            yield from self.mysql_handler.iter_data_from_db("select_all", chunksize)
+            return
+
+        incremental = self.config.get("mysql_incremental") or {}
+        key_column = incremental.get("key_column", "id")
+        self.watermark = self._read_watermark()
+
+        if self.watermark is None:
+            print("🆕 No watermark found, loading the whole table.")
+            chunks = self.mysql_handler.iter_data_from_db("select_all", chunksize)
+        else:
+            print(f"⏩ Loading rows with {key_column} > {self.watermark}")
+            chunks = self.mysql_handler.iter_data_from_db(
+                incremental.get("query", "select_since"), chunksize, params={"watermark": self.watermark}
+            )
+
+        for chunk in chunks:
+            if len(chunk):
+                chunk_max = _to_python(chunk[key_column].max())
+                if self.new_watermark is None or chunk_max > self.new_watermark:
+                    self.new_watermark = chunk_max
+            yield chunk
+
+    def commit_watermark(self):
+        """
+        Records the watermark of this run in S3, to be called once the run succeeded.
+        The next incremental run then starts after the last row loaded by this one.
+        """
+        if not self.incremental or self.new_watermark is None:
+            return
+        incremental = self.config.get("mysql_incremental") or {}
+        self.s3_handler.save_json_to_s3({
+            "key_column": incremental.get("key_column", "id"),
+            "value": self.new_watermark,
+            "previous": self.watermark
+        }, self.watermark_key)
+        print(f"🔖 Watermark {self.new_watermark} saved to s3://{self.s3_handler.bucket}/{self.watermark_key}")
+
+    def _read_watermark(self):
+        state = self.s3_handler.load_json_from_s3(self.watermark_key, missing_ok=True)
+        return state["value"] if state else None
+
+    def load_csv_from_url(self, url: str, columns: list = None, chunksize: int = None):
         """
         Downloads a CSV from a public URL and returns it as a pandas DataFrame.
 
+        With the HTTP cache enabled, the body is kept on disk and revalidated with
+        ETag/If-Modified-Since, so an unchanged file costs one 304 round trip.
+
         Args:
             url (str): The public URL pointing to the CSV file.
             columns (list, optional): List of column names to assign to the DataFrame.
+            chunksize (int, optional): Return an iterator of DataFrames of this many rows.
 
         Returns:
-            pd.DataFrame: The loaded DataFrame.
+            pd.DataFrame | Iterator[pd.DataFrame]: The loaded DataFrame, or its chunks.
         """
+        import requests
+
+        sep = self.config['csv_separator'] or ","
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            print(f"✅ CSV downloaded from {url}")
-            csv_content = response.text
-            df = pd.read_csv(StringIO(csv_content), names=columns, sep=self.config['csv_separator'], engine='python')
-            return df
+            if self.http_cache:
+                path = self.http_cache.fetch(url)
+                return pd.read_csv(path, names=columns, sep=sep, engine='c', chunksize=chunksize)
+            if chunksize:
+                return self._iter_csv_from_url(url, columns, sep, chunksize)
+
+            with self._get_url(url) as response:
+                return pd.read_csv(response.raw, names=columns, sep=sep, engine='c')
         except requests.RequestException as e:
             print(f"❌ Failed to download CSV: {e}")
             raise
 
+    def _iter_csv_from_url(self, url: str, columns: list, sep: str, chunksize: int):
+        # The response stays open while the chunks are read, and is closed when the iteration ends or stops
+        with self._get_url(url) as response:
+            yield from pd.read_csv(response.raw, names=columns, sep=sep, engine='c', chunksize=chunksize)
+
+    def _get_url(self, url: str):
+        # Streamed GET on the shared session, the body is decompressed while it is read
+        response = http_session(self.config).get(url, stream=True, timeout=http_timeout(self.config))
+        try:
+            response.raise_for_status()
+        except Exception:
+            response.close()
+            raise
+        response.raw.decode_content = True
+        print(f"✅ Streaming CSV from {url}")
+        return response
+
+
+
 
+def _to_python(value):
+    """Converts numpy/pandas scalars to JSON serialisable values (timestamps as ISO strings)."""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value.item() if hasattr(value, "item") else value
@@ -1,79 +1,373 @@
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import StandardScaler
 from mlops_project.utils.s3_handler import S3Handler
 
 class DataProcessor:
-    def __init__(self, bucket: str, raw_data: pd.DataFrame, config: dict):
+    def __init__(self, bucket: str, raw_data: pd.DataFrame, config: dict, state: dict = None):
         self.bucket = bucket
         self.df = raw_data
         self.config = config
         self.target = config["target"]
         self.id_column = config.get("id_column", None)
         self.s3 = S3Handler(bucket, config)
-        self.scaler = StandardScaler()
+        self.state = state
+        self.profile = None  # Column statistics of the training data, see `profile_columns`
+
+        # Memory-compact output: float32 numerics, category strings and uint8 (optionally sparse) one-hot columns
+        processing = config.get("processing") or {}
+        self.compact = processing.get("compact", False)
+        self.sparse = processing.get("sparse", False)
+        # 'onehot', or 'native': categorical columns are kept as category dtype for the estimators
+        # handling them (hist_gradient_boosting)
+        self.categorical = processing.get("categorical", "onehot")
+        self.memory_stats = {}
 
     def run(self):
-        self.clean()
-        self.handle_missing_values()
-        self.transform()
+        input_mb = _memory_mb(self.df)
+        if self.compact:
+            self.df = compact_dtypes(self.df, exclude=[self.target])
+
+        # Fit on the training data only, prediction reuses the persisted state
+        if self.state is None:
+            self.fit()
+        self.df = self.transform(self.df)
+
+        self.memory_stats = {"memory_in_mb": round(input_mb, 2), "memory_out_mb": round(_memory_mb(self.df), 2)}
+        print(f"🗜 Memory: {self.memory_stats['memory_in_mb']} MB in -> {self.memory_stats['memory_out_mb']} MB out")
         print(f"✅ Data Processing Complete.")
         return self.df
 
+    def fit(self) -> dict:
+        """
+        Learns the preprocessing state from the raw data.
+
+        The state holds everything needed to replay the preprocessing on new data
+        without recomputing any statistics: dropped columns, imputation values,
+        scaler parameters, category vocabularies and the output column order.
+
+        Returns:
+            dict: The fitted preprocessing state.
+        """
+        self.state = {"index": None, "categorical": self.categorical}
+        self.clean()
+        self.handle_missing_values()
+        self._fit_encoding()
+        print(f"📐 Preprocessing state fitted on {len(self.df)} rows.")
+        return self.state
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Applies the fitted preprocessing state to a DataFrame.
+
+        Rows are never dropped, so every input row gets a prediction.
+
+        Args:
+            df (pd.DataFrame): Raw data with the same schema as the training data.
+
+        Returns:
+            pd.DataFrame: The processed DataFrame, with the training column order.
+        """
+        if self.state is None:
+            raise ValueError("❌ DataProcessor is not fitted. Call fit() or load_state() first.")
+
+        df = self._encode(df)
+
+        # Align on the training column order
+        columns = self.state["feature_columns"] + ([self.target] if self.target in df.columns else [])
+        missing = [col for col in self.state["feature_columns"] if col not in df.columns]
+        if missing:
+            print(f"⚠️ Missing columns filled with 0: {missing}")
+        df = df.reindex(columns=columns, fill_value=0)
+
+        # Nullable integer labels (MySQL INT NULL columns) would be read as floats by the estimators
+        target = df[self.target] if self.target in df.columns else None
+        if target is not None and isinstance(target.dtype, pd.api.extensions.ExtensionDtype) \
+                and pd.api.types.is_integer_dtype(target.dtype) and not target.isna().any():
+            df[self.target] = target.astype(target.dtype.numpy_dtype)
+        return df
+
+    def process_chunk(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """
+        Preprocesses a raw chunk with the fitted state, like `run` does for a whole dataset
+        (including the `processing.compact` downcast), so streamed rows get the same dtypes.
+
+        Args:
+            chunk (pd.DataFrame): Raw rows.
+
+        Returns:
+            pd.DataFrame: The processed chunk.
+        """
+        if self.compact:
+            chunk = compact_dtypes(chunk, exclude=[self.target])
+        return self.transform(chunk)
+
+    def _encode(self, df: pd.DataFrame) -> pd.DataFrame:
+        state = self.state
+
+        # Index
+        if state["index"] and state["index"] in df.columns:
+            df = df.set_index(state["index"])
+
+        # Cleaning and imputation
+        df = df.drop(columns=[col for col in state["dropped_columns"] if col in df.columns])
+        impute_values = {**state["numeric_impute"], **state["categorical_impute"]}
+        impute_values = {col: value for col, value in impute_values.items() if col in df.columns}
+        for col, value in impute_values.items():
+            # Columns converted to category early must know the imputation value
+            if isinstance(df[col].dtype, pd.CategoricalDtype) and value not in df[col].cat.categories:
+                df[col] = df[col].cat.add_categories([value])
+        df = df.fillna(value=impute_values)
+
+        # Numerical standardisation
+        scale_cols = state["scale"]["columns"]
+        if scale_cols:
+            dtype = np.float32 if self.compact else float
+            values = df[scale_cols].to_numpy(dtype=dtype)
+            scaled = (values - np.asarray(state["scale"]["mean"], dtype=dtype)) / np.asarray(state["scale"]["scale"], dtype=dtype)
+            df[scale_cols] = pd.DataFrame(scaled, index=df.index, columns=scale_cols)
+
+        # Categorical encoding with the training vocabularies (unseen values -> all zeros, or missing when native)
+        for col, categories in state["categories"].items():
+            df[col] = pd.Categorical(df[col], categories=categories)
+        if state.get("categorical") == "native":
+            return df
+        if self.compact or self.sparse:
+            return pd.get_dummies(df, columns=list(state["categories"]), drop_first=False,
+                                  dtype=np.uint8, sparse=self.sparse)
+        return pd.get_dummies(df, columns=list(state["categories"]), drop_first=False)
+
+    def save_state(self, key: str):
+        """
+        Saves the fitted preprocessing state as JSON to S3.
+
+        Args:
+            key (str): Destination path in S3 (e.g. 'models/my_project_preprocessing.json').
+        """
+        self.s3.save_json_to_s3(self.state, key)
+        print(f"✅ Preprocessing state saved to s3://{self.bucket}/{key}")
+
+    def load_state(self, key: str, missing_ok: bool = False) -> dict:
+        """
+        Loads a fitted preprocessing state from S3.
+
+        Args:
+            key (str): Path to the preprocessing state in S3.
+            missing_ok (bool): Leave the processor unfitted instead of raising when there is no state.
+
+        Returns:
+            dict: The loaded preprocessing state (None if missing and `missing_ok`).
+        """
+        self.state = self.s3.load_json_from_s3(key, missing_ok=missing_ok)
+        if self.state is not None:
+            print(f"✅ Loaded preprocessing state from s3://{self.bucket}/{key}")
+        return self.state
+
     def clean(self):
         # Set ID column as index if applicable
         if self.id_column and self.id_column in self.df.columns:
             if self.df[self.id_column].is_unique and self.df[self.id_column].isna().sum() == 0:
                 self.df = self.df.set_index(self.id_column)
+                self.state["index"] = self.id_column
                 print(f"📎 Set '{self.id_column}' as index.")
 
 
         # Basic cleaning
         self.df = self.df.drop_duplicates()
-        self.df = self.df.dropna(axis=1, how="all")
 
-        # Get number of unique values per column
-        n_unique = self.df.nunique()
+        # One profile of every column (nulls, distinct values, median/mode), reused by every fitting step
+        self.profile = profile_columns(self.df)
+        empty_cols = [col for col, stats in self.profile.items() if stats["n_null"] == len(self.df)]
+        self.df = self.df.drop(columns=empty_cols)
 
         # Drop constant columns (same value for all rows)
-        drop_constant = n_unique[n_unique == 1].index.tolist()
+        drop_constant = [col for col, stats in self.profile.items() if stats["n_unique"] == 1]
 
         # Drop fully unique columns that are not numeric (e.g., IDs, strings)
-        non_numeric_cols = self.df.select_dtypes(exclude=["number"]).columns
-        drop_unique_non_numeric = [col for col in n_unique[n_unique == len(self.df)].index if col in non_numeric_cols]
+        drop_unique_non_numeric = [col for col, stats in self.profile.items()
+                                   if stats["n_unique"] == len(self.df) and not stats["numeric"]]
 
         # Combine, excluding the target
         drop_cols = [col for col in (drop_constant + drop_unique_non_numeric) if col != self.target]
 
         # Drop the columns
         self.df = self.df.drop(columns=drop_cols)
+        self.state["dropped_columns"] = [col for col in empty_cols if col != self.target] + drop_cols
         print(f"🧹 Dropped columns: {drop_cols}")
 
     def handle_missing_values(self):
         # Numerical
         num_cols = self.df.select_dtypes(include=["number"]).columns.difference([self.target])
-        for col in num_cols:
-            median = self.df[col].median()
-            self.df[col] = self.df[col].fillna(median)
+        self.state["numeric_impute"] = {col: self.profile[col]["median"] for col in num_cols}
 
-        # Categorical
+        # Categorical (a value is stored for every column, new data may have gaps where training had none)
         cat_cols = self.df.select_dtypes(include=["object", "category"]).columns.difference([self.target])
-        for col in cat_cols:
-            if self.df[col].isna().any():
-                most_common = self.df[col].mode()[0]
-                self.df[col] = self.df[col].fillna(most_common)
+        self.state["categorical_impute"] = {col: self.profile[col]["mode"] for col in cat_cols
+                                            if self.profile[col]["mode"] is not None}
 
-    def transform(self):
+        # A single fillna, restricted to the columns that have gaps
+        impute_values = {**self.state["numeric_impute"], **self.state["categorical_impute"]}
+        gaps = {col: value for col, value in impute_values.items() if self.profile[col]["n_null"]}
+        if gaps:
+            self.df = self.df.fillna(value=gaps)
+
+    def _fit_encoding(self):
         # Numerical standardisation
         num_cols = self.df.select_dtypes(include=["number"]).columns.difference([self.target])
-        discrete_as_cat = [col for col in num_cols if self.df[col].nunique() <= 5]
+        discrete_as_cat = [col for col in num_cols
+                           if self.profile[col]["values"] is not None and len(self._imputed_values(col)) <= 5]
         scale_cols = [col for col in num_cols if col not in discrete_as_cat]
 
-        self.df[scale_cols] = self.scaler.fit_transform(self.df[scale_cols])
+        self.state["scale"] = {"columns": scale_cols, "mean": [], "scale": []}
+        if scale_cols:
+            # Only fitting needs sklearn, the predict path applies the saved state
+            from sklearn.preprocessing import StandardScaler
+            scaler = StandardScaler().fit(self.df[scale_cols])
+            self.state["scale"]["mean"] = scaler.mean_.tolist()
+            self.state["scale"]["scale"] = scaler.scale_.tolist()
 
-        # Categorical encoding
+        # Categorical vocabularies
         cat_cols = (self.df.select_dtypes(include=["object", "category"]).columns.difference([self.target]).tolist()
                     + discrete_as_cat)
         cat_cols = [col for col in cat_cols if col != self.target]
+        self.state["categories"] = {col: self._imputed_values(col) for col in cat_cols}
+
+        # Output column order, as seen by the model
+        encoded = self._encode(self.df.head(0))
+        self.state["feature_columns"] = [col for col in encoded.columns if col != self.target]
+
+    def _imputed_values(self, col: str) -> list:
+        # Sorted distinct values of a column after the imputation, from its profile
+        # (None for a numeric column with more distinct values than the profile keeps)
+        stats = self.profile[col]
+        values = stats["values"]
+        impute = {**self.state["numeric_impute"], **self.state["categorical_impute"]}.get(col)
+        if values is None or not stats["n_null"] or impute is None or impute in values:
+            return values
+        try:
+            return sorted(values + [impute])
+        except TypeError:
+            return values + [impute]
+
+
+def profile_columns(df: pd.DataFrame, max_numeric_values: int = 5) -> dict:
+    """
+    Computes the statistics the preprocessing is fitted on, for every column in one
+    pass over its values: a sort of the non-null values for numeric columns, a single
+    factorization for the others.
+
+    Args:
+        df (pd.DataFrame): The data to profile.
+        max_numeric_values (int): Distinct values of a numeric column are only kept up
+            to this count (discrete columns, encoded as categories).
+
+    Returns:
+        dict: Per column, 'numeric', 'n_null', 'n_unique', 'median' (numeric columns),
+        'mode' (other columns) and 'values', the sorted distinct non-null values (None
+        for numeric columns with more than `max_numeric_values`).
+    """
+    profile = {}
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+            profile[col] = _profile_numeric(series, max_numeric_values)
+        else:
+            profile[col] = _profile_values(series)
+    return profile
+
+
+def _profile_numeric(series: pd.Series, max_values: int) -> dict:
+    if isinstance(series.dtype, pd.api.extensions.ExtensionDtype):  # Nullable dtypes (Int64, Float64, ...)
+        values = series.dropna().to_numpy(dtype=getattr(series.dtype, "numpy_dtype", np.float64))
+    else:
+        values = series.to_numpy()
+    if values.dtype.kind == "f":
+        values = values[~np.isnan(values)]
+    values = np.sort(values)
+    n = len(values)
+    if n:
+        # Distinct values are the starts of the runs of the sorted array
+        starts = np.flatnonzero(np.concatenate(([True], values[1:] != values[:-1])))
+        # Averaged in the column's float dtype like `Series.median()` (float32 stays float32)
+        middle = values[(n - 1) // 2:n // 2 + 1]
+        median = float(middle.mean(dtype=values.dtype if values.dtype.kind == "f" else np.float64))
+    else:
+        starts, median = [], None
+    return {
+        "numeric": True,
+        "n_null": len(series) - n,
+        "n_unique": len(starts),
+        "median": median,
+        "mode": None,
+        "values": [_to_python(value) for value in values[starts]] if len(starts) <= max_values else None,
+    }
+
+
+def _profile_values(series: pd.Series) -> dict:
+    try:
+        codes, uniques = pd.factorize(series, sort=True)
+    except TypeError:
+        codes, uniques = pd.factorize(series)  # Mixed types, keep the order of appearance
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    return {
+        "numeric": False,
+        "n_null": int((codes < 0).sum()),
+        "n_unique": len(uniques),
+        "median": None,
+        # First of the most frequent values, i.e. the smallest one like `Series.mode()[0]`
+        "mode": _to_python(uniques[counts.argmax()]) if len(uniques) else None,
+        "values": [_to_python(value) for value in uniques],
+    }
+
+
+def compact_dtypes(df: pd.DataFrame, exclude: list = None) -> pd.DataFrame:
+    """
+    Downcasts a DataFrame to memory-compact dtypes: float64 -> float32, integers to the
+    smallest integer type holding their values, and string columns to `category`.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to compact.
+        exclude (list, optional): Columns left as they are (e.g. the target).
+
+    Returns:
+        pd.DataFrame: The compacted DataFrame.
+    """
+    exclude = set(exclude or [])
+    columns = {}
+    for col in df.columns:
+        if col in exclude:
+            continue
+        series = df[col]
+        if pd.api.types.is_float_dtype(series.dtype):
+            columns[col] = series.astype(np.float32)
+        elif pd.api.types.is_integer_dtype(series.dtype):
+            columns[col] = pd.to_numeric(series, downcast="integer")
+        elif pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype):
+            columns[col] = series.astype("category")
+    return df.assign(**columns) if columns else df
+
+
+def to_model_input(X: pd.DataFrame):
+    """
+    Returns what the estimators are fitted and scored on: the DataFrame itself, or a
+    float32 CSR matrix (same column order) when it holds sparse one-hot columns, so the
+    sparse output of `DataProcessor` is never densified.
+
+    Args:
+        X (pd.DataFrame): The processed features.
+
+    Returns:
+        pd.DataFrame | scipy.sparse.csr_matrix: The model input.
+    """
+    if not any(isinstance(dtype, pd.SparseDtype) for dtype in X.dtypes):
+        return X
+    import scipy.sparse
+    return scipy.sparse.csr_matrix(X.astype(pd.SparseDtype(np.float32, 0)).sparse.to_coo())
+
+
+def _memory_mb(df: pd.DataFrame) -> float:
+    return df.memory_usage(index=True, deep=True).sum() / 1024 ** 2 if df is not None else 0.0
+
 
-        self.df = pd.get_dummies(self.df, columns=cat_cols, drop_first=False)
+def _to_python(value):
+    """Converts numpy scalars to plain Python objects so the state is JSON serialisable."""
+    return value.item() if isinstance(value, np.generic) else value
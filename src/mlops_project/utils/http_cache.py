@@ -0,0 +1,128 @@
+import hashlib
+import os
+import tempfile
+import threading
+
+from mlops_project.utils.clients import http_session, http_timeout
+from mlops_project.utils.instrumentation import record_io
+from mlops_project.utils.model_cache import read_json_index, write_json_index
+
+
+class HttpCache:
+    """
+    Local HTTP download cache with conditional revalidation.
+
+    Bodies are stored on disk under the SHA-256 of their content, with an `index.json`
+    mapping each URL to its file and validators (ETag, Last-Modified). A cached URL is
+    revalidated with If-None-Match / If-Modified-Since, so an unchanged upstream file
+    costs a single 304 round trip. Requests go through the pooled session of the process
+    (see `clients.http_session`).
+    """
+
+    def __init__(self, cache_dir: str, session, timeout: float = 60):
+        """
+        Args:
+            cache_dir (str): Local directory holding the cached bodies.
+            session (requests.Session): Session sending the requests.
+            timeout (float): Connect/read timeout of the requests, in seconds.
+        """
+        self.cache_dir = cache_dir
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self._lock = threading.Lock()
+        self.session = session
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, config: dict):
+        """
+        Builds the cache from the `http_cache` section of the config, on the shared session
+        and timeout of the `clients.http` section.
+
+        Returns:
+            HttpCache | None: The cache, or None when it is disabled (`enabled: false`).
+        """
+        section = config.get("http_cache") or {}
+        if not section.get("enabled", True):
+            return None
+        cache_dir = section.get("dir") or os.path.join(tempfile.gettempdir(), "mlops_http_cache")
+        return cls(cache_dir, http_session(config), http_timeout(config))
+
+    def fetch(self, url: str) -> str:
+        """
+        Returns a local file holding the current body of a URL, downloading it only if
+        it changed since the cached copy.
+
+        Args:
+            url (str): The URL to fetch.
+
+        Returns:
+            str: Path of the local file.
+        """
+        entry = read_json_index(self.index_path).get(url)
+        if entry and not os.path.exists(self._path(entry["file"])):
+            entry = None
+
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+            if entry and response.status_code == 304:
+                self.hits += 1
+                self.bytes_saved += entry["size"]
+                print(f"♻️ {url} unchanged, using cached copy")
+                return self._path(entry["file"])
+
+            response.raise_for_status()
+            response.raw.decode_content = True
+            file_name, size = self._store(response.raw)
+            record_io("http_bytes_in", size)
+            print(f"✅ CSV downloaded from {url}")
+
+        with self._lock:
+            index = read_json_index(self.index_path)
+            previous = index.get(url)
+            index[url] = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "file": file_name,
+                "size": size
+            }
+            if previous and previous["file"] != file_name and \
+                    all(other["file"] != previous["file"] for other in index.values()):
+                os.remove(self._path(previous["file"]))
+            write_json_index(self.index_path, index)
+            self.misses += 1
+        return self._path(file_name)
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: 'hits', 'misses' and 'bytes_saved' (bytes not downloaded thanks to hits).
+        """
+        return {"hits": self.hits, "misses": self.misses, "bytes_saved": self.bytes_saved}
+
+    def _store(self, stream) -> tuple:
+        # Hash while writing, then move the file to its content address
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            for block in iter(lambda: stream.read(1024 * 1024), b""):
+                digest.update(block)
+                f.write(block)
+                size += len(block)
+        file_name = digest.hexdigest()
+        os.replace(tmp_path, self._path(file_name))
+        return file_name, size
+
+    def _path(self, file_name: str) -> str:
+        return os.path.join(self.cache_dir, file_name)
@@ -0,0 +1,193 @@
+import json
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# Process-wide counters: bytes fed by S3Handler, MySQLHandler and HttpCache, client
+# creations/reuses fed by the client registry (utils/clients.py)
+_IO_COUNTERS = Counter()
+_IO_LOCK = threading.Lock()
+
+
+def record_io(name: str, n_bytes: int):
+    """
+    Adds transferred bytes to a process-wide counter (e.g. 's3_bytes_in'), or
+    client events to a counter (e.g. 's3_clients_created').
+
+    Args:
+        name (str): Name of the counter.
+        n_bytes (int): Number of bytes transferred (or of events).
+    """
+    with _IO_LOCK:
+        _IO_COUNTERS[name] += int(n_bytes or 0)
+
+
+def io_counters() -> dict:
+    """Returns a snapshot of the process-wide byte counters."""
+    with _IO_LOCK:
+        return dict(_IO_COUNTERS)
+
+
+class Instrumentation:
+    """
+    Per-stage instrumentation of a pipeline: wall time, CPU time, peak RSS, rows in/out
+    and bytes transferred to/from S3, MySQL and HTTP.
+
+    Each stage is emitted as one JSON log line, and the stages can be logged as MLflow
+    metrics. An optional profiler (cProfile or pyinstrument) wraps every stage.
+    Settings come from the `instrumentation` section of the config.
+    """
+
+    def __init__(self, pipeline: str, config: dict):
+        """
+        Args:
+            pipeline (str): Name of the pipeline ('train', 'predict').
+            config (dict): The project configuration.
+        """
+        settings = config.get("instrumentation") or {}
+        self.pipeline = pipeline
+        self.config = config
+        self.profiler = settings.get("profiler")
+        self.profile_dir = settings.get("profile_dir") or tempfile.gettempdir()
+        self.mlflow = settings.get("mlflow", True)
+        self.stages = []
+        self.counters = {}  # Counter deltas over the whole pipeline, set by summary()
+        self._io_start = io_counters()
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Measures a pipeline stage. The yielded dict can be filled with 'rows_in' and
+        'rows_out' (or any other value to report) by the caller.
+
+        Args:
+            name (str): Name of the stage.
+        """
+        record = {"event": "stage", "pipeline": self.pipeline, "stage": name, "rows_in": None, "rows_out": None}
+        io_before = io_counters()
+        _reset_peak_rss()
+        profiler = self._start_profiler()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record["wall_s"] = round(time.perf_counter() - wall_start, 4)
+            record["cpu_s"] = round(time.process_time() - cpu_start, 4)
+            record["peak_rss_mb"] = round(_peak_rss_mb(), 1)
+            io_after = io_counters()
+            for counter, value in io_after.items():
+                if value - io_before.get(counter, 0):
+                    record[counter] = value - io_before.get(counter, 0)
+            self._stop_profiler(profiler, name)
+            self.stages.append(record)
+            print(json.dumps(record))
+
+    def summary(self) -> dict:
+        """
+        Returns the totals over all the stages, emitted as a JSON log line as well. The
+        process-wide counters are totalled since the pipeline started, including what
+        happened outside the stages (e.g. the clients created when the components are built).
+        """
+        io_now = io_counters()
+        self.counters = {counter: value - self._io_start.get(counter, 0) for counter, value in io_now.items()
+                         if value - self._io_start.get(counter, 0)}
+        summary = {
+            "event": "pipeline",
+            "pipeline": self.pipeline,
+            "wall_s": round(sum(stage["wall_s"] for stage in self.stages), 4),
+            "cpu_s": round(sum(stage["cpu_s"] for stage in self.stages), 4),
+            "peak_rss_mb": max((stage["peak_rss_mb"] for stage in self.stages), default=0),
+            **self.counters,
+        }
+        print(json.dumps(summary))
+        return summary
+
+    def metrics(self) -> dict:
+        """
+        Returns the numeric values of every stage as flat metric names
+        (e.g. 'stage.load.wall_s'), and the pipeline counters of `summary`
+        (e.g. 'pipeline.s3_clients_created').
+        """
+        metrics = {}
+        for stage in self.stages:
+            for key, value in stage.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    metrics[f"stage.{stage['stage']}.{key}"] = value
+        for counter, value in self.counters.items():
+            metrics[f"pipeline.{counter}"] = value
+        return metrics
+
+    def log_to_mlflow(self, client, run_id: str):
+        """
+        Logs the stage metrics to an MLflow run with a single batch.
+
+        Args:
+            client (MlflowClient): Client of the tracking store.
+            run_id (str): The run to log to.
+        """
+        from mlflow.entities import Metric
+
+        if not self.mlflow or run_id is None:
+            return
+        timestamp = int(time.time() * 1000)
+        metrics = [Metric(key, float(value), timestamp, 0) for key, value in self.metrics().items()]
+        for i in range(0, len(metrics), 1000):
+            client.log_batch(run_id, metrics=metrics[i:i + 1000])
+        print(f"📈 Stage metrics logged to MLflow run {run_id}")
+
+    def _start_profiler(self):
+        if self.profiler == "cprofile":
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+            return profiler
+        if self.profiler == "pyinstrument":
+            from pyinstrument import Profiler  # Optional, install pyinstrument to use it
+            profiler = Profiler()
+            profiler.start()
+            return profiler
+        return None
+
+    def _stop_profiler(self, profiler, name: str):
+        if profiler is None:
+            return
+        path = os.path.join(self.profile_dir, f"{self.pipeline}_{name}")
+        if self.profiler == "cprofile":
+            import pstats
+            profiler.disable()
+            profiler.dump_stats(f"{path}.prof")
+            pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
+            print(f"🔬 Profile of stage '{name}' saved to {path}.prof")
+        else:
+            profiler.stop()
+            with open(f"{path}.html", "w") as f:
+                f.write(profiler.output_html())
+            print(profiler.output_text())
+            print(f"🔬 Profile of stage '{name}' saved to {path}.html")
+
+
+def _reset_peak_rss():
+    # Linux only: resets the VmHWM high watermark, so the peak is measured per stage
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # Fallback: peak of the whole process (kilobytes on Linux, bytes on macOS)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
@@ -1,6 +1,10 @@
 import os
+import threading
+import time
 import mlflow
+from mlflow.entities import Metric, Param, RunTag
 from mlflow.tracking import MlflowClient
+from mlflow.utils.mlflow_tags import MLFLOW_PARENT_RUN_ID
 
 
 class MLflowHandler:
@@ -32,6 +36,11 @@ class MLflowHandler:
 
         print(f"Backend store URI: mysql+pymysql://{user}:******@{host}:{port}/{database}")
 
+        # MLFLOW_TRACKING_URI overrides the MySQL store (e.g. a local sqlite:// or file:// store for benchmarks)
+        if os.getenv("MLFLOW_TRACKING_URI"):
+            self.backend_store_uri = os.getenv("MLFLOW_TRACKING_URI")
+            print(f"Backend store URI overridden by MLFLOW_TRACKING_URI: {self.backend_store_uri}")
+
         # Define artifact location in S3
         self.artifact_uri = f"s3://{self.s3_bucket}/mlruns"
 
@@ -80,3 +89,172 @@ class MLflowHandler:
         mlflow.set_experiment(experiment_name)
 
         return experiment_id, experiment_name
+
+    def batch_logger(self, run_id: str):
+        """
+        Returns a batched, asynchronous logger for a run (see `MLflowBatchLogger`),
+        configured from the `mlflow_logging` section of the config.
+
+        Args:
+            run_id (str): The run to log to.
+
+        Returns:
+            MLflowBatchLogger: The logger, to use as a context manager.
+        """
+        settings = self.config.get("mlflow_logging") or {}
+        return MLflowBatchLogger(
+            self.client,
+            run_id,
+            flush_interval=settings.get("flush_interval_s", 2),
+            max_param_length=settings.get("max_param_length", 500)
+        )
+
+
+class MLflowBatchLogger:
+    """
+    Collects params, metrics and tags of a run and flushes them with `log_batch` calls
+    on a background thread, so training never waits on the tracking store.
+
+    Params longer than `max_param_length` (e.g. the feature list) are logged as JSON
+    artifacts instead. `round_trips` counts the calls made to the tracking store. What a
+    failed flush could not send is queued again, the final flush of `close` raises.
+    """
+
+    def __init__(self, client: MlflowClient, run_id: str, flush_interval: float = 2, max_param_length: int = 500):
+        """
+        Args:
+            client (MlflowClient): Client of the tracking store.
+            run_id (str): The run to log to.
+            flush_interval (float): Seconds between two background flushes.
+            max_param_length (int): Longer params are logged as artifacts.
+        """
+        self.client = client
+        self.run_id = run_id
+        self.flush_interval = flush_interval
+        self.max_param_length = max_param_length
+        self.round_trips = 0
+
+        self._params = {}
+        self._tags = {}
+        self._metrics = []
+        self._tasks = []  # Artifacts and child runs, as callables
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def log_param(self, key: str, value):
+        self.log_params({key: value})
+
+    def log_params(self, params: dict):
+        for key, value in params.items():
+            if len(str(value)) > self.max_param_length:
+                artifact_file = f"params/{key}.json"
+
+                def task(key=key, value=value, artifact_file=artifact_file):
+                    self.client.log_dict(self.run_id, {key: value}, artifact_file)
+                    self.round_trips += 1
+
+                self._submit(task)
+                value = f"see artifact {artifact_file}"
+            with self._lock:
+                self._params[key] = str(value)
+
+    def log_metric(self, key: str, value: float, step: int = 0):
+        with self._lock:
+            self._metrics.append(Metric(key, float(value), int(time.time() * 1000), step))
+
+    def log_metrics(self, metrics: dict, step: int = 0):
+        for key, value in metrics.items():
+            self.log_metric(key, value, step)
+
+    def set_tag(self, key: str, value):
+        with self._lock:
+            self._tags[key] = str(value)
+
+    def log_child_run(self, experiment_id: str, run_name: str, params: dict, metrics: dict):
+        """
+        Queues a nested run (e.g. a search candidate) under this run, created and filled
+        in the background with a single batch.
+        """
+        def task():
+            child = self.client.create_run(
+                experiment_id, run_name=run_name, tags={MLFLOW_PARENT_RUN_ID: self.run_id}
+            )
+            self.round_trips += 1
+            timestamp = int(time.time() * 1000)
+            self.client.log_batch(
+                child.info.run_id,
+                metrics=[Metric(key, float(value), timestamp, 0) for key, value in metrics.items()],
+                params=[Param(key, str(value)) for key, value in params.items()]
+            )
+            self.round_trips += 1
+            self.client.set_terminated(child.info.run_id)
+            self.round_trips += 1
+
+        self._submit(task)
+
+    def flush(self):
+        """
+        Sends everything collected so far, from the calling thread. If a call fails, what
+        was not sent yet is queued again for the next flush and the error is raised.
+        """
+        with self._flush_lock:
+            with self._lock:
+                params, self._params = list(self._params.items()), {}
+                tags, self._tags = list(self._tags.items()), {}
+                metrics, self._metrics = self._metrics, []
+                tasks, self._tasks = self._tasks, []
+
+            try:
+                # log_batch accepts at most 100 params + tags and 1000 entities per call
+                while params or tags or metrics:
+                    n_metrics = 1000 - min(len(params), 100) - min(len(tags), 100)
+                    self.client.log_batch(
+                        self.run_id,
+                        metrics=metrics[:n_metrics],
+                        params=[Param(key, value) for key, value in params[:100]],
+                        tags=[RunTag(key, value) for key, value in tags[:100]]
+                    )
+                    params, tags, metrics = params[100:], tags[100:], metrics[n_metrics:]
+                    self.round_trips += 1
+
+                while tasks:
+                    tasks[0]()  # A failed task is run again by the next flush
+                    tasks.pop(0)
+            except Exception:
+                self._requeue(params, tags, metrics, tasks)
+                raise
+
+    def close(self):
+        """Stops the background thread and flushes what is left."""
+        self._stop.set()
+        self._thread.join()
+        self.flush()
+
+    def _requeue(self, params: list, tags: list, metrics: list, tasks: list):
+        with self._lock:
+            # Values logged since the failed flush started are newer than the unsent ones
+            self._params = {**dict(params), **self._params}
+            self._tags = {**dict(tags), **self._tags}
+            self._metrics = metrics + self._metrics
+            self._tasks = tasks + self._tasks
+
+    def _submit(self, task):
+        with self._lock:
+            self._tasks.append(task)
+
+    def _loop(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"❌ MLflow background flush failed, retried at the next flush: {e}")
@@ -0,0 +1,173 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+
+class ModelCache:
+    """
+    Content-addressed local cache for model files downloaded from S3.
+
+    Entries are keyed by bucket/key/ETag and stored as `<sha256>.bin` files in the cache
+    directory, with an `index.json` mapping each bucket/key to its cached ETag. When the
+    total size goes over the limit, the least recently used entries are evicted.
+    """
+
+    def __init__(self, cache_dir: str, max_size_mb: float = 2048):
+        """
+        Args:
+            cache_dir (str): Local directory holding the cached files.
+            max_size_mb (float): Maximum total size of the cache, in MB.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, config: dict):
+        """
+        Builds the cache from the `model_cache` section of the config.
+
+        Returns:
+            ModelCache | None: The cache, or None when it is disabled (`enabled: false`).
+        """
+        section = config.get("model_cache") or {}
+        if not section.get("enabled", True):
+            return None
+        cache_dir = section.get("dir") or os.path.join(tempfile.gettempdir(), "mlops_model_cache")
+        return cls(cache_dir, section.get("max_size_mb", 2048))
+
+    def lookup(self, bucket: str, key: str) -> dict:
+        """
+        Returns the cached entry of an S3 object, or None if it is not cached.
+
+        Args:
+            bucket (str): S3 bucket name.
+            key (str): S3 object key.
+
+        Returns:
+            dict | None: The entry, with its 'etag', 'file' and 'size'.
+        """
+        entry = read_json_index(self.index_path).get(f"{bucket}/{key}")
+        if entry and os.path.exists(self._path(entry["file"])):
+            return entry
+        return None
+
+    def hit(self, bucket: str, key: str) -> str:
+        """
+        Records a cache hit (the ETag was validated by S3) and returns the local file path.
+        """
+        with self._lock:
+            index = read_json_index(self.index_path)
+            entry = index[f"{bucket}/{key}"]
+            entry["last_access"] = time.time()
+            write_json_index(self.index_path, index)
+            self.hits += 1
+            self.bytes_saved += entry["size"]
+        return self._path(entry["file"])
+
+    def store(self, bucket: str, key: str, etag: str, body) -> str:
+        """
+        Writes a downloaded object to the cache and records a cache miss.
+
+        Args:
+            bucket (str): S3 bucket name.
+            key (str): S3 object key.
+            etag (str): ETag of the downloaded object.
+            body: File-like object to copy into the cache.
+
+        Returns:
+            str: Path of the cached file.
+        """
+        file_name = hashlib.sha256(f"{bucket}/{key}/{etag}".encode("utf-8")).hexdigest() + ".bin"
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            shutil.copyfileobj(body, f, length=1024 * 1024)
+        os.replace(tmp_path, self._path(file_name))
+
+        with self._lock:
+            index = read_json_index(self.index_path)
+            previous = index.get(f"{bucket}/{key}")
+            if previous and previous["file"] != file_name:
+                self._remove(previous["file"])
+            index[f"{bucket}/{key}"] = {
+                "etag": etag,
+                "file": file_name,
+                "size": os.path.getsize(self._path(file_name)),
+                "last_access": time.time()
+            }
+            self._evict(index, keep=f"{bucket}/{key}")
+            write_json_index(self.index_path, index)
+            self.misses += 1
+        return self._path(file_name)
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: 'hits', 'misses' and 'bytes_saved' (bytes not downloaded thanks to hits).
+        """
+        return {"hits": self.hits, "misses": self.misses, "bytes_saved": self.bytes_saved}
+
+    def _evict(self, index: dict, keep: str):
+        # Least recently used first, until the cache fits in its budget (the entry being stored is kept)
+        total = sum(entry["size"] for entry in index.values())
+        for name, entry in sorted(index.items(), key=lambda item: item[1]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            self._remove(entry["file"])
+            total -= entry["size"]
+            del index[name]
+            print(f"🗑 Evicted {name} from the model cache")
+
+    def _remove(self, file_name: str):
+        try:
+            os.remove(self._path(file_name))
+        except FileNotFoundError:
+            pass
+
+    def _path(self, file_name: str) -> str:
+        return os.path.join(self.cache_dir, file_name)
+
+
+def read_json_index(path: str) -> dict:
+    """
+    Reads the JSON index of a local cache directory.
+
+    Args:
+        path (str): Path of the index file.
+
+    Returns:
+        dict: The index, empty if the file does not exist or is not valid JSON.
+    """
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def write_json_index(path: str, index: dict):
+    """
+    Writes the JSON index of a local cache directory through a temporary file and an
+    atomic replace, so concurrent processes never read a partial index.
+
+    Args:
+        path (str): Path of the index file.
+        index (dict): The index.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(index, f)
+    os.replace(tmp_path, path)
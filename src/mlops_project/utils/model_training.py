@@ -1,19 +1,89 @@
 import os
+import time
+from contextlib import closing
 
+import numpy as np
 import pandas as pd
 import mlflow
 
-from sklearn.model_selection import train_test_split
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401 (enables HalvingRandomSearchCV)
+from sklearn.model_selection import train_test_split, GridSearchCV, RandomizedSearchCV, HalvingRandomSearchCV
 from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from sklearn.ensemble import HistGradientBoostingClassifier, HistGradientBoostingRegressor
+from sklearn.linear_model import SGDClassifier, SGDRegressor
 from sklearn.metrics import accuracy_score, mean_squared_error, precision_score, recall_score, f1_score
 from sklearn.metrics import mean_absolute_error, r2_score
 
+from mlops_project.utils.data_processing import to_model_input
 from mlops_project.utils.s3_handler import S3Handler
 from mlops_project.utils.mysql_handler import MySQLHandler
 from mlops_project.utils.mlflow_handler import MLflowHandler
 
+# Estimator families selectable with `estimator.name`: classifier, regressor and default parameters
+ESTIMATORS = {
+    # Trees grown on every core
+    "random_forest": (RandomForestClassifier, RandomForestRegressor, {"n_estimators": 100, "n_jobs": -1}),
+    # Histogram-based boosting, stops when the validation score stalls; reads category columns
+    # natively with `processing.categorical: native`
+    "hist_gradient_boosting": (HistGradientBoostingClassifier, HistGradientBoostingRegressor, {
+        "max_iter": 200, "early_stopping": True, "validation_fraction": 0.1, "n_iter_no_change": 10,
+        "categorical_features": "from_dtype"
+    }),
+    # Linear models fitted by stochastic gradient descent, support partial_fit
+    "sgd": (SGDClassifier, SGDRegressor, {"max_iter": 1000, "tol": 1e-3, "early_stopping": True}),
+}
+
+
+def build_estimator(name: str, task_type: str, params: dict = None, seed: int = 42):
+    """
+    Builds an untrained estimator of the registry.
+
+    Args:
+        name (str): Family name, a key of ESTIMATORS.
+        task_type (str): 'classification' or 'regression'.
+        params (dict, optional): Overrides of the family default parameters.
+        seed (int): Random state of the estimator.
+
+    Returns:
+        The estimator.
+    """
+    if name not in ESTIMATORS:
+        raise ValueError(f"Unknown estimator: {name} (expected one of {', '.join(ESTIMATORS)})")
+    classifier, regressor, defaults = ESTIMATORS[name]
+    estimator_class = classifier if task_type == "classification" else regressor
+    return estimator_class(**{**defaults, "random_state": seed, **(params or {})})
+
+def _incremental_strategy(model):
+    # How a trained model is updated with new rows: 'partial_fit', 'warm_start' or None
+    if hasattr(model, "partial_fit"):
+        return "partial_fit"
+    params = model.get_params()
+    if "warm_start" in params and {"n_estimators", "max_iter"} & set(params):
+        return "warm_start"
+    return None
+
+
+def lineage_key(model_key: str) -> str:
+    # S3 key of the lineage document of a model, next to the model
+    return f"{os.path.splitext(model_key)[0]}_lineage.json"
+
+def _without_early_stopping(model) -> dict:
+    # partial_fit rejects early_stopping, and a warm_start boosting would stop right away on the new rows
+    return {"early_stopping": False} if model.get_params().get("early_stopping") else {}
+
 class ModelTrainer:
-    def __init__(self, bucket: str, df_processed: pd.DataFrame, model_key: str, X_train_key: str, config: dict):
+    def __init__(self, bucket: str, df_processed: pd.DataFrame, model_key: str, X_train_key: str, config: dict,
+                 watermark: dict = None):
+        """
+        Args:
+            bucket (str): S3 bucket name.
+            df_processed (pd.DataFrame): Processed training data.
+            model_key (str): S3 key of the model.
+            X_train_key (str): S3 key where the test features are saved.
+            config (dict): The project configuration.
+            watermark (dict, optional): Data watermark of the run, {'from': ..., 'to': ...}
+                (see `DataLoader`), recorded in the model lineage.
+        """
         self.bucket = bucket
         self.df_processed = df_processed
         self.model_key = model_key
@@ -23,11 +93,19 @@ class ModelTrainer:
         self.target = self.config["target"]
         self.seed = self.config.get("seed", 42)
         self.s3 = S3Handler(bucket, self.config)
+        self.retrain = self.config.get("retrain") or {}
+        self.watermark = watermark or {}
+        self.lineage_key = lineage_key(model_key)
+        self.estimator = self.config.get("estimator") or {}
 
         # Initialize MLflow
         self.mysql_handler = MySQLHandler(self.config, os.getenv('MYSQL_DB_MLFLOW'))
         self.mlflow_handler = MLflowHandler(self.mysql_handler, self.config)
         self.experiment_id, self.experiment_name = self.mlflow_handler.setup_experiment()
+        self._chunks, self._classes = None, None  # Streamed training chunks and target classes (out of core)
+        self.tracker = None  # Batched MLflow logger of the active run
+        self.tracking_round_trips = 0
+        self.run_id = None
 
     def run(self):
         X = self.df_processed.drop(columns=[self.target])
@@ -38,18 +116,26 @@ class ModelTrainer:
             stratify=y if self.task_type == "classification" else None
         )
 
-        if self.s3.exists_in_s3(self.model_key):
-            self._retrain_model(X_train, y_train, X_test, y_test)
+        # A single request both checks the model exists and fetches it (or validates the cached copy)
+        model = self.s3.load_model_from_s3(self.model_key, missing_ok=True, mmap=False)  # Trained further, must be writable
+        name = self.estimator.get("name", "random_forest")
+        if model is not None and not isinstance(model, ESTIMATORS[name][:2]):
+            print(f"⚠️ Saved model is a {type(model).__name__}, not a '{name}' estimator. Training from scratch.")
+            model = None
+        if model is not None:
+            self._retrain_model(model, X_train, y_train, X_test, y_test)
         else:
             print("⚠️ Model not found in S3. Falling back to training from scratch.")
             self._train_from_scratch(X_train, y_train, X_test, y_test)
 
-    def _retrain_model(self, X_train, y_train, X_test, y_test):
-        """Retrain an existing model from S3."""
-        model = self.s3.load_model_from_s3(self.model_key)
+    def _retrain_model(self, model, X_train, y_train, X_test, y_test):
+        """
+        Retrain an existing model loaded from S3: refit on the whole dataset, or with
+        `retrain.mode: incremental`, update it with the new rows only (see `_fit_incremental`).
+        """
 
         run_params = {
-            "mode": "retrain",
+            "mode": "incremental" if self.retrain.get("mode") == "incremental" else "retrain",
             "model_type": type(model).__name__,
             "features": list(X_train.columns),
             "dataset_rows": len(X_train) + len(X_test),
@@ -57,28 +143,261 @@ class ModelTrainer:
             "test_rows": len(X_test)
         }
 
+        # The rows are the new ones only: refitting on them would discard what the model learned
+        if run_params["mode"] == "incremental" and _incremental_strategy(model) is None:
+            raise ValueError(f"❌ {type(model).__name__} supports neither partial_fit nor warm_start, it cannot be "
+                             f"updated incrementally. Use retrain.mode: full.")
+
+        # A full refit must not keep growing the trees added by previous incremental runs
+        if run_params["mode"] == "retrain" and "warm_start" in model.get_params():
+            model.set_params(warm_start=False)
+
         self._train_model(model, X_train, y_train, X_test, y_test, run_params)
 
     def _train_from_scratch(self, X_train, y_train, X_test, y_test):
         """Train a new model from scratch."""
-        if self.task_type == "classification":
-            model = RandomForestClassifier(n_estimators=100, random_state=self.seed)
-        else:
-            model = RandomForestRegressor(n_estimators=100, random_state=self.seed)
-
+        name, model = self._build_model(X_train)
+        search = self.config.get("search") or {}
         run_params = {
-            "mode": "from_scratch",
+            "mode": "search" if search.get("enabled") else "from_scratch",
             "model_type": type(model).__name__,
-            "n_estimators": 100,
+            "estimator": name,
             "random_state": self.seed,
             "features": list(X_train.columns),
             "dataset_rows": len(X_train) + len(X_test),
             "train_rows": len(X_train),
             "test_rows": len(X_test)
         }
+        if search.get("enabled"):
+            self._search_space(model)  # Fails before any fit on a space of another family
+            # The parameters of the promoted candidate are logged once the search is done
+            run_params["search_strategy"] = search.get("strategy", "random")
+        else:
+            run_params.update(self._estimator_params(name, model))
 
         self._train_model(model, X_train, y_train, X_test, y_test, run_params)
 
+    def run_out_of_core(self, X_test, y_test, chunks, classes=None, dataset_rows: int = None, train_rows: int = None):
+        """
+        Trains on a dataset larger than memory, streamed chunk by chunk.
+
+        `df_processed` only holds a bounded sample of the training rows. Estimators with
+        `partial_fit` (sgd) are updated chunk by chunk over the whole training data
+        (`out_of_core.epochs` passes over `chunks`), the others are fitted on the sample.
+        The model is evaluated on the held-out rows sampled while streaming.
+
+        Args:
+            X_test (pd.DataFrame): Processed held-out features.
+            y_test (pd.Series): Held-out target.
+            chunks (callable): Returns a new iterator of processed training chunks (X, y),
+                called once per epoch.
+            classes (array-like, optional): Every class of the target (classification),
+                the first `partial_fit` must know them.
+            dataset_rows (int, optional): Number of rows streamed.
+            train_rows (int, optional): Number of training rows streamed (held-out rows excluded).
+        """
+        X_sample = self.df_processed.drop(columns=[self.target])
+        y_sample = self.df_processed[self.target]
+        name, model = self._build_model(X_sample)
+        self._chunks, self._classes = chunks, classes
+
+        run_params = {
+            "mode": "out_of_core",
+            "model_type": type(model).__name__,
+            "estimator": name,
+            **self._estimator_params(name, model),
+            "random_state": self.seed,
+            "features": list(X_sample.columns),
+            "dataset_rows": dataset_rows,
+            # Rows the model learns from: the whole training stream, or the sample
+            "train_rows": train_rows if hasattr(model, "partial_fit") else len(X_sample),
+            "sample_rows": len(X_sample),
+            "test_rows": len(X_test)
+        }
+        self._train_model(model, X_sample, y_sample, X_test, y_test, run_params)
+
+    def _build_model(self, X_train):
+        # Untrained estimator of the `estimator` section
+        name = self.estimator.get("name", "random_forest")
+        model = build_estimator(name, self.task_type, self.estimator.get("params"), self.seed)
+        native = [col for col, dtype in X_train.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)]
+        if native and name != "hist_gradient_boosting":
+            raise ValueError(f"❌ Category columns {native} (processing.categorical: native) "
+                             f"need the hist_gradient_boosting estimator, not '{name}'.")
+        return name, model
+
+    def _estimator_params(self, name: str, model) -> dict:
+        # Family defaults and overrides, logged as run params
+        return {param: value for param, value in model.get_params().items()
+                if param in ESTIMATORS[name][2] or param in (self.estimator.get("params") or {})}
+
+    def _fit_out_of_core(self, model, X_sample, y_sample):
+        """
+        Fits a model without loading the dataset: `partial_fit` over the streamed chunks
+        when the estimator supports it, otherwise a fit on the bounded sample.
+
+        Returns:
+            The fitted model.
+        """
+        if not hasattr(model, "partial_fit"):
+            print(f"🎲 {type(model).__name__} has no partial_fit, fitting on a sample of {len(X_sample)} rows.")
+            model.fit(to_model_input(X_sample), y_sample)
+            self.tracker.log_param("out_of_core_strategy", "sample")
+            return model
+
+        epochs = max((self.config.get("out_of_core") or {}).get("epochs", 1), 1)
+        kwargs = {"classes": self._classes} if self.task_type == "classification" else {}
+        model.set_params(**_without_early_stopping(model))
+        rows = 0
+        for _ in range(epochs):
+            # The prefetching producer of the chunks is stopped if partial_fit fails
+            with closing(self._chunks()) as chunks:
+                for X, y in chunks:
+                    model.partial_fit(to_model_input(X), y, **kwargs)
+                    rows += len(X)
+        print(f"🌊 partial_fit on {rows} streamed rows ({epochs} epoch(s)).")
+        self.tracker.log_params({"out_of_core_strategy": "partial_fit", "epochs": epochs})
+        self.tracker.log_metric("partial_fit_rows", rows)
+        return model
+
+    def _search(self, model, X_train, y_train):
+        """
+        Hyperparameter search over the `search.space` of the config, with candidate fits
+        spread over a process pool. Each candidate is logged as a nested MLflow run under
+        the active run.
+
+        Returns:
+            The best estimator, refit on the whole training set.
+        """
+        search = self.config["search"]
+        space = self._search_space(model)
+        strategy = search.get("strategy", "random")
+        common = {"cv": search.get("cv", 3), "n_jobs": search.get("n_jobs", -1), "refit": True}
+
+        # Parallelism goes across candidates, keep each fit single-threaded to avoid oversubscription
+        n_jobs = model.get_params().get("n_jobs")
+        if "n_jobs" in model.get_params():
+            model.set_params(n_jobs=1)
+
+        if strategy == "grid":
+            searcher = GridSearchCV(model, space, **common)
+        elif strategy == "random":
+            searcher = RandomizedSearchCV(model, space, n_iter=search.get("n_iter", 20),
+                                          random_state=self.seed, **common)
+        elif strategy == "halving":
+            searcher = HalvingRandomSearchCV(model, space, factor=search.get("factor", 3),
+                                             random_state=self.seed, **common)
+        else:
+            raise ValueError(f"Unknown search strategy: {strategy}")
+
+        searcher.fit(to_model_input(X_train), y_train)
+        results = searcher.cv_results_
+        print(f"🔎 {strategy} search: {len(results['params'])} candidates, best CV score {searcher.best_score_:.4f}")
+
+        for i, params in enumerate(results["params"]):
+            metrics = {
+                "cv_score": results["mean_test_score"][i],
+                "cv_score_std": results["std_test_score"][i],
+                "fit_time": results["mean_fit_time"][i],
+                "rank": results["rank_test_score"][i]
+            }
+            if "n_resources" in results:
+                metrics["n_resources"] = results["n_resources"][i]
+            self.tracker.log_child_run(self.experiment_id, f"candidate_{i}", params, metrics)
+
+        self.tracker.log_params({f"best_{name}": value for name, value in searcher.best_params_.items()})
+        best = searcher.best_estimator_
+        # The promoted model predicts with the configured parallelism again
+        if "n_jobs" in best.get_params():
+            best.set_params(n_jobs=n_jobs)
+        self.tracker.log_params({
+            **self._estimator_params(self.estimator.get("name", "random_forest"), best),
+            **{param: value for param, value in best.get_params().items() if param in space}
+        })
+        self.tracker.log_metric("best_cv_score", searcher.best_score_)
+        return best
+
+    def _search_space(self, model) -> dict:
+        """
+        Candidate values of `search.space` for the configured estimator family: the space
+        is keyed by family (`space.<estimator.name>`), or lists the parameters directly.
+
+        Raises:
+            ValueError: If the space has no candidates for the family, or names parameters
+                the estimator does not have.
+        """
+        name = self.estimator.get("name", "random_forest")
+        space = self.config["search"].get("space") or {}
+        if set(space) & set(ESTIMATORS):
+            space = space.get(name) or {}
+        if not space:
+            raise ValueError(f"❌ search.space has no candidates for the '{name}' estimator.")
+        unknown = sorted(set(space) - set(model.get_params()))
+        if unknown:
+            raise ValueError(f"❌ search.space parameters {unknown} are not parameters of "
+                             f"{type(model).__name__} ('{name}' estimator).")
+        return space
+
+    def _fit_incremental(self, model, X_train, y_train):
+        """
+        Updates a trained model with new rows only, so the retrain time scales with the
+        new data instead of the whole dataset: `partial_fit` for the estimators supporting
+        it, or `retrain.n_estimators_step` new trees (forests) or boosting iterations grown
+        on the new rows (`warm_start`).
+
+        Returns:
+            The updated model.
+        """
+        X = to_model_input(X_train)
+        strategy = _incremental_strategy(model)
+        if strategy == "partial_fit":
+            model.set_params(**_without_early_stopping(model))
+            model.partial_fit(X, y_train)
+            self.tracker.log_param("incremental_strategy", "partial_fit")
+        else:
+            # warm_start refits the label encoding on the new rows: the classes must not change
+            classes = getattr(model, "classes_", None)
+            if classes is not None and set(np.unique(y_train)) != set(classes):
+                raise ValueError(f"❌ The new rows have the classes {sorted(np.unique(y_train).tolist())}, "
+                                 f"the saved {type(model).__name__} was trained on {sorted(classes.tolist())}: "
+                                 f"it cannot be updated with warm_start, use retrain.mode: full.")
+            # Forests grow more trees, boosting runs more iterations (from the iteration it stopped at)
+            size = "n_estimators" if "n_estimators" in model.get_params() else "max_iter"
+            trained = getattr(model, "n_iter_", model.get_params()[size])
+            n_estimators = trained + self.retrain.get("n_estimators_step", 50)
+            model.set_params(warm_start=True, **_without_early_stopping(model), **{size: n_estimators})
+            model.fit(X, y_train)
+            self.tracker.log_params({"incremental_strategy": "warm_start", size: n_estimators})
+        return model
+
+    def _write_lineage(self, run_id: str, mode: str, run_params: dict) -> dict:
+        """
+        Records the lineage of the saved model in S3 (next to the model) and as MLflow
+        tags: parent run, generation, data watermark and number of rows trained on.
+
+        Returns:
+            dict: The lineage document.
+        """
+        parent = self.s3.load_json_from_s3(self.lineage_key, missing_ok=True) or {}
+        incremental = mode == "incremental"
+        lineage = {
+            "run_id": run_id,
+            "parent_run_id": parent.get("run_id") if mode in ("retrain", "incremental") else None,
+            "generation": parent.get("generation", -1) + 1 if incremental else 0,
+            "mode": mode,
+            "watermark_from": self.watermark.get("from"),
+            "watermark_to": self.watermark.get("to"),
+            "rows": run_params.get("train_rows"),
+            "total_rows": (parent.get("total_rows") or 0) + (run_params.get("train_rows") or 0) if incremental
+            else run_params.get("train_rows")
+        }
+        self.s3.save_json_to_s3(lineage, self.lineage_key)
+        for name, value in lineage.items():
+            if value is not None and name != "run_id":
+                self.tracker.set_tag(f"lineage.{name}", value)
+        print(f"🧬 Model lineage: generation {lineage['generation']}, {lineage['total_rows']} rows trained on")
+        return lineage
+
     def _train_model(self, model, X_train, y_train, X_test, y_test, run_params):
         """
         Train and evaluate a model while logging to MLflow.
@@ -91,57 +410,101 @@ class ModelTrainer:
             y_test: Test target
             run_params: Dictionary of parameters to log
         """
-        with mlflow.start_run(run_name=run_params.pop("mode", "training")):
-            # Log run parameters
-            for param_name, param_value in run_params.items():
-                mlflow.log_param(param_name, param_value)
+        mode = run_params.pop("mode", "training")
+        with mlflow.start_run(run_name=mode) as run, self.mlflow_handler.batch_logger(run.info.run_id) as tracker:
+            # Params, metrics and tags are batched and sent in the background
+            self.tracker = tracker
+            self.run_id = run.info.run_id
+            tracker.log_params(run_params)
 
             # Set mode tag
-            mlflow.set_tag("mode", run_params.get("mode", "training"))
+            tracker.set_tag("mode", mode)
 
-            # Train model
-            model.fit(X_train, y_train)
-            y_pred = model.predict(X_test)
+            # Train model (the search refits its best candidate on the training set)
+            fit_start = time.perf_counter()
+            if mode == "search":
+                model = self._search(model, X_train, y_train)
+            elif mode == "incremental":
+                model = self._fit_incremental(model, X_train, y_train)
+            elif mode == "out_of_core":
+                model = self._fit_out_of_core(model, X_train, y_train)
+            else:
+                model.fit(to_model_input(X_train), y_train)
+            tracker.log_metric("fit_time_s", time.perf_counter() - fit_start)
+            X_test_input = to_model_input(X_test)
+            predict_start = time.perf_counter()
+            y_pred = model.predict(X_test_input)
+            tracker.log_metric("predict_rows_per_s", len(X_test) / max(time.perf_counter() - predict_start, 1e-9))
+            tracker.log_metric("predict_latency_ms", self._single_row_latency_ms(model, X_test_input))
+            if hasattr(model, "n_iter_"):  # Iterations run before early stopping (boosting, SGD)
+                tracker.log_metric("n_iter", model.n_iter_)
 
             # Log metrics
             score = self._log_metrics(y_test, y_pred)
+            if self.s3.model_cache:
+                for name, value in self.s3.model_cache.stats().items():
+                    tracker.log_metric(f"model_cache_{name}", value)
 
-            # Log model to MLflow
-            mlflow.sklearn.log_model(
-                model,
-                "model",
-                registered_model_name=f"{self.config['project_name']}_{self.task_type}"
-            )
+            # Save to S3 and log to MLflow: the S3 uploads run in the background (multipart) while
+            # the model is logged, and are joined before the run ends. The model is serialized twice:
+            # the joblib file the pipelines memory-map from `model_key`, and the pickle of the MLflow
+            # sklearn flavor, which mlflow.sklearn cannot read from a joblib file
+            model_file = self.s3.dump_model_file(model)
+            tracker.log_metric("model_size_mb", os.path.getsize(model_file) / 1024 ** 2)
+            try:
+                self.s3.submit(self.s3.upload_file, model_file, self.model_key)
+                self.s3.submit(self.s3.save_dataframe_to_s3, X_test, self.X_train_key)
+                # sklearn flavor, loadable by the registry consumers (mlflow.sklearn, pyfunc, serving)
+                mlflow.sklearn.log_model(
+                    model,
+                    "model",
+                    registered_model_name=f"{self.config['project_name']}_{self.task_type}"
+                )
+                self._write_lineage(run.info.run_id, mode, run_params)
+            finally:
+                transfers = self.s3.join()
+                os.remove(model_file)
+            for transfer in transfers:
+                tracker.log_metric(f"upload_mb_s.{os.path.basename(transfer['key'])}", transfer["mb_s"])
 
-            # Save to S3
-            self.s3.save_model_to_s3(model, self.model_key)
-            self.s3.save_csv_to_s3(X_test, self.X_train_key)
+            print(f"✅ Model {mode}. Score: {score:.4f}")
 
-            print(f"✅ Model {run_params.get('mode', 'trained')}. Score: {score:.4f}")
+        self.tracking_round_trips = tracker.round_trips
+        print(f"📡 MLflow tracking store round trips: {self.tracking_round_trips}")
+        return model, score
 
-            return model, score
+    @staticmethod
+    def _single_row_latency_ms(model, X, repeat: int = 20) -> float:
+        # Median time of a one-row predict, the latency of an online request
+        row = X.iloc[:1] if isinstance(X, pd.DataFrame) else X[:1]
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            model.predict(row)
+            timings.append(time.perf_counter() - start)
+        return sorted(timings)[len(timings) // 2] * 1000
 
     def _log_metrics(self, y_test, y_pred):
-        """Log metrics to MLflow based on task type."""
+        """Log metrics to MLflow (through the batched logger) based on task type."""
         # Calculate primary metric
         if self.task_type == "classification":
             score = accuracy_score(y_test, y_pred)
-            mlflow.log_metric("accuracy", score)
+            self.tracker.log_metric("accuracy", score)
 
             # Log additional classification metrics
             try:
-                mlflow.log_metric("precision", precision_score(y_test, y_pred, average='weighted'))
-                mlflow.log_metric("recall", recall_score(y_test, y_pred, average='weighted'))
-                mlflow.log_metric("f1", f1_score(y_test, y_pred, average='weighted'))
+                self.tracker.log_metric("precision", precision_score(y_test, y_pred, average='weighted'))
+                self.tracker.log_metric("recall", recall_score(y_test, y_pred, average='weighted'))
+                self.tracker.log_metric("f1", f1_score(y_test, y_pred, average='weighted'))
             except:
                 pass  # For multi-class cases that might fail
         else:
             # Regression metrics
-            mse = mean_squared_error(y_test, y_pred)
-            mlflow.log_metric("mse", mse)
-            mlflow.log_metric("rmse", mean_squared_error(y_test, y_pred, squared=False))
-            mlflow.log_metric("mae", mean_absolute_error(y_test, y_pred))
-            mlflow.log_metric("r2", r2_score(y_test, y_pred))
+            score = mean_squared_error(y_test, y_pred)
+            self.tracker.log_metric("mse", score)
+            self.tracker.log_metric("rmse", mean_squared_error(y_test, y_pred, squared=False))
+            self.tracker.log_metric("mae", mean_absolute_error(y_test, y_pred))
+            self.tracker.log_metric("r2", r2_score(y_test, y_pred))
 
         return score
 
@@ -1,12 +1,22 @@
 import os
+import tempfile
+import time
 import pandas as pd
 import sqlalchemy
 from dotenv import load_dotenv
-import requests
-from io import StringIO
+from mlops_project.utils.clients import sql_engine
+from mlops_project.utils.instrumentation import record_io
 
 load_dotenv()
 
+# pymysql field type codes -> pandas dtypes (nullable INT columns are read as pandas Int64, so
+# integer values such as 0/1 labels stay integers, see iter_data_from_db)
+_MYSQL_INT_TYPES = {1, 2, 3, 8, 9, 13}  # TINY, SHORT, LONG, LONGLONG, INT24, YEAR
+_MYSQL_DTYPES = {
+    0: "float64", 4: "float64", 5: "float64", 246: "float64",  # DECIMAL, FLOAT, DOUBLE, NEWDECIMAL
+    7: "datetime64[ns]", 10: "datetime64[ns]", 12: "datetime64[ns]",  # TIMESTAMP, DATE, DATETIME
+}
+
 class MySQLHandler:
     def __init__(self, config: dict,  database: str, sql_file_path: str = "config/queries.sql"):
         """
@@ -21,10 +31,13 @@ class MySQLHandler:
 
         self.config = config
         self.engine = self._create_engine()
+        self._local_infile_engine = None
 
-    def _create_engine(self):
+    def _create_engine(self, local_infile: bool = False):
         conn_str = f"mysql+pymysql://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}"
-        return sqlalchemy.create_engine(conn_str)
+        connect_args = {"local_infile": True} if local_infile else {}
+        # Pooled engine shared by every handler of this database (see utils/clients.py)
+        return sql_engine(conn_str, self.config, connect_args)
 
     def load_data_from_db(self, query_name: str) -> pd.DataFrame:
         """
@@ -39,9 +52,46 @@ class MySQLHandler:
         query = self._load_query(query_name)
         with self.engine.connect() as conn:
             df = pd.read_sql(sqlalchemy.text(query), conn)
+        record_io("mysql_bytes_in", df.memory_usage(index=False).sum())
         print(f"✅ Loaded data using query '{query_name}'")
         return df
 
+    def iter_data_from_db(self, query_name: str, chunksize: int, params: dict = None):
+        """
+        Streams data from the database in chunks by executing a named query from the SQL file.
+
+        Rows are fetched through an unbuffered server-side cursor, so neither the driver
+        nor pandas ever holds the full result. Column dtypes are derived once from the
+        result metadata, so every chunk has the same dtypes whatever its values.
+
+        Args:
+            query_name (str): The name of the SQL query to execute (defined via `-- name:`).
+            chunksize (int): Number of rows per chunk.
+            params (dict, optional): Bound parameters of the query (e.g. `:watermark`).
+
+        Yields:
+            pd.DataFrame: The result of the query, chunk by chunk.
+        """
+        query = self._load_query(query_name)
+        n_rows = 0
+        with self.engine.connect() as conn:
+            conn = conn.execution_options(stream_results=True, max_row_buffer=chunksize)
+            result = conn.execute(sqlalchemy.text(query), params or {})
+            columns = list(result.keys())
+            dtypes = {col: _MYSQL_DTYPES.get(type_code, "object") if type_code not in _MYSQL_INT_TYPES
+                      else ("Int64" if null_ok else "int64")
+                      for col, (_, type_code, _, _, _, _, null_ok) in zip(columns, result.cursor.description)}
+
+            while True:
+                rows = result.fetchmany(chunksize)
+                if not rows:
+                    break
+                n_rows += len(rows)
+                chunk = pd.DataFrame.from_records(rows, columns=columns).astype(dtypes)
+                record_io("mysql_bytes_in", chunk.memory_usage(index=False).sum())
+                yield chunk
+        print(f"✅ Streamed {n_rows} rows using query '{query_name}'")
+
     def _load_query(self, query_name: str) -> str:
         """
         Extracts a named SQL query from a .sql file using -- name: <query_name> tags.
@@ -105,27 +155,78 @@ class MySQLHandler:
 
     def populate_table_from_csv_url(self, table_name: str, url: str, columns: list):
         """
-        Loads a CSV from a URL using S3Handler and inserts it into a MySQL table.
+        Streams a CSV from a URL and bulk inserts it into a MySQL table.
+
+        The download is parsed chunk by chunk with the C parser, and each chunk is
+        inserted in its own transaction, either with batched multi-row INSERT statements
+        ('multi') or with LOAD DATA LOCAL INFILE ('load_data', needs `local_infile=1` on
+        the server). Method and chunk size come from the `mysql_ingestion` config section.
 
         Args:
             table_name (str): Target MySQL table name.
             url (str): Public CSV URL to load.
             columns (list): List of column names for the CSV.
         """
+        import requests
+
+        ingestion = self.config.get("mysql_ingestion") or {}
+        method = ingestion.get("method", "multi")
+        chunksize = ingestion.get("chunksize", 50000)
+        insert = self._load_data_infile if method == "load_data" else self._insert_multi_row
 
+        total_rows = 0
+        start = time.perf_counter()
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            print(f"✅ CSV downloaded from {url}")
-            csv_content = response.text
-            df = pd.read_csv(StringIO(csv_content), names=columns, sep=self.config['csv_separator'],engine="python")
+            with requests.get(url, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                print(f"✅ Streaming CSV from {url}")
+                reader = pd.read_csv(response.raw, names=columns, sep=self.config['csv_separator'] or ",",
+                                     engine="c", chunksize=chunksize)
+                for chunk in reader:
+                    chunk_start = time.perf_counter()
+                    insert(table_name, chunk)
+                    record_io("mysql_bytes_out", chunk.memory_usage(index=False).sum())
+                    total_rows += len(chunk)
+                    elapsed = time.perf_counter() - chunk_start
+                    print(f"📦 Inserted {len(chunk)} rows in {elapsed:.2f}s ({len(chunk) / max(elapsed, 1e-9):.0f} rows/s)")
         except requests.RequestException as e:
             print(f"❌ Failed to download CSV: {e}")
             raise
 
-        # Insert into MySQL
-        df.to_sql(table_name, con=self.engine, if_exists="append", index=False)
-        print(f"✅ Inserted {len(df)} rows into table '{table_name}' from {url}")
+        elapsed = time.perf_counter() - start
+        print(f"✅ Inserted {total_rows} rows into table '{table_name}' from {url} "
+              f"in {elapsed:.2f}s ({total_rows / max(elapsed, 1e-9):.0f} rows/s, method '{method}')")
 
+    def _insert_multi_row(self, table_name: str, df: pd.DataFrame):
+        """
+        Inserts a DataFrame in one transaction. pymysql's executemany rewrites the INSERT
+        into multi-row statements, so a chunk costs a handful of round trips.
+        """
+        column_list = ", ".join(f"`{col}`" for col in df.columns)
+        placeholders = ", ".join(["%s"] * len(df.columns))
+        statement = f"INSERT INTO `{table_name}` ({column_list}) VALUES ({placeholders})"
+        rows = list(df.astype(object).where(df.notna(), None).itertuples(index=False, name=None))
 
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql(statement, rows)
 
+    def _load_data_infile(self, table_name: str, df: pd.DataFrame):
+        """
+        Inserts a DataFrame in one transaction with LOAD DATA LOCAL INFILE, through a
+        temporary CSV file (NULLs written as \\N).
+        """
+        if self._local_infile_engine is None:
+            self._local_infile_engine = self._create_engine(local_infile=True)
+
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as f:
+            df.to_csv(f, header=False, index=False, na_rep="\\N", lineterminator="\n")
+        try:
+            column_list = ", ".join(f"`{col}`" for col in df.columns)
+            statement = (f"LOAD DATA LOCAL INFILE '{f.name}' INTO TABLE `{table_name}` "
+                         f"FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' "
+                         f"LINES TERMINATED BY '\\n' ({column_list})")
+            with self._local_infile_engine.begin() as conn:
+                conn.exec_driver_sql(statement)
+        finally:
+            os.remove(f.name)
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+# hash_pandas_object key, fixed so that a row is assigned to the same split on every pass and run
+_HASH_KEY = "mlops_holdout_01"
+
+
+class ReservoirSample:
+    """
+    Uniform random sample of bounded size over a stream of DataFrame chunks
+    (reservoir sampling, applied chunk by chunk with vectorised draws).
+
+    Every row of the stream has the same probability to be in the sample, whatever
+    the stream length, and memory stays bounded by the sample size plus one chunk.
+    """
+
+    def __init__(self, size: int, seed: int = 42):
+        """
+        Args:
+            size (int): Maximum number of rows of the sample.
+            seed (int): Seed of the draws.
+        """
+        self.size = size
+        self.rows_seen = 0
+        self.sample = None
+        self._rng = np.random.default_rng(seed)
+
+    def add(self, chunk: pd.DataFrame):
+        """
+        Offers the rows of a chunk to the sample.
+
+        Args:
+            chunk (pd.DataFrame): The next rows of the stream.
+        """
+        if chunk.empty:
+            return
+        chunk = chunk.reset_index(drop=True)
+        if self.sample is None:
+            self.sample = chunk.iloc[:0]
+
+        # Fill the reservoir first
+        free = max(self.size - len(self.sample), 0)
+        if free:
+            self.sample = pd.concat([self.sample, chunk.iloc[:free]], ignore_index=True)
+        rest = chunk.iloc[free:]
+
+        # Row number i of the stream replaces a random slot with probability size / (i + 1)
+        positions = self.rows_seen + free + np.arange(len(rest))
+        slots = (self._rng.random(len(rest)) * (positions + 1)).astype(np.int64)
+        replace = slots < self.size
+        if replace.any():
+            take = np.arange(len(self.sample))
+            # Later rows overwrite earlier ones in the same slot, like the sequential algorithm
+            take[slots[replace]] = len(self.sample) + np.arange(replace.sum())
+            self.sample = pd.concat([self.sample, rest[replace]], ignore_index=True).iloc[take].reset_index(drop=True)
+        self.rows_seen += len(chunk)
+
+    def frame(self) -> pd.DataFrame:
+        """Returns the sampled rows (an empty DataFrame if no row was offered)."""
+        return self.sample if self.sample is not None else pd.DataFrame()
+
+
+def holdout_mask(chunk: pd.DataFrame, fraction: float, id_column: str = None) -> np.ndarray:
+    """
+    Selects the held-out rows of a chunk from a hash of the row id (or of the whole row
+    without id column), so the split needs no global shuffle: each row falls in the same
+    split on every pass over the data, and duplicated rows never straddle the split.
+
+    Args:
+        chunk (pd.DataFrame): Raw rows.
+        fraction (float): Expected fraction of held-out rows.
+        id_column (str, optional): Column identifying the rows.
+
+    Returns:
+        np.ndarray: Boolean mask of the held-out rows.
+    """
+    keys = chunk[id_column] if id_column and id_column in chunk.columns else chunk
+    hashes = pd.util.hash_pandas_object(keys, index=False, hash_key=_HASH_KEY).to_numpy()
+    return (hashes % 10000) < fraction * 10000
@@ -0,0 +1,128 @@
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from mlops_project.utils.s3_handler import load_model
+
+# Model of a worker process, loaded once by `_init_worker`
+_WORKER_MODEL = None
+
+# CPU quota of the container: cgroup v2 file, cgroup v1 controller directory
+_CGROUP_V2_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+_CGROUP_V1_CPU_DIR = "/sys/fs/cgroup/cpu"
+
+
+class ShardedScorer:
+    """
+    Scores large batches on a pool of worker processes.
+
+    Each worker loads the model artifact once from a local file, with memory-mapped
+    arrays (`mmap_mode`), so the workers share one copy of the model through the page
+    cache instead of each receiving a pickled copy. Inputs are split into row shards,
+    scored in parallel and reassembled in order. Use it as a context manager, it exposes
+    the `predict` method of an estimator.
+    """
+
+    def __init__(self, model_path: str, workers: int = None, shard_rows: int = 50000,
+                 mmap_mode: str = "r", start_method: str = "spawn"):
+        """
+        Args:
+            model_path (str): Local model artifact (see `S3Handler.fetch_model_file`).
+            workers (int, optional): Number of worker processes, by default the CPUs
+                available to the container (see `available_cpus`).
+            shard_rows (int): Maximum number of rows per shard.
+            mmap_mode (str): Memory-mapping of the model arrays in the workers.
+            start_method (str): Multiprocessing start method of the workers.
+        """
+        self.model_path = model_path
+        self.workers = workers or available_cpus()
+        self.shard_rows = shard_rows
+        self.mmap_mode = mmap_mode
+        self.start_method = start_method
+        self.pool = None
+
+    def __enter__(self):
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(self.start_method),
+            initializer=_init_worker,
+            initargs=(self.model_path, self.mmap_mode)
+        )
+        return self
+
+    def predict(self, X) -> np.ndarray:
+        """
+        Predicts a DataFrame or a sparse matrix, shard by shard on the worker processes.
+
+        Args:
+            X (pd.DataFrame | scipy.sparse.csr_matrix): The model input.
+
+        Returns:
+            np.ndarray: The predictions, in the order of the input rows.
+        """
+        if self.pool is None:
+            raise RuntimeError("ShardedScorer must be used as a context manager.")
+        n_rows = X.shape[0]
+        if n_rows == 0:
+            return np.array([])
+        n_shards = min(n_rows, max(self.workers, math.ceil(n_rows / self.shard_rows)))
+        bounds = np.linspace(0, n_rows, n_shards + 1, dtype=int)
+        shards = [_rows(X, start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]
+        # map() yields the results in submission order
+        return np.concatenate(list(self.pool.map(_predict_shard, shards)))
+
+    def __exit__(self, exc_type, exc, tb):
+        self.pool.shutdown(cancel_futures=exc_type is not None)
+        self.pool = None
+
+
+def available_cpus() -> int:
+    """
+    Number of CPUs this process may use: the cgroup CPU quota of the container when
+    there is one (ECS task CPU, cgroup v2 or v1), otherwise the CPUs of its affinity mask.
+    """
+    quota = _cgroup_cpu_quota()
+    if quota is not None:
+        return max(1, int(quota))
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _cgroup_cpu_quota():
+    # CPUs allowed by the cgroup quota (quota / period), None without a quota
+    try:
+        with open(_CGROUP_V2_CPU_MAX) as f:
+            quota, period = f.read().split()
+        return int(quota) / int(period) if quota != "max" else None
+    except (OSError, ValueError):
+        pass
+    try:  # cgroup v1, -1 means no quota
+        with open(os.path.join(_CGROUP_V1_CPU_DIR, "cpu.cfs_quota_us")) as f:
+            quota = int(f.read())
+        with open(os.path.join(_CGROUP_V1_CPU_DIR, "cpu.cfs_period_us")) as f:
+            period = int(f.read())
+        return quota / period if quota > 0 and period > 0 else None
+    except (OSError, ValueError):
+        return None
+
+
+def _rows(X, start: int, stop: int):
+    return X.iloc[start:stop] if isinstance(X, pd.DataFrame) else X[start:stop]
+
+
+def _init_worker(model_path: str, mmap_mode: str):
+    global _WORKER_MODEL
+    _WORKER_MODEL = load_model(model_path, mmap_mode)
+    # Parallelism comes from the shards, keep each predict single-threaded
+    if "n_jobs" in _WORKER_MODEL.get_params():
+        _WORKER_MODEL.set_params(n_jobs=1)
+
+
+def _predict_shard(X) -> np.ndarray:
+    return _WORKER_MODEL.predict(X)
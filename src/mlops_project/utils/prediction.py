@@ -1,6 +1,12 @@
+import tempfile
+import time
+from contextlib import closing, contextmanager, nullcontext
+
 import pandas as pd
 
-from mlops_project.utils.s3_handler import S3Handler
+from mlops_project.utils.data_processing import to_model_input
+from mlops_project.utils.parallel_scoring import ShardedScorer, available_cpus
+from mlops_project.utils.s3_handler import S3Handler, DataFrameStreamWriter, format_from_key, load_model
 
 class Predictor:
     def __init__(self, bucket: str, model_key: str, processed_data: pd.DataFrame, prediction_output_key: str, config: dict):
@@ -12,28 +18,141 @@ class Predictor:
         self.id_column = self.config.get("id_column", None)
         self.target = self.config.get("target")
         self.s3 = S3Handler(bucket, self.config)
+        self.prefetcher = None  # Set by `prefetch_model`
+        self._model_dir = None  # Directory of the prefetched artifact, removed when the prefetcher exits
+
+    def prefetch_model(self, prefetcher):
+        """
+        Starts fetching the model artifact in the background (task 'model' of the
+        prefetcher), while the data is loaded and processed. `scoring_model` waits for it.
+        The model is also loaded in the background when scoring is single-process; when
+        worker processes may score, they load the artifact themselves and the main
+        process only loads it if the batch turns out to be scored in process.
+
+        Args:
+            prefetcher (Prefetcher): The running prefetcher.
+        """
+        self.prefetcher = prefetcher
+        self._model_dir = tempfile.TemporaryDirectory()
+        prefetcher.cleanup(self._model_dir.cleanup)
+        prefetcher.submit("model", self._fetch_model, self._model_dir.name, self._scoring_settings()[0] <= 1)
+
+    def _fetch_model(self, dest_dir: str, load: bool) -> tuple:
+        # Local artifact, and the model itself when it is scored in process only
+        path = self.s3.fetch_model_file(self.model_key, dest_dir)
+        return path, self._load_model_file(path) if load else None
+
+    def _load_model_file(self, path: str):
+        model = load_model(path, (self.config.get("model_artifact") or {}).get("mmap_mode", "r"))
+        print(f"✅ Loaded model from s3://{self.bucket}/{self.model_key}")
+        return model
+
+    def _scoring_settings(self) -> tuple:
+        # Worker processes and rows per shard of the `scoring` section
+        settings = self.config.get("scoring") or {}
+        return settings.get("workers") or available_cpus(), settings.get("shard_rows", 50000)
 
     def run(self):
-        # Load data and model
-        model = self.s3.load_model_from_s3(self.model_key)
+        # Load the model (or start the scoring workers) and predict
+        with self.scoring_model(len(self.df_processed)) as model:
+            if self.s3.model_cache:
+                print(f"📊 Model cache: {self.s3.model_cache.stats()}")
+            start = time.perf_counter()
+            output = self.predict(model, self.df_processed)
+            elapsed = time.perf_counter() - start
+            print(f"🔮 {len(output)} rows scored in {elapsed:.2f}s ({len(output) / max(elapsed, 1e-9):.0f} rows/s)")
 
-        # Remove target if present (in test datasets for example)
+        # Save predictions to S3s (format from the key extension)
+        self.s3.save_dataframe_to_s3(output.reset_index(), self.prediction_output_key)
+        print(f"✅ Predictions saved to s3://{self.bucket}/{self.prediction_output_key}")
+
+        return output
+
+    def run_streaming(self, chunks):
+        """
+        Predicts chunk by chunk and streams the results to S3 as a multipart upload.
+
+        Peak memory is about one chunk whatever the dataset size. CSV outputs have the
+        same layout as the one written by `run()`.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): Processed data, chunk by chunk.
 
-        if self.target and self.target in self.df_processed.columns:
-            self.df_processed = self.df_processed.drop(columns=[self.target])
+        Returns:
+            int: The total number of predicted rows.
+        """
+        total_rows = 0
+        start = time.perf_counter()
+        # A prefetching iterator is stopped (with the chunk it holds) if scoring or the upload fails
+        with closing(chunks) if hasattr(chunks, "close") else nullcontext(), self.scoring_model() as model, \
+                self.s3.open_multipart_upload(self.prediction_output_key) as sink:
+            writer = DataFrameStreamWriter(sink, format_from_key(self.prediction_output_key))
+            for i, chunk in enumerate(chunks):
+                chunk_start = time.perf_counter()
+                output = self.predict(model, chunk).reset_index()
+                output.index = pd.RangeIndex(total_rows, total_rows + len(output))
+                writer.write(output)
 
-        # Predict
-        predictions = model.predict(self.df_processed)
+                total_rows += len(output)
+                elapsed = time.perf_counter() - chunk_start
+                print(f"📦 Chunk {i}: {len(output)} rows in {elapsed:.2f}s ({len(output) / max(elapsed, 1e-9):.0f} rows/s)")
+            writer.close()
 
-        # Create output DataFrame
-        output = pd.DataFrame(predictions, columns=["prediction"])
+        elapsed = time.perf_counter() - start
+        print(f"✅ {total_rows} predictions streamed to s3://{self.bucket}/{self.prediction_output_key} "
+              f"in {elapsed:.2f}s ({total_rows / max(elapsed, 1e-9):.0f} rows/s)")
+        return total_rows
+
+    @contextmanager
+    def scoring_model(self, n_rows: int = None):
+        """
+        Provides what `predict` scores with: the model itself, or a `ShardedScorer` when
+        the `scoring` config allows several worker processes and the batch is larger than
+        one shard (`n_rows` None means unknown, e.g. streamed chunks). An artifact prefetched
+        with `prefetch_model` is waited for instead of downloaded.
+
+        Args:
+            n_rows (int, optional): Number of rows to score.
+
+        Yields:
+            The model, or the running `ShardedScorer`.
+        """
+        settings = self.config.get("scoring") or {}
+        workers, shard_rows = self._scoring_settings()
+        path, model = self.prefetcher.result("model") if self.prefetcher else (None, None)
+        if workers <= 1 or (n_rows is not None and n_rows <= shard_rows):
+            if model is None:
+                model = self._load_model_file(path) if path else self.s3.load_model_from_s3(self.model_key)
+            yield model
+            return
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = path or self.s3.fetch_model_file(self.model_key, tmp)
+            mmap_mode = (self.config.get("model_artifact") or {}).get("mmap_mode", "r")
+            with ShardedScorer(path, workers, shard_rows, mmap_mode, settings.get("start_method", "spawn")) as scorer:
+                print(f"🧵 Scoring on {workers} worker processes, shards of up to {shard_rows} rows")
+                yield scorer
+
+    def predict(self, model, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Predicts a processed DataFrame.
+
+        Args:
+            model: The trained model.
+            df (pd.DataFrame): Processed data (the target is dropped if present).
+
+        Returns:
+            pd.DataFrame: A 'prediction' column indexed like the input.
+        """
+        # Remove target if present (in test datasets for example)
+        if self.target and self.target in df.columns:
+            df = df.drop(columns=[self.target])
+
+        # Create output DataFrame, keeping the input index (ids)
+        output = pd.DataFrame({"prediction": model.predict(to_model_input(df))}, index=df.index)
 
         # If index is meaningful (from id_column), preserve it in output
         if self.id_column:
             output.index.name = self.id_column  # Rename index explicitly
 
-        # Save predictions to S3s
-        self.s3.save_csv_to_s3(output.reset_index(), self.prediction_output_key)
-        print(f"✅ Predictions saved to s3://{self.bucket}/{self.prediction_output_key}")
-
-        return output
\ No newline at end of file
+        return output
@@ -0,0 +1,172 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Prefetcher:
+    """
+    Runs I/O-bound pipeline steps (model download, preprocessing state) on background
+    threads while the main thread loads and processes the data.
+
+    Every task is named. `result` waits for a task and records how long the task ran
+    ('run_s'), how long the caller was blocked on it ('wait_s') and the difference, the
+    time hidden behind the other steps ('saved_s'). Use it as a context manager: on exit,
+    the tasks are waited for, then the functions registered with `cleanup` are called.
+    """
+
+    def __init__(self, workers: int = 2):
+        """
+        Args:
+            workers (int): Number of background threads.
+        """
+        self.workers = workers
+        self.timings = {}
+        self._futures = {}
+        self._cleanups = []
+        self._executor = None
+
+    def __enter__(self):
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="prefetch")
+        return self
+
+    def submit(self, name: str, fn, *args, **kwargs):
+        """
+        Starts a task in the background.
+
+        Args:
+            name (str): Name of the task, to get its result with `result`.
+            fn (callable): The function to run, with `args` and `kwargs`.
+
+        Returns:
+            concurrent.futures.Future: The future of the task.
+        """
+        timing = self.timings[name] = {"run_s": None, "wait_s": None, "saved_s": None}
+
+        def task():
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                timing["run_s"] = round(time.perf_counter() - start, 4)
+
+        self._futures[name] = self._executor.submit(task)
+        return self._futures[name]
+
+    def cleanup(self, fn):
+        """
+        Registers a function called when the prefetcher exits, e.g. to remove the
+        temporary directory a task downloads into.
+
+        Args:
+            fn (callable): Called without arguments.
+        """
+        self._cleanups.append(fn)
+
+    def has(self, name: str) -> bool:
+        """Whether a task of this name was submitted."""
+        return name in self._futures
+
+    def result(self, name: str):
+        """
+        Waits for a task and returns its result (its exception is raised).
+
+        Args:
+            name (str): Name of the task.
+        """
+        start = time.perf_counter()
+        try:
+            return self._futures[name].result()
+        finally:
+            timing = self.timings[name]
+            if timing["wait_s"] is None:
+                timing["wait_s"] = round(time.perf_counter() - start, 4)
+                timing["saved_s"] = round(max((timing["run_s"] or 0) - timing["wait_s"], 0), 4)
+                print(f"⚡ Prefetched {name} in {timing['run_s']:.2f}s, waited {timing['wait_s']:.2f}s for it")
+
+    def stats(self) -> dict:
+        """
+        Returns the timings of the waited tasks as flat values (e.g. 'prefetch_model_saved_s').
+        """
+        return {f"prefetch_{name}_{key}": value for name, timing in self.timings.items()
+                for key, value in timing.items() if value is not None}
+
+    def __exit__(self, exc_type, exc, tb):
+        self._executor.shutdown(wait=True, cancel_futures=exc_type is not None)
+        self._executor = None
+        for fn in reversed(self._cleanups):
+            fn()
+        self._cleanups = []
+
+
+class PrefetchIterator:
+    """
+    Iterates over an iterable on a background thread, up to `depth` items ahead, so
+    that producing item N+1 (e.g. downloading and processing a chunk) overlaps the use
+    of item N (e.g. scoring it). Memory stays bounded by the depth. The exception of the
+    producer is raised to the consumer. `wait_s` sums the time the consumer was blocked.
+    Used as a context manager, the producer is stopped when the consumer leaves early.
+    """
+
+    _DONE = object()
+
+    def __init__(self, iterable, depth: int = 1):
+        """
+        Args:
+            iterable (Iterable): The items to produce, e.g. processed chunks.
+            depth (int): Maximum number of items produced ahead of the consumer.
+        """
+        self.wait_s = 0.0
+        self._queue = queue.Queue(maxsize=max(depth, 1))
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._produce, args=(iterable,), name="prefetch-iter", daemon=True)
+        self._thread.start()
+
+    def __iter__(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __next__(self):
+        start = time.perf_counter()
+        item, error = self._queue.get()
+        self.wait_s += time.perf_counter() - start
+        if error is not None:
+            self.close()
+            raise error
+        if item is self._DONE:
+            self.close()
+            raise StopIteration
+        return item
+
+    def close(self):
+        """Stops the producer, e.g. when the consumer fails before the end."""
+        self._stop.set()
+        while self._thread.is_alive():
+            try:
+                self._queue.get(timeout=0.1)  # Unblock a pending put
+            except queue.Empty:
+                pass
+        self._thread.join()
+
+    def _produce(self, iterable):
+        try:
+            for item in iterable:
+                if not self._put((item, None)):
+                    return
+            self._put((self._DONE, None))
+        except Exception as e:
+            self._put((None, e))
+
+    def _put(self, entry) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
@@ -1,57 +1,491 @@
 import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO, StringIO
 import pandas as pd
-import boto3
-import pickle
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+from mlops_project.utils.clients import s3_client
+from mlops_project.utils.instrumentation import record_io
+from mlops_project.utils.model_cache import ModelCache
+
+# Storage formats for datasets, by file extension
+FORMAT_EXTENSIONS = {"csv": "csv", "parquet": "parquet", "arrow": "arrow"}
+
+# Rows per record batch of the Arrow IPC files, the unit in which chunked reads decode them
+ARROW_BATCH_ROWS = 64 * 1024
+
+
+# Compressions of the model artifacts (joblib), None -> uncompressed and memory-mappable
+MODEL_COMPRESSIONS = (None, "zlib", "gzip", "bz2", "lzma", "lz4")
+
+
+def dump_model(model, path: str, compress: str = None, level: int = 3):
+    """
+    Writes a model artifact with joblib: numpy arrays (e.g. the tree arrays of a forest)
+    are stored as raw buffers next to the pickle stream, not pickled themselves.
+
+    Args:
+        model: The model object to serialize.
+        path (str): Destination file.
+        compress (str, optional): One of MODEL_COMPRESSIONS ('lz4' needs the lz4 package).
+            Uncompressed artifacts can be memory-mapped when loaded.
+        level (int): Compression level.
+    """
+    if compress not in MODEL_COMPRESSIONS:
+        raise ValueError(f"Unknown model compression: {compress}")
+    import joblib
+
+    joblib.dump(model, path, compress=(compress, level) if compress else 0)
+
+
+def load_model(path: str, mmap_mode: str = None):
+    """
+    Reads a model artifact written by `dump_model` (or a plain pickle of older runs).
+
+    Args:
+        path (str): The artifact file.
+        mmap_mode (str, optional): 'r' to memory-map the numpy arrays of an uncompressed
+            artifact, so several processes loading the same file share one copy in the
+            page cache. Ignored for compressed artifacts.
+
+    Returns:
+        The deserialized model object.
+    """
+    if mmap_mode:
+        with open(path, "rb") as f:
+            if f.read(1) != b"\x80":  # Not a raw pickle stream: compressed, cannot be mapped
+                mmap_mode = None
+    import joblib
+
+    return joblib.load(path, mmap_mode=mmap_mode)
+
+
+def format_from_key(key: str) -> str:
+    """Storage format of a dataset from its key extension ('.csv.gz' and unknown extensions are CSV)."""
+    for fmt, extension in FORMAT_EXTENSIONS.items():
+        if key.endswith(f".{extension}"):
+            return fmt
+    return "csv"
+
+
+def dataframe_to_bytes(df: pd.DataFrame, fmt: str, index: bool = True) -> bytes:
+    """
+    Serializes a DataFrame to CSV, Parquet or Arrow IPC.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to serialize.
+        fmt (str): 'csv', 'parquet' or 'arrow'.
+        index (bool): Whether to store the index. Parquet and Arrow keep its dtype and name.
+
+    Returns:
+        bytes: The serialized DataFrame.
+    """
+    # Sparse columns (sparse one-hot output of DataProcessor) are stored dense
+    sparse_columns = {col: dtype.subtype for col, dtype in df.dtypes.items() if isinstance(dtype, pd.SparseDtype)}
+    if sparse_columns:
+        df = df.astype(sparse_columns)
+
+    if fmt == "csv":
+        return df.to_csv(index=index).encode("utf-8")
+
+    # pyarrow's Parquet module is only imported when the Parquet format is used
+    import pyarrow as pa
+
+    buffer = BytesIO()
+    table = pa.Table.from_pandas(df, preserve_index=index)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, buffer, compression="snappy")
+    elif fmt == "arrow":
+        options = pa.ipc.IpcWriteOptions(compression="zstd")
+        with pa.ipc.new_file(buffer, table.schema, options=options) as writer:
+            # Bounded record batches, so that the file can be read back batch by batch
+            writer.write_table(table, max_chunksize=ARROW_BATCH_ROWS)
+    else:
+        raise ValueError(f"Unknown storage format: {fmt}")
+    return buffer.getvalue()
+
+
+def dataframe_from_bytes(raw: bytes, fmt: str, columns: list = None, sep: str = None) -> pd.DataFrame:
+    """
+    Deserializes a DataFrame written by `dataframe_to_bytes`.
+
+    Args:
+        raw (bytes): The serialized DataFrame.
+        fmt (str): 'csv', 'parquet' or 'arrow'.
+        columns (list, optional): Only read these columns (the index is always restored).
+        sep (str, optional): CSV separator, by default ','.
+
+    Returns:
+        pd.DataFrame: The DataFrame, with dtypes and index preserved for Parquet and Arrow.
+    """
+    if fmt == "csv":
+        return pd.read_csv(BytesIO(raw), sep=sep or ",", usecols=columns)
+
+    import pyarrow as pa
+
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(pa.BufferReader(raw), columns=columns, use_pandas_metadata=True)
+    elif fmt == "arrow":
+        table = pa.ipc.open_file(pa.BufferReader(raw)).read_all()
+        if columns is not None:
+            index_columns = [col for col in _pandas_index_columns(table.schema) if col not in columns]
+            table = table.select(list(columns) + index_columns)
+    else:
+        raise ValueError(f"Unknown storage format: {fmt}")
+    return table.to_pandas()
+
+
+def _iter_arrow_batches(reader, chunksize: int):
+    """Record batches of an Arrow IPC file of at most `chunksize` rows, decoded one at a time."""
+    for i in range(reader.num_record_batches):
+        batch = reader.get_batch(i)
+        for start in range(0, batch.num_rows, chunksize):
+            yield batch.slice(start, chunksize)
+
+
+def _pandas_index_columns(schema) -> list:
+    """Names of the stored index columns, from the pandas metadata of an Arrow schema."""
+    metadata = schema.pandas_metadata or {}
+    return [col for col in metadata.get("index_columns", []) if isinstance(col, str)]
+
+
+def _count_bytes_out(request, **kwargs):
+    # botocore hook: size of every request body sent to S3 (put_object, upload_part, ...),
+    # the decoded length is the one to read when the body is sent with aws-chunked encoding
+    headers = request.headers
+    record_io("s3_bytes_out", headers.get("X-Amz-Decoded-Content-Length") or headers.get("Content-Length", 0))
+
+
+def _count_bytes_in(parsed, **kwargs):
+    # botocore hook: size of every object body received from S3
+    record_io("s3_bytes_in", parsed.get("ContentLength", 0))
+
+
+class _StreamingBodyReader(io.RawIOBase):
+    """Raw binary reader over a botocore StreamingBody, so it can be buffered and peeked."""
+
+    def __init__(self, body):
+        self.body = body
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self.body.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        self.body.close()
+        super().close()
+
+
+class DataFrameStreamWriter:
+    """
+    Writes DataFrame chunks one after the other into a single CSV, Parquet or Arrow file.
+
+    The index is written for CSV only (legacy layout), columnar formats expect the index
+    to have been reset into columns beforehand.
+    """
+
+    def __init__(self, sink, fmt: str):
+        self.sink = sink
+        self.fmt = fmt
+        self.writer = None
+
+    def write(self, df: pd.DataFrame):
+        if self.fmt == "csv":
+            self.sink.write(df.to_csv(header=self.writer is None).encode("utf-8"))
+            self.writer = True
+            return
+
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self.writer is None:
+            if self.fmt == "parquet":
+                import pyarrow.parquet as pq
+
+                self.writer = pq.ParquetWriter(self.sink, table.schema, compression="snappy")
+            else:
+                options = pa.ipc.IpcWriteOptions(compression="zstd")
+                self.writer = pa.ipc.new_file(self.sink, table.schema, options=options)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.fmt != "csv" and self.writer is not None:
+            self.writer.close()
+
+
+class S3MultipartWriter:
+    """
+    File-like writer streaming bytes to an S3 object through a multipart upload.
+
+    Data is buffered until a part is full (S3 requires at least 5 MB per part except
+    the last one), so memory stays bounded by the part size whatever the object size.
+    The upload is completed on a clean exit and aborted if an exception is raised.
+    """
+
+    MIN_PART_SIZE = 5 * 1024 * 1024
+
+    def __init__(self, s3, bucket: str, key: str, part_size: int = 8 * 1024 * 1024):
+        self.s3 = s3
+        self.bucket = bucket
+        self.key = key
+        self.part_size = max(part_size, self.MIN_PART_SIZE)
+        self.buffer = BytesIO()
+        self.parts = []
+        self.upload_id = None
+        self.bytes_written = 0
+
+    def __enter__(self):
+        response = self.s3.create_multipart_upload(Bucket=self.bucket, Key=self.key)
+        self.upload_id = response["UploadId"]
+        return self
+
+    def write(self, data: bytes):
+        self.buffer.write(data)
+        self.bytes_written += len(data)
+        if self.buffer.tell() >= self.part_size:
+            self._upload_part()
+        return len(data)
+
+    def tell(self) -> int:
+        return self.bytes_written
+
+    def flush(self):
+        pass
+
+    @property
+    def closed(self) -> bool:
+        return False
+
+    def _upload_part(self):
+        part_number = len(self.parts) + 1
+        response = self.s3.upload_part(
+            Bucket=self.bucket, Key=self.key, UploadId=self.upload_id,
+            PartNumber=part_number, Body=self.buffer.getvalue()
+        )
+        self.parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+        self.buffer = BytesIO()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.s3.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id)
+            return False
+
+        if self.buffer.tell() or not self.parts:
+            self._upload_part()
+        self.s3.complete_multipart_upload(
+            Bucket=self.bucket, Key=self.key, UploadId=self.upload_id,
+            MultipartUpload={"Parts": self.parts}
+        )
+        return False
+
 
 class S3Handler:
     def __init__(self, bucket: str, config: dict):
         self.bucket = bucket
-        self.s3 = boto3.client("s3")
+        self.s3 = s3_client(config)
+        # The client is shared, the unique ids keep the hooks from being registered twice
+        self.s3.meta.events.register("request-created.s3", _count_bytes_out, unique_id="mlops_s3_bytes_out")
+        self.s3.meta.events.register("after-call.s3.GetObject", _count_bytes_in, unique_id="mlops_s3_bytes_in")
         self.config = config
+        self.model_cache = ModelCache.from_config(config)
 
+        # Large objects are sent as multipart uploads of concurrent parts (`transfers` section)
+        transfers = config.get("transfers") or {}
+        self.transfer_config = TransferConfig(
+            multipart_threshold=int(transfers.get("multipart_threshold_mb", 16) * 1024 ** 2),
+            multipart_chunksize=int(transfers.get("multipart_chunksize_mb", 16) * 1024 ** 2),
+            max_concurrency=transfers.get("max_concurrency", 8),
+        )
+        self.upload_workers = transfers.get("upload_workers", 4)
+        self.transfers = []  # Throughput of the uploads since the last `join`, see `upload_file`
+        self._executor = None
+        self._pending = []
+        self._transfers_lock = threading.Lock()
 
-    def load_csv_from_s3(self, key: str) -> pd.DataFrame:
+    def load_csv_from_s3(self, key: str, chunksize: int = None, columns: list = None):
         """
         Reads a CSV file from S3 (supports gzip if needed).
 
+        The file is parsed straight from the S3 body stream, gzip being decompressed on
+        the fly, so the raw object is never held in memory next to decoded copies.
+
         Args:
             key (str): Full key (path) to the CSV file in S3
+            chunksize (int, optional): Return an iterator of DataFrames of this many rows
+            columns (list, optional): Only parse these columns
 
         Returns:
-            pd.DataFrame: The loaded DataFrame
+            pd.DataFrame | Iterator[pd.DataFrame]: The loaded DataFrame, or its chunks
         """
 
         response = self.s3.get_object(Key=key, Bucket=self.bucket)
-        raw = response["Body"].read()
+        stream = io.BufferedReader(_StreamingBodyReader(response["Body"]), buffer_size=1024 * 1024)
 
-        if raw[:2] == b"\x1f\x8b":
+        if stream.peek(2)[:2] == b"\x1f\x8b":
             print("🌀 GZIP compression detected")
-            with gzip.open(BytesIO(raw), mode="rt") as f:
-                return pd.read_csv(f)
+            stream = gzip.GzipFile(fileobj=stream, mode="rb")
         else:
             print("📄 Plain CSV detected")
-            if self.config['csv_separator'] and 'processed' not in key:
-                return pd.read_csv(StringIO(raw.decode("utf-8")), sep=self.config['csv_separator'])
-            else:
-                return pd.read_csv(StringIO(raw.decode("utf-8")))
 
-    def load_model_from_s3(self, key: str):
+        sep = self.config['csv_separator'] if 'processed' not in key else None
+        return pd.read_csv(stream, sep=sep or ",", chunksize=chunksize, usecols=columns)
+
+    def open_multipart_upload(self, key: str, part_size: int = 8 * 1024 * 1024) -> S3MultipartWriter:
+        """
+        Opens a streaming multipart upload to S3.
+
+        Args:
+            key (str): Destination path in S3.
+            part_size (int): Size of the buffered parts in bytes (minimum 5 MB).
+
+        Returns:
+            S3MultipartWriter: A writer to use as a context manager.
+        """
+        return S3MultipartWriter(self.s3, self.bucket, key, part_size)
+
+    def save_dataframe_to_s3(self, df: pd.DataFrame, key: str, index: bool = True, fmt: str = None):
+        """
+        Saves a DataFrame to S3 as CSV, Parquet or Arrow IPC.
+
+        Args:
+            df (pd.DataFrame): The DataFrame to save.
+            key (str): Path/key in S3 bucket.
+            index (bool): Whether to store the index. Default is True.
+            fmt (str, optional): 'csv', 'parquet' or 'arrow', by default from the key extension.
+        """
+        fmt = fmt or format_from_key(key)
+        if fmt == "csv":
+            return self.save_csv_to_s3(df, key, index=index)
+        self.upload_bytes(dataframe_to_bytes(df, fmt, index=index), key)
+
+    def load_dataframe_from_s3(self, key: str, columns: list = None, fmt: str = None) -> pd.DataFrame:
         """
-        Loads a pickled model from S3.
+        Reads a CSV, Parquet or Arrow IPC dataset from S3.
 
         Args:
-            key (str): Key/path to the pickled model file in S3.
+            key (str): Full key (path) to the file in S3.
+            columns (list, optional): Only read these columns (column projection).
+            fmt (str, optional): 'csv', 'parquet' or 'arrow', by default from the key extension.
 
         Returns:
-            The deserialized model object.
+            pd.DataFrame: The loaded DataFrame, with dtypes and index preserved for Parquet and Arrow.
         """
+        fmt = fmt or format_from_key(key)
+        if fmt == "csv":
+            # The other columns are skipped by the parser, the requested order is kept
+            df = self.load_csv_from_s3(key, columns=columns)
+            return df[list(columns)] if columns is not None else df
+        response = self.s3.get_object(Key=key, Bucket=self.bucket)
+        return dataframe_from_bytes(response["Body"].read(), fmt, columns=columns)
+
+    def iter_dataframe_from_s3(self, key: str, chunksize: int, fmt: str = None):
+        """
+        Streams a CSV, Parquet or Arrow IPC dataset from S3 as DataFrame chunks.
+
+        Args:
+            key (str): Full key (path) to the file in S3.
+            chunksize (int): Number of rows per chunk.
+            fmt (str, optional): 'csv', 'parquet' or 'arrow', by default from the key extension.
+
+        Yields:
+            pd.DataFrame: The DataFrame chunks.
+        """
+        fmt = fmt or format_from_key(key)
+        if fmt == "csv":
+            yield from self.load_csv_from_s3(key, chunksize=chunksize)
+            return
+
+        # Columnar files are compact: fetch the file, then decode one record batch at a time
+        import pyarrow as pa
+
+        raw = self.s3.get_object(Key=key, Bucket=self.bucket)["Body"].read()
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+
+            batches = pq.ParquetFile(pa.BufferReader(raw)).iter_batches(batch_size=chunksize)
+        else:
+            batches = _iter_arrow_batches(pa.ipc.open_file(pa.BufferReader(raw)), chunksize)
+        for batch in batches:
+            yield batch.to_pandas()
 
-        response = self.s3.get_object(Bucket=self.bucket, Key=key)
-        model = pickle.load(response["Body"])
+    def load_model_from_s3(self, key: str, missing_ok: bool = False, mmap: bool = True):
+        """
+        Loads a model artifact from S3 (see `dump_model`, plain pickles are read as well).
+
+        With the local model cache enabled, a cached copy is validated with a single
+        conditional request (ETag) and only downloaded again when it changed. Uncompressed
+        artifacts are loaded with memory-mapped arrays (`model_artifact.mmap_mode`).
+
+        Args:
+            key (str): Key/path to the model file in S3.
+            missing_ok (bool): Return None instead of raising when the key does not exist.
+            mmap (bool): False to load writable arrays, e.g. for a model that is trained further.
+
+        Returns:
+            The deserialized model object (or None if missing and `missing_ok`).
+        """
+        mmap_mode = (self.config.get("model_artifact") or {}).get("mmap_mode", "r") if mmap else None
+        # Without the cache, the mapping outlives the temporary file (Linux), its pages stay shared
+        with tempfile.TemporaryDirectory() as tmp:
+            path = self.fetch_model_file(key, tmp, missing_ok=missing_ok)
+            if path is None:
+                return None
+            model = load_model(path, mmap_mode)
         print(f"✅ Loaded model from s3://{self.bucket}/{key}")
         return model
 
+    def fetch_model_file(self, key: str, dest_dir: str, missing_ok: bool = False) -> str:
+        """
+        Returns a local file holding a model artifact, e.g. for worker processes to load
+        it themselves: the model cache file (revalidated with its ETag) when the cache is
+        enabled, otherwise a download into `dest_dir`.
+
+        Args:
+            key (str): Key/path to the model file in S3.
+            dest_dir (str): Directory of the download when the cache is disabled.
+            missing_ok (bool): Return None instead of raising when the key does not exist.
+
+        Returns:
+            str: Path of the local file (or None if missing and `missing_ok`).
+        """
+        entry = self.model_cache.lookup(self.bucket, key) if self.model_cache else None
+        request = {"Bucket": self.bucket, "Key": key}
+        if entry:
+            request["IfNoneMatch"] = entry["etag"]
+
+        try:
+            response = self.s3.get_object(**request)
+        except ClientError as e:
+            code = e.response["Error"]["Code"]
+            if entry and code in ("304", "NotModified"):
+                print(f"♻️ Model s3://{self.bucket}/{key} unchanged, using cached copy")
+                return self.model_cache.hit(self.bucket, key)
+            if missing_ok and code in ("404", "NoSuchKey"):
+                return None
+            raise
+
+        if self.model_cache:
+            return self.model_cache.store(self.bucket, key, response["ETag"], response["Body"])
+        path = os.path.join(dest_dir, os.path.basename(key))
+        with open(path, "wb") as f:
+            shutil.copyfileobj(response["Body"], f, length=1024 * 1024)
+        return path
+
     def save_csv_to_s3(self, df: pd.DataFrame, key: str, index: bool = True):
         """
         Saves a pandas DataFrame as CSV to S3.
@@ -63,24 +497,167 @@ class S3Handler:
         """
         buffer = StringIO()
         df.to_csv(buffer, index=index)
-        self.s3.put_object(Bucket=self.bucket, Key=key, Body=buffer.getvalue())
+        self.upload_bytes(buffer.getvalue().encode("utf-8"), key)
+
+
+    def save_json_to_s3(self, data: dict, key: str):
+        """
+        Saves a JSON-serialisable dictionary to S3.
+
+        Args:
+            data (dict): The dictionary to save.
+            key (str): Path/key in S3 bucket.
+        """
+        body = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        self.s3.put_object(Bucket=self.bucket, Key=key, Body=body, ContentType="application/json")
+
+    def load_json_from_s3(self, key: str, missing_ok: bool = False) -> dict:
+        """
+        Reads a JSON document from S3.
 
+        Args:
+            key (str): Path/key of the JSON file in S3.
+            missing_ok (bool): Return None instead of raising when the key does not exist.
+
+        Returns:
+            dict: The decoded JSON document (or None if missing and `missing_ok`).
+        """
+        try:
+            response = self.s3.get_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            if missing_ok and e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                return None
+            raise
+        return json.load(response["Body"])
 
     def save_model_to_s3(self, model, key: str):
         """
-        Save a model object to S3 using pickle.
+        Saves a model artifact to S3 (see `dump_model`), with the compression of the
+        `model_artifact` config section. The artifact is written to a temporary file and
+        streamed to S3, without an in-memory copy of the serialized model.
 
         Args:
             model: The model object to serialize.
             key (str): Destination path in S3.
         """
-        buffer = BytesIO()
-        pickle.dump(model, buffer)
-        buffer.seek(0)
-
-        self.s3.put_object(Bucket=self.bucket, Key=key, Body=buffer.getvalue())
+        path = self.dump_model_file(model)
+        try:
+            self.upload_file(path, key)
+        finally:
+            os.remove(path)
         print(f"✅ Model saved to s3://{self.bucket}/{key}")
 
+    def dump_model_file(self, model) -> str:
+        """
+        Writes a model artifact to a temporary file, with the compression of the
+        `model_artifact` config section (see `dump_model`). The caller removes the file.
+
+        Args:
+            model: The model object to serialize.
+
+        Returns:
+            str: Path of the artifact file.
+        """
+        settings = self.config.get("model_artifact") or {}
+        compress = settings.get("compress")
+        start = time.perf_counter()
+        fd, path = tempfile.mkstemp(suffix=".model")
+        os.close(fd)
+        dump_model(model, path, compress, settings.get("level", 3))
+        print(f"💾 Model serialized ({os.path.getsize(path) / 1024 ** 2:.1f} MB, {compress or 'uncompressed'}, "
+              f"{time.perf_counter() - start:.2f}s)")
+        return path
+
+    def upload_file(self, path: str, key: str) -> dict:
+        """
+        Uploads a local file, as a multipart upload of concurrent parts above the
+        `transfers.multipart_threshold_mb` size, and reports its throughput.
+
+        Args:
+            path (str): The local file.
+            key (str): Destination path in S3.
+
+        Returns:
+            dict: The transfer: 'key', 'bytes', 'seconds' and 'mb_s'.
+        """
+        start = time.perf_counter()
+        self.s3.upload_file(path, self.bucket, key, Config=self.transfer_config)
+        return self._record_transfer(key, os.path.getsize(path), time.perf_counter() - start)
+
+    def upload_bytes(self, body: bytes, key: str, **extra_args) -> dict:
+        """
+        Uploads an in-memory object like `upload_file` (multipart above the threshold).
+
+        Args:
+            body (bytes): The object content.
+            key (str): Destination path in S3.
+            **extra_args: Extra arguments of the upload, e.g. ContentType.
+
+        Returns:
+            dict: The transfer: 'key', 'bytes', 'seconds' and 'mb_s'.
+        """
+        start = time.perf_counter()
+        self.s3.upload_fileobj(BytesIO(body), self.bucket, key, ExtraArgs=extra_args or None,
+                               Config=self.transfer_config)
+        return self._record_transfer(key, len(body), time.perf_counter() - start)
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Runs a transfer (e.g. `self.save_dataframe_to_s3`) in the background, on a pool of
+        `transfers.upload_workers` threads. Call `join` before relying on the result.
+
+        Returns:
+            concurrent.futures.Future: The future of the call.
+        """
+        with self._transfers_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.upload_workers, thread_name_prefix="s3-upload")
+            future = self._executor.submit(fn, *args, **kwargs)
+            self._pending.append(future)
+        return future
+
+    def join(self) -> list:
+        """
+        Waits for every background transfer, then raises the first error if one failed.
+
+        Returns:
+            list: The transfers completed since the previous `join` (see `upload_file`).
+        """
+        with self._transfers_lock:
+            pending, self._pending = self._pending, []
+        errors = [future.exception() for future in pending]
+        with self._transfers_lock:
+            transfers, self.transfers = self.transfers, []
+        errors = [error for error in errors if error is not None]
+        if errors:
+            raise errors[0]
+        return transfers
+
+    def _record_transfer(self, key: str, n_bytes: int, seconds: float) -> dict:
+        transfer = {
+            "key": key,
+            "bytes": n_bytes,
+            "seconds": round(seconds, 4),
+            "mb_s": round(n_bytes / 1024 ** 2 / max(seconds, 1e-9), 2),
+        }
+        with self._transfers_lock:
+            self.transfers.append(transfer)
+        print(f"⬆️ Uploaded s3://{self.bucket}/{key} ({n_bytes / 1024 ** 2:.1f} MB in {seconds:.2f}s, "
+              f"{transfer['mb_s']:.1f} MB/s)")
+        return transfer
+
+    def get_etag(self, key: str) -> str:
+        """
+        Returns the ETag of an object, without downloading it.
+
+        Args:
+            key (str): The object key.
+
+        Returns:
+            str: The ETag (changes whenever the object content changes).
+        """
+        return self.s3.head_object(Bucket=self.bucket, Key=key)["ETag"]
+
     def exists_in_s3(self, key: str) -> bool:
         """
         Check if a given key exists in the S3 bucket.
@@ -98,4 +675,5 @@ class S3Handler:
             if e.response["Error"]["Code"] == "404":
                 return False
             else:
-                raise
\ No newline at end of file
+                raise
+
@@ -0,0 +1,207 @@
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from mlops_project.utils.data_processing import DataProcessor
+from mlops_project.utils.prediction import Predictor
+
+
+class _ScoringHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # The default backlog (5) drops connections under concurrent load
+
+
+class MicroBatcher:
+    """
+    Merges concurrent single-row requests into small batches.
+
+    A background thread waits for the first pending row, then collects more rows until
+    the batch is full or the latency budget of the first row is spent, and scores the
+    whole batch with a single vectorized call.
+    """
+
+    def __init__(self, predict_fn, max_batch_size: int = 64, max_wait_ms: float = 5):
+        """
+        Args:
+            predict_fn: Callable taking a list of rows (dicts) and returning one prediction per row.
+            max_batch_size (int): Maximum number of rows scored together.
+            max_wait_ms (float): Maximum time a row waits for other rows before being scored.
+        """
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue = queue.Queue()
+        self.batches = 0
+        self.rows = 0
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def submit(self, row: dict) -> Future:
+        """
+        Queues a row for scoring.
+
+        Args:
+            row (dict): Raw feature values of one row.
+
+        Returns:
+            Future: Resolved with the prediction of the row.
+        """
+        future = Future()
+        self.queue.put((row, future))
+        return future
+
+    def close(self):
+        """Stops the batching thread once the pending rows are scored."""
+        self.queue.put(None)
+        self.thread.join()
+
+    def _loop(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self.queue.put(None)  # Stop after this batch
+                    break
+                batch.append(item)
+
+            self._score(batch)
+
+    def _score(self, batch):
+        rows, futures = zip(*batch)
+        try:
+            predictions = self.predict_fn(list(rows))
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.rows += len(rows)
+        for future, prediction in zip(futures, predictions):
+            future.set_result(prediction)
+
+
+class ScoringService:
+    """
+    Long-lived HTTP scoring service.
+
+    The model and the fitted preprocessing state are loaded once from S3 at startup.
+    Single-row requests go through a `MicroBatcher`, list requests are scored directly.
+
+    Endpoints:
+        GET /health: Liveness and batching statistics.
+        POST /predict: A JSON object (one row) or a list of objects (several rows).
+    """
+
+    def __init__(self, bucket: str, config: dict):
+        self.bucket = bucket
+        self.config = config
+        serving = self.config.get("serving") or {}
+
+        self.processor = DataProcessor(bucket, raw_data=None, config=self.config)
+        self.processor.load_state(f"models/{self.config['project_name']}_preprocessing.json")
+
+        self.predictor = Predictor(
+            bucket=bucket,
+            model_key=f"models/{self.config['project_name']}_model.pkl",
+            processed_data=None,
+            prediction_output_key=None,
+            config=self.config
+        )
+        self.model = self.predictor.s3.load_model_from_s3(self.predictor.model_key)
+
+        self.batcher = MicroBatcher(
+            self.predict_rows,
+            max_batch_size=serving.get("max_batch_size", 64),
+            max_wait_ms=serving.get("max_wait_ms", 5)
+        )
+
+    def predict_rows(self, rows: list) -> list:
+        """
+        Scores raw rows with one vectorized call.
+
+        Args:
+            rows (list): Raw feature values, one dict per row.
+
+        Returns:
+            list: One prediction per row, as plain Python values.
+        """
+        df = self.processor.transform(pd.DataFrame.from_records(rows))
+        return self.predictor.predict(self.model, df)["prediction"].tolist()
+
+    def serve(self, host: str = "0.0.0.0", port: int = 8080):
+        """
+        Starts the HTTP server and blocks until interrupted.
+
+        Args:
+            host (str): Interface to bind.
+            port (int): Port to listen on.
+        """
+        server = _ScoringHTTPServer((host, port), self._handler_class())
+        print(f"🚀 Scoring service listening on http://{host}:{port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.batcher.close()
+
+    def _handler_class(self):
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/health":
+                    return self._send(404, {"error": "not found"})
+                cache = service.predictor.s3.model_cache
+                self._send(200, {
+                    "status": "ok",
+                    "batches": service.batcher.batches,
+                    "rows": service.batcher.rows,
+                    "model_cache": cache.stats() if cache else None
+                })
+
+            def do_POST(self):
+                if self.path != "/predict":
+                    return self._send(404, {"error": "not found"})
+                try:
+                    payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                    if isinstance(payload, list):
+                        self._send(200, {"predictions": service.predict_rows(payload)})
+                    else:
+                        self._send(200, {"prediction": service.batcher.submit(payload).result()})
+                except (ValueError, KeyError) as e:  # Bad input (json.JSONDecodeError is a ValueError)
+                    self._send(400, {"error": str(e)})
+                except Exception as e:  # Model or server failure
+                    self._send(500, {"error": str(e)})
+
+            def _send(self, status: int, body: dict):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass  # One log line per request would dominate the latency
+
+        return Handler
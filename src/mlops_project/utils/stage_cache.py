@@ -0,0 +1,209 @@
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+
+import pandas as pd
+from botocore.exceptions import ClientError
+
+from mlops_project.utils.s3_handler import dataframe_from_bytes, dataframe_to_bytes
+
+
+class StageCache:
+    """
+    Content-hashed cache of pipeline stage outputs (processed frame, preprocessing state,
+    model and its lineage and test set), so that a rerun with identical inputs skips the
+    unchanged stages.
+
+    A stage key is the hash of the upstream input fingerprint (S3 ETag, or query and row
+    count/checksum), the config sections the stage depends on and the source code of the
+    modules implementing it. Outputs are stored in S3 under `<prefix>/<stage>/<key>.*` (the
+    output files of a stage under `<prefix>/<stage>/<key>/`) or in a local directory, and
+    hits/misses are counted per stage.
+    """
+
+    def __init__(self, s3_handler, backend: str = "s3", prefix: str = "cache", cache_dir: str = None):
+        """
+        Args:
+            s3_handler (S3Handler): Handler of the project bucket.
+            backend (str): 's3' (shared by every runner) or 'local' (disk of this machine).
+            prefix (str): Key prefix of the cached outputs in S3.
+            cache_dir (str): Local directory of the 'local' backend.
+        """
+        if backend not in ("s3", "local"):
+            raise ValueError(f"Unknown stage cache backend: {backend}")
+        self.s3 = s3_handler
+        self.backend = backend
+        self.prefix = prefix.rstrip("/")
+        self.cache_dir = cache_dir or os.path.join(tempfile.gettempdir(), "mlops_stage_cache")
+        self.counters = {}
+        if backend == "local":
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, config: dict, s3_handler):
+        """
+        Builds the cache from the `stage_cache` section of the config.
+
+        Returns:
+            StageCache | None: The cache, or None when it is disabled (`enabled: false`).
+        """
+        section = config.get("stage_cache") or {}
+        if not section.get("enabled", False):
+            return None
+        prefix = section.get("prefix") or f"cache/{config['project_name']}"
+        return cls(s3_handler, section.get("backend", "s3"), prefix, section.get("dir"))
+
+    def key(self, stage: str, upstream, config_sections: dict, modules: list) -> str:
+        """
+        Computes the cache key of a stage.
+
+        Args:
+            stage (str): Name of the stage.
+            upstream: Fingerprint of the stage inputs (JSON serialisable), e.g. a data
+                fingerprint or the key of the upstream stage.
+            config_sections (dict): The config values the stage depends on.
+            modules (list): Modules implementing the stage, their source code is hashed.
+
+        Returns:
+            str: The hexadecimal key.
+        """
+        payload = {
+            "stage": stage,
+            "upstream": upstream,
+            "config": config_sections,
+            "code": {module.__name__: _source_hash(module) for module in modules},
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def load_frame(self, stage: str, key: str) -> pd.DataFrame:
+        """
+        Returns the cached output frame of a stage (None on a miss). Hits and misses are counted.
+        """
+        raw = self._get(f"{stage}/{key}.parquet")
+        self._count(stage, raw is not None)
+        return dataframe_from_bytes(raw, "parquet") if raw is not None else None
+
+    def save_frame(self, stage: str, key: str, df: pd.DataFrame):
+        """
+        Caches the output frame of a stage, as Parquet so dtypes and index are preserved.
+        """
+        self._put(f"{stage}/{key}.parquet", dataframe_to_bytes(df, "parquet"))
+
+    def load_json(self, stage: str, key: str) -> dict:
+        """
+        Returns a cached JSON output of a stage (e.g. the preprocessing state), or None.
+        """
+        raw = self._get(f"{stage}/{key}.json")
+        return json.loads(raw) if raw is not None else None
+
+    def save_json(self, stage: str, key: str, data: dict):
+        """
+        Caches a JSON output of a stage.
+        """
+        self._put(f"{stage}/{key}.json", json.dumps(data, separators=(",", ":")).encode("utf-8"))
+
+    def restore_files(self, stage: str, key: str, files: dict) -> bool:
+        """
+        Puts the cached output files of a stage (model, lineage, datasets) back at their
+        keys in S3 (server-side copies with the S3 backend). Hits and misses are counted:
+        a hit needs every file, so the outputs of a stage are always restored together.
+
+        Args:
+            stage (str): Name of the stage.
+            key (str): Key of the stage.
+            files (dict): Destination S3 key of each cached file, by file name.
+
+        Returns:
+            bool: True on a hit, False if any of the files is not cached under this key.
+        """
+        names = {name: f"{stage}/{key}/{name}" for name in files}
+        hit = all(self._exists(name) for name in names.values())
+        if hit:
+            for name, destination in files.items():
+                if self.backend == "s3":
+                    self.s3.s3.copy_object(Bucket=self.s3.bucket, Key=destination,
+                                           CopySource={"Bucket": self.s3.bucket, "Key": f"{self.prefix}/{names[name]}"})
+                else:
+                    self.s3.s3.put_object(Bucket=self.s3.bucket, Key=destination, Body=self._get(names[name]))
+        self._count(stage, hit)
+        return hit
+
+    def save_files(self, stage: str, key: str, files: dict):
+        """
+        Caches output files of a stage saved in S3 (server-side copies with the S3 backend).
+
+        Args:
+            stage (str): Name of the stage.
+            key (str): Key of the stage.
+            files (dict): S3 key of each file to cache, by file name.
+        """
+        for name, source in files.items():
+            if self.backend == "s3":
+                self.s3.s3.copy_object(Bucket=self.s3.bucket, Key=f"{self.prefix}/{stage}/{key}/{name}",
+                                       CopySource={"Bucket": self.s3.bucket, "Key": source})
+            else:
+                self._put(f"{stage}/{key}/{name}", self.s3.s3.get_object(Bucket=self.s3.bucket, Key=source)["Body"].read())
+
+    def stats(self) -> dict:
+        """
+        Returns the hit/miss counters of every stage, e.g. {'process': {'hits': 1, 'misses': 0}}.
+        """
+        return {stage: dict(counters) for stage, counters in self.counters.items()}
+
+    def _count(self, stage: str, hit: bool):
+        counters = self.counters.setdefault(stage, {"hits": 0, "misses": 0})
+        counters["hits" if hit else "misses"] += 1
+        print(f"{'♻️ Stage cache hit' if hit else '🆕 Stage cache miss'} for stage '{stage}'")
+
+    def _exists(self, name: str) -> bool:
+        if self.backend == "local":
+            return os.path.exists(os.path.join(self.cache_dir, name))
+        try:
+            self.s3.s3.head_object(Bucket=self.s3.bucket, Key=f"{self.prefix}/{name}")
+            return True
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def _get(self, name: str) -> bytes:
+        if self.backend == "local":
+            try:
+                with open(os.path.join(self.cache_dir, name), "rb") as f:
+                    return f.read()
+            except FileNotFoundError:
+                return None
+        try:
+            return self.s3.s3.get_object(Bucket=self.s3.bucket, Key=f"{self.prefix}/{name}")["Body"].read()
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                return None
+            raise
+
+    def _put(self, name: str, body: bytes):
+        if self.backend == "s3":
+            self.s3.s3.put_object(Bucket=self.s3.bucket, Key=f"{self.prefix}/{name}", Body=body)
+            return
+        # Atomic replace, so a concurrent run never reads a partial file
+        path = os.path.join(self.cache_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(body)
+        os.replace(tmp_path, path)
+
+
+def dataframe_checksum(df: pd.DataFrame) -> str:
+    """
+    Returns a checksum of the content of a DataFrame (values, column names and index),
+    computed with the vectorised `pd.util.hash_pandas_object`.
+    """
+    digest = hashlib.sha256(json.dumps([str(col) for col in df.columns]).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _source_hash(module) -> str:
+    return hashlib.sha256(inspect.getsource(module).encode("utf-8")).hexdigest()
@@ -0,0 +1,109 @@
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest import mock
+
+import boto3
+import mlflow
+import numpy as np
+import pandas as pd
+import pytest
+from moto import mock_aws
+
+from mlops_project.utils.clients import reset_clients
+
+BUCKET = "test-bucket"
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    """Mocked S3 with an empty project bucket, shared clients reset around the test."""
+    for name, value in {"AWS_DEFAULT_REGION": "us-east-1", "AWS_ACCESS_KEY_ID": "test",
+                        "AWS_SECRET_ACCESS_KEY": "test", "S3_BUCKET_NAME": BUCKET}.items():
+        monkeypatch.setenv(name, value)
+    reset_clients()
+    with mock_aws():
+        boto3.client("s3").create_bucket(Bucket=BUCKET)
+        yield BUCKET
+    reset_clients()
+
+
+@pytest.fixture
+def config():
+    return {
+        "project_name": "test-project",
+        "type": "classification",
+        "target": "y",
+        "id_column": "id",
+        "data_source": "csv_s3",
+        "csv_separator": ",",
+        "model_cache": {"enabled": False},
+        "estimator": {"name": "random_forest", "params": {"n_estimators": 10}},
+        "instrumentation": {"mlflow": False},
+    }
+
+
+@pytest.fixture
+def tracking(tmp_path):
+    """MLflow on a local file store instead of the MySQL tracking server."""
+    from mlops_project.utils.mlflow_handler import MLflowHandler
+
+    uri = (tmp_path / "mlruns").as_uri()
+
+    class LocalMLflowHandler:
+        batch_logger = MLflowHandler.batch_logger
+
+        def __init__(self, mysql_handler, config):
+            self.config = config
+            mlflow.set_tracking_uri(uri)
+            self.client = mlflow.tracking.MlflowClient(uri)
+
+        def setup_experiment(self):
+            experiment = mlflow.set_experiment("test")
+            return experiment.experiment_id, experiment.name
+
+    with mock.patch("mlops_project.utils.model_training.MySQLHandler"), \
+            mock.patch("mlops_project.utils.model_training.MLflowHandler", LocalMLflowHandler):
+        yield mlflow.tracking.MlflowClient(uri)
+    mlflow.set_tracking_uri(None)
+
+
+@pytest.fixture
+def serve_csv():
+    """Serves bodies over local HTTP: `serve_csv(body)` returns the URL of the body."""
+    servers = []
+
+    def serve(body: bytes) -> str:
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", '"v1"')
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}/data.csv"
+
+    yield serve
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def make_frame(rows: int = 500, seed: int = 0, start: int = 0) -> pd.DataFrame:
+    """Raw dataset: id, numeric and string features, binary target 'y'."""
+    rng = np.random.default_rng(seed)
+    a = rng.random(rows)
+    b = rng.choice(["x", "y", "z"], rows)
+    return pd.DataFrame({
+        "id": np.arange(start, start + rows),
+        "a": a,
+        "c": rng.normal(size=rows),
+        "b": b,
+        "y": ((a > 0.5) ^ (b == "x")).astype(int),
+    })
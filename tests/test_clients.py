@@ -0,0 +1,28 @@
+from conftest import BUCKET
+from mlops_project.utils.clients import http_session
+from mlops_project.utils.data_processing import DataProcessor
+from mlops_project.utils.mysql_handler import MySQLHandler
+from mlops_project.utils.s3_handler import S3Handler
+
+
+def test_handlers_of_one_config_share_the_s3_client(s3, config):
+    handler = S3Handler(BUCKET, config)
+
+    assert DataProcessor(BUCKET, None, config).s3.s3 is handler.s3
+    assert S3Handler(BUCKET, {**config, "clients": {"s3": {"max_pool_connections": 4}}}).s3 is not handler.s3
+
+
+def test_handlers_of_one_database_share_the_engine(s3, config, monkeypatch):
+    monkeypatch.setenv("MYSQL_HOST", "db.local")
+    first = MySQLHandler(config, "datasets")
+
+    assert MySQLHandler(config, "datasets").engine is first.engine
+    assert MySQLHandler(config, "other").engine is not first.engine
+    assert first._create_engine(local_infile=True) is not first.engine
+
+
+def test_http_session_is_shared_per_settings(s3, config):
+    session = http_session(config)
+
+    assert http_session(config) is session
+    assert http_session({**config, "clients": {"http": {"pool_size": 2}}}) is not session
@@ -0,0 +1,153 @@
+from unittest import mock
+
+import pandas as pd
+import pytest
+
+from conftest import make_frame
+from mlops_project import train_pipeline
+from mlops_project.utils.clients import http_session
+from mlops_project.utils.data_loader import DataLoader
+
+
+class FakeMySQLHandler:
+    """Serves a DataFrame as the `select_all` / `select_since` queries."""
+
+    def __init__(self, df):
+        self.df = df
+        self.queries = []
+
+    def iter_data_from_db(self, query_name, chunksize, params=None):
+        self.queries.append((query_name, params))
+        rows = self.df if params is None else self.df[self.df["id"] > params["watermark"]]
+        for start in range(0, len(rows), chunksize):
+            yield rows.iloc[start:start + chunksize]
+
+
+@pytest.fixture
+def mysql_config(config):
+    return {**config, "data_source": "mysql", "retrain": {"mode": "incremental"},
+            "mysql_incremental": {"enabled": True, "key_column": "id", "query": "select_since"}}
+
+
+def make_loader(config, df):
+    handler = FakeMySQLHandler(df)
+    with mock.patch("mlops_project.utils.mysql_handler.MySQLHandler", return_value=handler):
+        loader = DataLoader(config, incremental=True)
+    return loader, handler
+
+
+def load(loader):
+    chunks = list(loader.iter_mysql_chunks(100))
+    return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+
+
+def test_first_run_loads_the_whole_table(s3, mysql_config):
+    loader, handler = make_loader(mysql_config, make_frame(250))
+
+    assert len(load(loader)) == 250
+    assert handler.queries == [("select_all", None)]
+    assert loader.watermark is None
+    assert loader.new_watermark == 249
+
+
+def test_committed_watermark_is_read_by_the_next_run(s3, mysql_config):
+    loader, _ = make_loader(mysql_config, make_frame(250))
+    load(loader)
+    loader.commit_watermark()
+
+    loader, handler = make_loader(mysql_config, make_frame(300))
+    df = load(loader)
+
+    assert handler.queries == [("select_since", {"watermark": 249})]
+    assert df["id"].tolist() == list(range(250, 300))
+    assert (loader.watermark, loader.new_watermark) == (249, 299)
+
+
+def test_watermark_only_advances_on_commit(s3, mysql_config):
+    loader, _ = make_loader(mysql_config, make_frame(250))
+    load(loader)  # Run failed before commit_watermark
+
+    loader, handler = make_loader(mysql_config, make_frame(300))
+    assert len(load(loader)) == 300
+    assert handler.queries == [("select_all", None)]
+
+
+def test_empty_delta_keeps_the_watermark(s3, mysql_config):
+    loader, _ = make_loader(mysql_config, make_frame(250))
+    load(loader)
+    loader.commit_watermark()
+
+    loader, _ = make_loader(mysql_config, make_frame(250))
+    assert load(loader).empty
+    loader.commit_watermark()  # No new row, nothing to record
+
+    assert loader.s3_handler.load_json_from_s3(loader.watermark_key)["value"] == 249
+
+
+def test_train_pipeline_returns_early_without_new_rows(s3, mysql_config):
+    loader, _ = make_loader(mysql_config, make_frame(250))
+    load(loader)
+    loader.commit_watermark()
+
+    empty_loader, _ = make_loader(mysql_config, make_frame(250))
+    with mock.patch.object(train_pipeline, "load_config", return_value=mysql_config), \
+            mock.patch.object(train_pipeline, "DataLoader", return_value=empty_loader), \
+            mock.patch.object(train_pipeline, "ModelTrainer") as trainer:
+        train_pipeline.main()
+
+    trainer.assert_not_called()
+    assert empty_loader.s3_handler.load_json_from_s3(empty_loader.watermark_key)["value"] == 249
+
+
+def test_incremental_loading_requires_incremental_retrain(mysql_config):
+    with mock.patch.object(train_pipeline, "load_config", return_value={**mysql_config, "retrain": {"mode": "full"}}):
+        with pytest.raises(ValueError, match="retrain.mode: incremental"):
+            train_pipeline.main()
+
+
+@pytest.fixture
+def csv_url(s3, serve_csv, monkeypatch):
+    monkeypatch.setenv("CSV_URL", serve_csv(make_frame(250).to_csv(index=False).encode()))
+
+
+@pytest.fixture
+def url_config(config, tmp_path):
+    return {**config, "data_source": "csv_url", "clients": {"http": {"timeout": 7}},
+            "http_cache": {"enabled": False, "dir": str(tmp_path / "http")}}
+
+
+def spy_get(config):
+    """Records the responses of the shared session, and the timeout of each request."""
+    session, responses = http_session(config), []
+    get = session.get
+
+    def recorded(*args, **kwargs):
+        responses.append((get(*args, **kwargs), kwargs.get("timeout")))
+        return responses[-1][0]
+    return mock.patch.object(session, "get", side_effect=recorded), responses
+
+
+@pytest.mark.parametrize("chunksize", [None, 100])
+def test_url_download_is_closed_once_read(csv_url, url_config, chunksize):
+    loader = DataLoader(url_config)
+    patch, responses = spy_get(url_config)
+    with patch:
+        if chunksize:
+            df = pd.concat(list(loader.iter_chunks(chunksize)))
+        else:
+            df = loader.run()
+
+    assert len(df) == 250
+    assert [timeout for _, timeout in responses] == [7]
+    assert responses[0][0].raw.closed
+
+
+def test_cached_url_download_uses_the_shared_session(csv_url, url_config):
+    config = {**url_config, "http_cache": {**url_config["http_cache"], "enabled": True}}
+    loader = DataLoader(config)
+    patch, responses = spy_get(config)
+    with patch:
+        assert len(loader.run()) == 250
+
+    assert loader.http_cache.session is http_session(config)
+    assert [timeout for _, timeout in responses] == [7]
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import StandardScaler
+
+from conftest import BUCKET, make_frame
+from mlops_project.utils.data_processing import DataProcessor, compact_dtypes
+
+
+def python_value(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def reference_state(df: pd.DataFrame, target: str, id_column: str) -> dict:
+    """Preprocessing state computed column by column with pandas, as DataProcessor did before its column profile."""
+    state = {"index": None}
+    if df[id_column].is_unique and not df[id_column].isna().any():
+        df, state["index"] = df.set_index(id_column), id_column
+    df = df.drop_duplicates()
+    empty = df.columns[df.isna().all()].tolist()
+    df = df.drop(columns=empty)
+    n_unique = df.nunique()
+    non_numeric = df.select_dtypes(exclude=["number"]).columns
+    dropped = [col for col in n_unique[n_unique == 1].index.tolist()
+               + [col for col in n_unique[n_unique == len(df)].index if col in non_numeric] if col != target]
+    df = df.drop(columns=dropped)
+    state["dropped_columns"] = [col for col in empty if col != target] + dropped
+
+    num_cols = df.select_dtypes(include=["number"]).columns.difference([target])
+    state["numeric_impute"] = {col: python_value(value) for col, value in df[num_cols].median().items()}
+    cat_cols = df.select_dtypes(include=["object", "category"]).columns.difference([target])
+    state["categorical_impute"] = {col: python_value(df[col].mode()[0]) for col in cat_cols if len(df[col].mode())}
+    df = df.fillna(value={**state["numeric_impute"], **state["categorical_impute"]})
+
+    discrete = [col for col in num_cols if df[col].nunique() <= 5]
+    scale_cols = [col for col in num_cols if col not in discrete]
+    scaler = StandardScaler().fit(df[scale_cols])
+    state["scale"] = {"columns": scale_cols, "mean": scaler.mean_.tolist(), "scale": scaler.scale_.tolist()}
+    state["categories"] = {col: sorted(python_value(value) for value in df[col].dropna().unique())
+                           for col in cat_cols.tolist() + discrete}
+    return state
+
+
+def mixed_frame(rows: int = 1000, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "id": np.arange(rows),
+        "continuous": rng.normal(size=rows),
+        "discrete": rng.integers(0, 4, size=rows).astype(float),
+        "count": rng.integers(0, 1000, size=rows),
+        "city": rng.choice(["paris", "lyon", "nice"], size=rows).astype(object),
+        "constant": 1,
+        "empty": np.nan,
+        "name": [f"name_{i}" for i in range(rows)],
+        "y": rng.integers(0, 2, size=rows),
+    })
+    # An even number of values left, so the medians average two middle values
+    for offset, col in enumerate(("continuous", "discrete", "city")):
+        df.loc[df.index % 10 == offset, col] = None
+    return df
+
+
+def nullable_frame() -> pd.DataFrame:
+    df = mixed_frame()
+    return df.astype({"count": "Int64", "continuous": "Float64", "city": "string"})
+
+
+@pytest.mark.parametrize("make, compact", [(mixed_frame, False), (nullable_frame, False), (mixed_frame, True)],
+                         ids=["mixed", "nullable", "compact"])
+def test_fitted_state_matches_pandas(s3, config, make, compact):
+    config = {**config, "processing": {"compact": compact}}
+    df = make()
+    if compact:
+        df = compact_dtypes(df, exclude=["y"])
+    state = DataProcessor(BUCKET, df.copy(), config).fit()
+
+    expected = reference_state(df, "y", "id")
+    for key, value in expected.items():
+        assert state[key] == value, key
+
+
+def test_processed_chunks_get_the_dtypes_of_run(s3, config):
+    config = {**config, "processing": {"compact": True}}
+    df = make_frame(300)
+    processor = DataProcessor(BUCKET, df, config)
+    processed = processor.run()
+
+    chunk = processor.process_chunk(df.iloc[100:200])
+    pd.testing.assert_series_equal(chunk.dtypes, processed.dtypes)
+    pd.testing.assert_frame_equal(chunk, processed.loc[chunk.index])
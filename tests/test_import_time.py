@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+
+MODULE = "mlops_project.predict_pipeline"
+SRC = os.path.join(os.path.dirname(__file__), "..", "src")
+# Same budget as `benchmarks/import_time.py`, on the fastest of a few cold interpreters
+BUDGET_MS = 1500
+
+
+def import_times(module: str) -> dict:
+    """Cumulative import time (microseconds) of every module imported by `module`, in a fresh interpreter."""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [SRC, os.environ.get("PYTHONPATH")]))}
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, env=env, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            _, cumulative, name = line.split("|")
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_predict_pipeline_imports_only_the_s3_csv_backend():
+    imported = import_times(MODULE)
+
+    for backend in ("sqlalchemy", "pymysql", "sklearn"):
+        assert not [name for name in imported if name == backend or name.startswith(f"{backend}.")], backend
+
+
+def test_predict_pipeline_import_time_is_within_budget():
+    total_ms = min(import_times(MODULE)[MODULE] for _ in range(3)) / 1000
+
+    assert total_ms < BUDGET_MS
@@ -0,0 +1,78 @@
+import pytest
+
+from mlops_project.utils.mlflow_handler import MLflowBatchLogger
+
+
+class FlakyClient:
+    """Tracking client failing its first `failures` calls."""
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.batches = []
+        self.calls = []
+
+    def _call(self, name):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("tracking store unreachable")
+        self.calls.append(name)
+
+    def log_batch(self, run_id, metrics=(), params=(), tags=()):
+        self._call("log_batch")
+        self.batches.append((run_id, list(metrics), list(params), list(tags)))
+
+    def log_dict(self, run_id, data, artifact_file):
+        self._call("log_dict")
+
+    def create_run(self, experiment_id, run_name=None, tags=None):
+        self._call("create_run")
+        return type("Run", (), {"info": type("Info", (), {"run_id": f"child-{run_name}"})})()
+
+    def set_terminated(self, run_id):
+        self._call("set_terminated")
+
+
+def logger(client):
+    return MLflowBatchLogger(client, "run", flush_interval=3600, max_param_length=20)
+
+
+def sent(client, run_id="run"):
+    params, metrics, tags = {}, [], {}
+    for batch_run_id, batch_metrics, batch_params, batch_tags in client.batches:
+        if batch_run_id == run_id:
+            params.update({param.key: param.value for param in batch_params})
+            tags.update({tag.key: tag.value for tag in batch_tags})
+            metrics += [metric.key for metric in batch_metrics]
+    return params, metrics, tags
+
+
+def test_failed_flush_is_sent_by_the_next_one():
+    client = FlakyClient(failures=1)
+    tracker = logger(client)
+    tracker.log_params({"a": 1, "b": 2})
+    tracker.log_metric("score", 0.5)
+    tracker.set_tag("mode", "test")
+
+    with pytest.raises(ConnectionError):
+        tracker.flush()
+    tracker.log_param("b", 3)  # Newer than the value that could not be sent
+    tracker.close()
+
+    assert sent(client) == ({"a": "1", "b": "3"}, ["score"], {"mode": "test"})
+
+
+def test_close_raises_when_the_store_stays_unreachable():
+    tracker = logger(FlakyClient(failures=10))
+    tracker.log_param("a", 1)
+    with pytest.raises(ConnectionError):
+        tracker.close()
+
+
+def test_round_trips_count_every_call():
+    client = FlakyClient()
+    with logger(client) as tracker:
+        tracker.log_param("features", ["feature"] * 10)  # Too long, logged as an artifact
+        tracker.log_child_run("0", "candidate_0", {"n_estimators": 10}, {"cv_score": 0.9})
+        tracker.log_metrics({f"m{i}": i for i in range(1500)})
+
+    assert tracker.round_trips == len(client.calls) == 2 + 1 + 3
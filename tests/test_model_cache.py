@@ -0,0 +1,63 @@
+import os
+
+import numpy as np
+import pytest
+
+from conftest import BUCKET
+from mlops_project.utils.s3_handler import S3Handler
+
+
+@pytest.fixture
+def cached_handler(s3, config, tmp_path):
+    def build(max_size_mb=2048):
+        cache = {"enabled": True, "dir": str(tmp_path / "models"), "max_size_mb": max_size_mb}
+        return S3Handler(BUCKET, {**config, "model_cache": cache})
+    return build
+
+
+def model(value, mb=1):
+    """A model artifact of about `mb` MB."""
+    return {"weights": np.full(mb * 1024 ** 2 // 8, value, dtype=np.float64)}
+
+
+def test_unchanged_model_is_served_from_the_cache(cached_handler):
+    s3_handler = cached_handler()
+    s3_handler.save_model_to_s3(model(1.0), "models/a.pkl")
+
+    first = s3_handler.load_model_from_s3("models/a.pkl")
+    second = s3_handler.load_model_from_s3("models/a.pkl")
+
+    size = s3_handler.model_cache.lookup(BUCKET, "models/a.pkl")["size"]
+    assert s3_handler.model_cache.stats() == {"hits": 1, "misses": 1, "bytes_saved": size}
+    np.testing.assert_array_equal(second["weights"], first["weights"])
+
+
+def test_overwritten_model_is_downloaded_again(cached_handler):
+    s3_handler = cached_handler()
+    s3_handler.save_model_to_s3(model(1.0), "models/a.pkl")
+    s3_handler.load_model_from_s3("models/a.pkl")
+    old_file = s3_handler.model_cache.lookup(BUCKET, "models/a.pkl")["file"]
+
+    s3_handler.save_model_to_s3(model(2.0), "models/a.pkl")
+    loaded = s3_handler.load_model_from_s3("models/a.pkl")
+
+    assert s3_handler.model_cache.stats()["misses"] == 2
+    assert loaded["weights"][0] == 2.0
+    assert not os.path.exists(os.path.join(s3_handler.model_cache.cache_dir, old_file))
+
+
+def test_least_recently_used_models_are_evicted(cached_handler):
+    s3_handler = cached_handler(max_size_mb=2.5)
+    for name in ("a", "b", "c"):
+        s3_handler.save_model_to_s3(model(1.0), f"models/{name}.pkl")
+    s3_handler.load_model_from_s3("models/a.pkl")
+    s3_handler.load_model_from_s3("models/b.pkl")
+    s3_handler.load_model_from_s3("models/a.pkl")  # b is now the least recently used
+
+    s3_handler.load_model_from_s3("models/c.pkl")
+
+    cache = s3_handler.model_cache
+    assert cache.lookup(BUCKET, "models/b.pkl") is None
+    assert cache.lookup(BUCKET, "models/a.pkl") and cache.lookup(BUCKET, "models/c.pkl")
+    cached = [name for name in os.listdir(cache.cache_dir) if name.endswith(".bin")]
+    assert len(cached) == 2
@@ -0,0 +1,142 @@
+import os
+
+import pytest
+from sklearn.tree import DecisionTreeClassifier
+
+from conftest import BUCKET, make_frame
+from mlops_project.config.config_loader import load_config
+from mlops_project.utils.data_processing import DataProcessor
+from mlops_project.utils.model_training import ModelTrainer
+from mlops_project.utils.s3_handler import S3Handler
+
+MODEL_KEY = "models/test_model.pkl"
+DEV_CONFIG = os.path.join(os.path.dirname(__file__), "..", "src", "mlops_project", "config", "dev.yaml")
+
+
+def train(config, df):
+    processed = DataProcessor(BUCKET, df, config).run()
+    trainer = ModelTrainer(BUCKET, processed, MODEL_KEY, "datasets/test_X_train.csv", config)
+    trainer.run()
+    return trainer
+
+
+def test_search_logs_the_parameters_of_the_best_candidate(s3, config, tracking):
+    config = {**config, "search": {"enabled": True, "strategy": "grid", "cv": 2, "n_jobs": 1,
+                                   "space": {"n_estimators": [5, 20], "max_depth": [2, None]}}}
+    trainer = train(config, make_frame(300))
+
+    params = tracking.get_run(trainer.run_id).data.params
+    assert params["n_estimators"] == params["best_n_estimators"]
+    assert params["max_depth"] == params["best_max_depth"]
+    assert params["n_jobs"] == "-1"  # Candidates are fitted on one core, the promoted model on all of them
+    assert S3Handler(BUCKET, config).load_model_from_s3(MODEL_KEY).n_jobs == -1
+
+
+@pytest.fixture
+def incremental_config(config):
+    return {**config, "retrain": {"mode": "incremental", "n_estimators_step": 5}}
+
+
+def lineage(trainer):
+    return trainer.s3.load_json_from_s3(trainer.lineage_key)
+
+
+def test_warm_start_adds_trees_on_the_new_rows(s3, incremental_config, tracking):
+    first = train(incremental_config, make_frame(300))
+    second = train(incremental_config, make_frame(100, seed=1, start=300))
+
+    model = second.s3.load_model_from_s3(MODEL_KEY, mmap=False)
+    assert len(model.estimators_) == 15
+    assert tracking.get_run(second.run_id).data.params["incremental_strategy"] == "warm_start"
+    assert lineage(second)["parent_run_id"] == first.run_id
+
+
+def test_warm_start_boosting_grows_from_the_early_stopped_iteration(s3, incremental_config, tracking):
+    config = {**incremental_config, "estimator": {"name": "hist_gradient_boosting", "params": {}}}
+    train(config, make_frame(300))
+    first = S3Handler(BUCKET, config).load_model_from_s3(MODEL_KEY)
+    second = train(config, make_frame(100, seed=1, start=300))
+
+    model = second.s3.load_model_from_s3(MODEL_KEY)
+    assert first.n_iter_ < 200  # Early stopped
+    assert model.n_iter_ == first.n_iter_ + 5
+
+
+def test_warm_start_rejects_new_rows_missing_a_class(s3, incremental_config, tracking):
+    train(incremental_config, make_frame(300))
+    new_rows = make_frame(100, seed=1, start=300)
+    with pytest.raises(ValueError, match="classes"):
+        train(incremental_config, new_rows[new_rows["y"] == 1])
+
+
+def test_partial_fit_updates_the_saved_model(s3, incremental_config, tracking):
+    config = {**incremental_config, "estimator": {"name": "sgd", "params": {}}}
+    train(config, make_frame(300))
+    before = S3Handler(BUCKET, config).load_model_from_s3(MODEL_KEY)
+    second = train(config, make_frame(100, seed=1, start=300))
+
+    model = second.s3.load_model_from_s3(MODEL_KEY)
+    assert tracking.get_run(second.run_id).data.params["incremental_strategy"] == "partial_fit"
+    assert model.t_ > before.t_  # More SGD updates
+
+
+def test_lineage_counts_the_training_rows_of_each_generation(s3, incremental_config, tracking):
+    lineages = [lineage(train(incremental_config, make_frame(rows, seed=i, start=1000 * i)))
+                for i, rows in enumerate((300, 100, 50))]
+
+    assert [doc["generation"] for doc in lineages] == [0, 1, 2]
+    assert [doc["rows"] for doc in lineages] == [240, 80, 40]  # The test split is not trained on
+    assert [doc["total_rows"] for doc in lineages] == [240, 320, 360]
+
+
+def test_full_retrain_restarts_the_lineage(s3, config, tracking):
+    train(config, make_frame(300))
+    second = train(config, make_frame(300, seed=1))
+
+    assert (lineage(second)["generation"], lineage(second)["total_rows"]) == (0, 240)
+
+
+def test_model_without_incremental_update_is_rejected(s3, incremental_config, tracking):
+    train(incremental_config, make_frame(300))
+    processed = DataProcessor(BUCKET, make_frame(100, seed=1), incremental_config).run()
+    trainer = ModelTrainer(BUCKET, processed, MODEL_KEY, "x.csv", incremental_config)
+    with pytest.raises(ValueError, match="cannot be updated incrementally"):
+        trainer._retrain_model(DecisionTreeClassifier(), processed.drop(columns="y"), processed["y"],
+                               processed.drop(columns="y"), processed["y"])
+
+
+def test_registered_model_keeps_the_sklearn_flavor(s3, config, tracking):
+    import mlflow.sklearn
+
+    trainer = train(config, make_frame(300))
+    model = mlflow.sklearn.load_model(f"models:/{config['project_name']}_classification/1")
+    assert type(model).__name__ == "RandomForestClassifier"
+    assert tracking.get_run(trainer.run_id).data.metrics["upload_mb_s.test_model.pkl"] > 0
+
+
+def test_join_returns_the_transfers_since_the_previous_join(s3, config):
+    s3_handler = S3Handler(BUCKET, config)
+    s3_handler.submit(s3_handler.upload_bytes, b"first", "first.bin")
+    assert [transfer["key"] for transfer in s3_handler.join()] == ["first.bin"]
+
+    s3_handler.submit(s3_handler.upload_bytes, b"second", "second.bin")
+    assert [transfer["key"] for transfer in s3_handler.join()] == ["second.bin"]
+    assert s3_handler.join() == []
+
+
+@pytest.mark.parametrize("name", ["random_forest", "hist_gradient_boosting", "sgd"])
+def test_search_uses_the_space_of_the_estimator_family(s3, config, tracking, name):
+    space = load_config(DEV_CONFIG)["search"]["space"]
+    config = {**config, "estimator": {"name": name, "params": {}},
+              "search": {"enabled": True, "strategy": "random", "n_iter": 2, "cv": 2, "n_jobs": 1, "space": space}}
+    trainer = train(config, make_frame(300))
+
+    params = tracking.get_run(trainer.run_id).data.params
+    assert all(f"best_{param}" in params for param in space[name])
+
+
+def test_search_space_of_another_family_is_rejected(s3, config, tracking):
+    config = {**config, "estimator": {"name": "sgd", "params": {}},
+              "search": {"enabled": True, "space": {"n_estimators": [10, 20]}}}
+    with pytest.raises(ValueError, match="n_estimators"):
+        train(config, make_frame(300))
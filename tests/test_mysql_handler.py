@@ -0,0 +1,57 @@
+from unittest import mock
+
+import pandas as pd
+import pytest
+
+from conftest import BUCKET
+from mlops_project.utils.data_processing import DataProcessor
+from mlops_project.utils.mysql_handler import MySQLHandler
+
+# pymysql field type codes
+LONG, DOUBLE, VAR_STRING = 3, 5, 253
+
+
+@pytest.fixture
+def handler(s3, config, tmp_path):
+    queries = tmp_path / "queries.sql"
+    queries.write_text("-- name: select_all\nSELECT * FROM pima_diabetes;\n")
+    return MySQLHandler(config, "test", sql_file_path=str(queries))
+
+
+def serve(handler, description, rows):
+    """Answers the queries of the handler with `rows`, described like pymysql does."""
+    result = mock.MagicMock()
+    result.keys.return_value = [column[0] for column in description]
+    result.cursor.description = description
+    result.fetchmany.side_effect = [rows[:2], rows[2:], []]
+    conn = mock.MagicMock()
+    conn.execution_options.return_value.execute.return_value = result
+    handler.engine = mock.MagicMock()
+    handler.engine.connect.return_value.__enter__.return_value = conn
+
+
+def describe(name, type_code, null_ok):
+    return name, type_code, None, None, None, None, null_ok
+
+
+def test_nullable_integer_columns_keep_integer_values(handler):
+    description = [describe("id", LONG, False), describe("glucose", LONG, True),
+                   describe("bmi", DOUBLE, True), describe("name", VAR_STRING, True), describe("diabetes", LONG, True)]
+    serve(handler, description, [(1, 148, 33.6, "a", 1), (2, None, 26.6, "b", 0), (3, 183, None, None, 1)])
+
+    chunks = list(handler.iter_data_from_db("select_all", chunksize=2))
+    df = pd.concat(chunks, ignore_index=True)
+
+    assert [chunk.dtypes.to_dict() for chunk in chunks] == [chunks[0].dtypes.to_dict()] * 2
+    assert df.dtypes.astype(str).to_dict() == {"id": "int64", "glucose": "Int64", "bmi": "float64",
+                                                "name": "object", "diabetes": "Int64"}
+    assert df["diabetes"].tolist() == [1, 0, 1] and df["glucose"].isna().tolist() == [False, True, False]
+
+
+def test_nullable_integer_labels_are_integers_for_the_estimators(s3, config):
+    df = pd.DataFrame({"id": range(20), "a": [float(i) for i in range(20)],
+                       "y": pd.array([i % 2 for i in range(20)], dtype="Int64")})
+
+    processed = DataProcessor(BUCKET, df, config).run()
+
+    assert processed["y"].dtype == "int64"
@@ -0,0 +1,79 @@
+from contextlib import contextmanager
+
+import pandas as pd
+import pytest
+
+from conftest import make_frame
+from mlops_project.utils.mysql_handler import MySQLHandler
+
+COLUMNS = ["id", "a", "c", "b", "y"]
+
+
+class FakeEngine:
+    """Records the statements of each transaction, committed or rolled back, instead of a MySQL server."""
+
+    def __init__(self, fail_on_batch: int = None):
+        self.fail_on_batch = fail_on_batch
+        self.committed = []
+        self.rolled_back = []
+
+    @contextmanager
+    def begin(self):
+        batch = []
+        conn = type("Connection", (), {})()
+        conn.exec_driver_sql = lambda statement, rows=None: self._execute(batch, statement, rows)
+        try:
+            yield conn
+        except Exception:
+            self.rolled_back.append(batch)
+            raise
+        self.committed.append(batch)
+
+    def _execute(self, batch, statement, rows):
+        batch.append((statement, rows))
+        if len(self.committed) + len(self.rolled_back) == self.fail_on_batch:
+            raise RuntimeError("duplicate key")
+
+
+@pytest.fixture
+def handler(s3, config):
+    return MySQLHandler({**config, "mysql_ingestion": {"method": "multi", "chunksize": 100}}, "test")
+
+
+def test_csv_is_inserted_in_one_batched_transaction_per_chunk(handler, serve_csv):
+    df = make_frame(250)
+    url = serve_csv(df.to_csv(index=False, header=False).encode())
+    handler.engine = FakeEngine()
+
+    handler.populate_table_from_csv_url("pima", url, COLUMNS)
+
+    batches = handler.engine.committed
+    assert [len(batch) for batch in batches] == [1, 1, 1]  # One executemany per transaction
+    statement, _ = batches[0][0]
+    assert statement == "INSERT INTO `pima` (`id`, `a`, `c`, `b`, `y`) VALUES (%s, %s, %s, %s, %s)"
+    rows = [row for batch in batches for row in batch[0][1]]
+    assert [len(batch[0][1]) for batch in batches] == [100, 100, 50]
+    pd.testing.assert_frame_equal(pd.DataFrame(rows, columns=COLUMNS).infer_objects(), df)
+
+
+def test_failed_batch_is_rolled_back_alone(handler, serve_csv):
+    url = serve_csv(make_frame(250).to_csv(index=False, header=False).encode())
+    handler.engine = FakeEngine(fail_on_batch=1)
+
+    with pytest.raises(RuntimeError, match="duplicate key"):
+        handler.populate_table_from_csv_url("pima", url, COLUMNS)
+
+    assert [len(batch[0][1]) for batch in handler.engine.committed] == [100]
+    assert [len(batch[0][1]) for batch in handler.engine.rolled_back] == [100]
+
+
+def test_nulls_are_inserted_as_sql_null(handler, serve_csv):
+    df = make_frame(10).astype({"a": object})
+    df.loc[3, "a"] = None
+    url = serve_csv(df.to_csv(index=False, header=False).encode())
+    handler.engine = FakeEngine()
+
+    handler.populate_table_from_csv_url("pima", url, COLUMNS)
+
+    rows = handler.engine.committed[0][0][1]
+    assert rows[3][1] is None
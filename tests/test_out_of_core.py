@@ -0,0 +1,126 @@
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import BUCKET, make_frame
+from mlops_project import train_pipeline
+from mlops_project.utils.out_of_core import ReservoirSample, holdout_mask
+from mlops_project.utils.prefetch import PrefetchIterator
+from mlops_project.utils.s3_handler import S3Handler
+
+
+def stream(rows, chunksize):
+    for start in range(0, rows, chunksize):
+        yield pd.DataFrame({"v": np.arange(start, min(start + chunksize, rows))})
+
+
+def test_reservoir_is_bounded_and_keeps_distinct_rows():
+    sample = ReservoirSample(100, seed=0)
+    for chunk in stream(1000, 37):
+        sample.add(chunk)
+        assert len(sample.frame()) <= 100
+
+    assert sample.rows_seen == 1000
+    assert len(sample.frame()) == 100
+    assert sample.frame()["v"].is_unique
+
+
+def test_reservoir_keeps_every_row_of_a_short_stream():
+    sample = ReservoirSample(100)
+    for chunk in stream(60, 25):
+        sample.add(chunk)
+
+    assert sorted(sample.frame()["v"]) == list(range(60))
+
+
+def test_reservoir_sample_is_uniform_over_the_stream():
+    counts = np.zeros(1000)
+    for seed in range(300):
+        sample = ReservoirSample(100, seed)
+        for chunk in stream(1000, 37):
+            sample.add(chunk)
+        counts[sample.frame()["v"]] += 1
+
+    # Each row is kept with probability 0.1, i.e. 30 times out of 300 samples
+    deciles = counts.reshape(10, 100).mean(axis=1)
+    np.testing.assert_allclose(deciles, 30, rtol=0.1)
+
+
+def test_holdout_split_is_stable_across_passes_and_chunkings():
+    df = make_frame(5000)
+    whole = holdout_mask(df, 0.2, "id")
+    chunked = np.concatenate([holdout_mask(df.iloc[start:start + 700], 0.2, "id") for start in range(0, 5000, 700)])
+    shuffled = df.sample(frac=1, random_state=1)
+
+    np.testing.assert_array_equal(whole, chunked)
+    np.testing.assert_array_equal(holdout_mask(shuffled, 0.2, "id"), whole[shuffled.index])
+    assert abs(whole.mean() - 0.2) < 0.02
+
+
+def test_holdout_split_depends_only_on_the_id():
+    df = make_frame(1000)
+    other = make_frame(1000, seed=1)
+
+    np.testing.assert_array_equal(holdout_mask(df, 0.3, "id"), holdout_mask(other, 0.3, "id"))
+    assert not np.array_equal(holdout_mask(df, 0.3), holdout_mask(other, 0.3))
+
+
+@pytest.fixture
+def ooc_config(config):
+    return {**config, "s3_csv_key": "datasets/raw.csv", "estimator": {"name": "sgd", "params": {}},
+            "out_of_core": {"enabled": True, "chunksize": 400, "sample_rows": 500, "test_rows": 200,
+                            "test_fraction": 0.2, "epochs": 2}}
+
+
+def run_main(config, df):
+    S3Handler(BUCKET, config).save_dataframe_to_s3(df, config["s3_csv_key"], index=False)
+    with mock.patch.object(train_pipeline, "load_config", return_value=config):
+        train_pipeline.main()
+
+
+def test_out_of_core_training_records_the_streamed_rows(s3, ooc_config, tracking):
+    df = make_frame(2000)
+    run_main(ooc_config, df)
+
+    train_rows = int((~holdout_mask(df, 0.2, "id")).sum())
+    lineage = S3Handler(BUCKET, ooc_config).load_json_from_s3("models/test-project_model_lineage.json")
+    assert lineage["generation"] == 0
+    assert lineage["rows"] == lineage["total_rows"] == train_rows
+
+
+def test_failed_partial_fit_stops_the_chunk_producer(s3, ooc_config, tracking):
+    iterators = []
+
+    def prefetch_iterator(*args, **kwargs):
+        iterators.append(PrefetchIterator(*args, **kwargs))
+        return iterators[-1]
+
+    with mock.patch.object(train_pipeline, "PrefetchIterator", prefetch_iterator), \
+            mock.patch("sklearn.linear_model.SGDClassifier.partial_fit", side_effect=RuntimeError("fit failed")):
+        with pytest.raises(RuntimeError, match="fit failed"):
+            run_main(ooc_config, make_frame(2000))
+
+    assert iterators and not any(iterator._thread.is_alive() for iterator in iterators)
+
+
+@pytest.mark.parametrize("fraction", [0, 1])
+def test_out_of_core_rejects_a_test_fraction_out_of_range(s3, ooc_config, fraction):
+    config = {**ooc_config, "out_of_core": {**ooc_config["out_of_core"], "test_fraction": fraction}}
+    with pytest.raises(ValueError, match="test_fraction"):
+        run_main(config, make_frame(100))
+
+
+def test_out_of_core_without_held_out_rows_fails_clearly(s3, ooc_config):
+    config = {**ooc_config, "out_of_core": {**ooc_config["out_of_core"], "test_fraction": 0.01}}
+    with pytest.raises(ValueError, match="No held-out row"):
+        run_main(config, make_frame(50, start=1))
+
+
+def test_out_of_core_rejects_incremental_retrain(ooc_config):
+    config = {**ooc_config, "data_source": "mysql", "retrain": {"mode": "incremental"},
+              "mysql_incremental": {"enabled": True}}
+    with mock.patch.object(train_pipeline, "load_config", return_value=config):
+        with pytest.raises(ValueError, match="out_of_core"):
+            train_pipeline.main()
@@ -0,0 +1,51 @@
+from unittest import mock
+
+import boto3
+from sklearn.tree import DecisionTreeClassifier
+
+from conftest import BUCKET, make_frame
+from mlops_project import predict_pipeline
+from mlops_project.utils.data_processing import DataProcessor
+from mlops_project.utils.s3_handler import S3Handler
+
+
+PREDICTIONS_KEY = "predictions/test-project_preds.csv"
+
+
+def trained(config, rows=200):
+    """Saves a model, its preprocessing state and the raw rows to score, like a training run."""
+    config = {**config, "s3_csv_key": "datasets/raw.csv"}
+    s3_handler = S3Handler(BUCKET, config)
+    df = make_frame(rows)
+    processor = DataProcessor(BUCKET, df, config)
+    processed = processor.run()
+    processor.save_state(f"models/{config['project_name']}_preprocessing.json")
+    model = DecisionTreeClassifier().fit(processed.drop(columns="y"), processed["y"])
+    s3_handler.save_model_to_s3(model, f"models/{config['project_name']}_model.pkl")
+    s3_handler.save_dataframe_to_s3(df.drop(columns="y"), "datasets/raw.csv", index=False)
+    return config, s3_handler
+
+
+def predict(config):
+    with mock.patch.object(predict_pipeline, "load_config", return_value=config), \
+            mock.patch("mlops_project.utils.mysql_handler.MySQLHandler", side_effect=ConnectionError("no server")):
+        predict_pipeline.main()
+
+
+def test_unreachable_tracking_store_does_not_fail_the_prediction(s3, config):
+    config, s3_handler = trained({**config, "instrumentation": {"mlflow": True}})
+    predict(config)
+
+    predictions = s3_handler.load_dataframe_from_s3(PREDICTIONS_KEY)
+    assert len(predictions) == 200
+
+
+def test_streamed_predictions_match_the_in_memory_ones(s3, config):
+    config, _ = trained({**config, "processing": {"compact": True}})
+    client = boto3.client("s3")
+    predict(config)
+    in_memory = client.get_object(Bucket=BUCKET, Key=PREDICTIONS_KEY)["Body"].read()
+    predict({**config, "predict_chunksize": 70})
+    streamed = client.get_object(Bucket=BUCKET, Key=PREDICTIONS_KEY)["Body"].read()
+
+    assert streamed == in_memory
@@ -0,0 +1,90 @@
+import itertools
+import os
+from unittest import mock
+
+import numpy as np
+import pytest
+from sklearn.tree import DecisionTreeClassifier
+
+from conftest import BUCKET, make_frame
+from mlops_project.utils import parallel_scoring
+from mlops_project.utils.data_processing import DataProcessor
+from mlops_project.utils.prediction import Predictor
+from mlops_project.utils.prefetch import Prefetcher, PrefetchIterator
+from mlops_project.utils.s3_handler import S3Handler
+
+MODEL_KEY = "models/test_model.pkl"
+
+
+@pytest.fixture
+def processed(s3, config):
+    df = DataProcessor(BUCKET, make_frame(200), config).run()
+    model = DecisionTreeClassifier().fit(df.drop(columns="y"), df["y"])
+    S3Handler(BUCKET, config).save_model_to_s3(model, MODEL_KEY)
+    return df
+
+
+def predictor(config, df, workers, **scoring):
+    return Predictor(BUCKET, MODEL_KEY, df, "predictions/test.csv",
+                     {**config, "scoring": {"workers": workers, **scoring}})
+
+
+def test_single_process_scoring_prefetches_the_loaded_model(config, processed):
+    scorer = predictor(config, processed, workers=1)
+    with Prefetcher() as prefetcher:
+        scorer.prefetch_model(prefetcher)
+        path, model = prefetcher.result("model")
+        assert model is not None
+        assert len(scorer.run()) == 200
+
+
+def test_multi_process_scoring_only_prefetches_the_artifact(config, processed):
+    scorer = predictor(config, processed, workers=4)
+    with Prefetcher() as prefetcher:
+        scorer.prefetch_model(prefetcher)
+        path, model = prefetcher.result("model")
+        assert model is None and os.path.exists(path)
+        assert len(scorer.run()) == 200  # One shard: loaded lazily and scored in process
+        model_dir = scorer._model_dir.name
+
+    assert not os.path.exists(model_dir)
+
+
+def test_failed_streaming_stops_the_chunk_producer(config, processed):
+    chunks = PrefetchIterator(itertools.repeat(processed), depth=2)
+    scorer = predictor(config, processed, workers=1)
+    with mock.patch.object(Predictor, "predict", side_effect=RuntimeError("scoring failed")):
+        with pytest.raises(RuntimeError, match="scoring failed"):
+            scorer.run_streaming(chunks)
+
+    assert not chunks._thread.is_alive()
+
+
+def test_sharded_scoring_matches_in_process_predictions(s3, config):
+    df = DataProcessor(BUCKET, make_frame(1000), config).run()
+    model = DecisionTreeClassifier(random_state=0).fit(df.drop(columns="y"), df["y"])
+    S3Handler(BUCKET, config).save_model_to_s3(model, MODEL_KEY)
+
+    output = predictor(config, df, workers=2, shard_rows=150).run()  # 7 shards over 2 processes
+
+    assert output.index.equals(df.index)
+    np.testing.assert_array_equal(output["prediction"], model.predict(df.drop(columns="y")))
+
+
+def test_cgroup_v1_quota_bounds_the_workers(tmp_path, monkeypatch):
+    v1 = tmp_path / "cpu"
+    v1.mkdir()
+    (v1 / "cpu.cfs_quota_us").write_text("200000\n")
+    (v1 / "cpu.cfs_period_us").write_text("100000\n")
+    monkeypatch.setattr(parallel_scoring, "_CGROUP_V2_CPU_MAX", str(tmp_path / "missing"))
+    monkeypatch.setattr(parallel_scoring, "_CGROUP_V1_CPU_DIR", str(v1))
+    assert parallel_scoring.available_cpus() == 2
+
+    (v1 / "cpu.cfs_quota_us").write_text("-1\n")  # No quota: the affinity mask
+    assert parallel_scoring.available_cpus() == len(os.sched_getaffinity(0))
+
+
+def test_cgroup_v2_quota_bounds_the_workers(tmp_path, monkeypatch):
+    (tmp_path / "cpu.max").write_text("150000 100000\n")
+    monkeypatch.setattr(parallel_scoring, "_CGROUP_V2_CPU_MAX", str(tmp_path / "cpu.max"))
+    assert parallel_scoring.available_cpus() == 1
@@ -0,0 +1,59 @@
+import boto3
+import numpy as np
+import pytest
+from sklearn.ensemble import HistGradientBoostingClassifier
+
+from conftest import BUCKET
+from mlops_project.utils.s3_handler import S3Handler
+
+MODEL_KEY = "models/test_model.pkl"
+
+
+@pytest.fixture
+def boosting_model():
+    rng = np.random.default_rng(0)
+    X = rng.random((300, 3))
+    y = (X[:, 0] > 0.5).astype(int)
+    return HistGradientBoostingClassifier(max_iter=5, early_stopping=False).fit(X, y), X, y
+
+
+def test_models_are_memory_mapped_by_default(s3, config, boosting_model):
+    s3_handler = S3Handler(BUCKET, config)
+    s3_handler.save_model_to_s3(boosting_model[0], MODEL_KEY)
+
+    model = s3_handler.load_model_from_s3(MODEL_KEY)
+    arrays = [predictor.nodes for predictors in model._predictors for predictor in predictors]
+    assert not any(array.flags.writeable for array in arrays)
+
+
+def test_model_loaded_for_training_is_writable(s3, config, boosting_model):
+    model, X, y = boosting_model
+    s3_handler = S3Handler(BUCKET, config)
+    s3_handler.save_model_to_s3(model, MODEL_KEY)
+
+    model = s3_handler.load_model_from_s3(MODEL_KEY, mmap=False)
+    model.set_params(warm_start=True, max_iter=10).fit(X, y)  # Fails on read-only mapped arrays
+    assert model.n_iter_ == 10
+
+
+def test_multipart_writer_uploads_several_parts(s3, config):
+    data = np.random.default_rng(0).bytes(12 * 1024 ** 2)
+    s3_handler = S3Handler(BUCKET, config)
+    with s3_handler.open_multipart_upload("streamed.bin", part_size=5 * 1024 ** 2) as sink:
+        for start in range(0, len(data), 1024 ** 2):
+            sink.write(data[start:start + 1024 ** 2])
+
+    assert len(sink.parts) == 3
+    assert boto3.client("s3").get_object(Bucket=BUCKET, Key="streamed.bin")["Body"].read() == data
+
+
+def test_multipart_writer_aborts_on_error(s3, config):
+    s3_handler = S3Handler(BUCKET, config)
+    with pytest.raises(RuntimeError):
+        with s3_handler.open_multipart_upload("streamed.bin") as sink:
+            sink.write(b"partial")
+            raise RuntimeError("scoring failed")
+
+    client = boto3.client("s3")
+    assert "Contents" not in client.list_objects_v2(Bucket=BUCKET)
+    assert "Uploads" not in client.list_multipart_uploads(Bucket=BUCKET)
@@ -0,0 +1,93 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+from sklearn.tree import DecisionTreeClassifier
+
+from conftest import BUCKET, make_frame
+from mlops_project.utils.data_processing import DataProcessor
+from mlops_project.utils.s3_handler import S3Handler
+from mlops_project.utils.scoring_service import MicroBatcher, ScoringService, _ScoringHTTPServer
+
+
+def test_concurrent_rows_are_scored_in_one_batch():
+    calls = []
+
+    def predict(rows):
+        calls.append(rows)
+        return [row["x"] * 10 for row in rows]
+
+    batcher = MicroBatcher(predict, max_batch_size=16, max_wait_ms=2000)
+    with ThreadPoolExecutor(16) as pool:
+        results = list(pool.map(lambda x: batcher.submit({"x": x}).result(timeout=5), range(16)))
+    batcher.close()
+
+    assert results == [x * 10 for x in range(16)]
+    assert len(calls) == 1 and sorted(row["x"] for row in calls[0]) == list(range(16))
+    assert (batcher.batches, batcher.rows) == (1, 16)
+
+
+def test_rows_keep_their_submission_order_in_the_batch():
+    batcher = MicroBatcher(lambda rows: [row["x"] for row in rows], max_batch_size=8, max_wait_ms=2000)
+    futures = [batcher.submit({"x": x}) for x in range(8)]
+    batcher.close()
+
+    assert [future.result() for future in futures] == list(range(8))
+    assert batcher.batches == 1
+
+
+@pytest.fixture
+def service(s3, config):
+    df = make_frame(200)
+    processor = DataProcessor(BUCKET, df, config)
+    processed = processor.run()
+    processor.save_state(f"models/{config['project_name']}_preprocessing.json")
+    model = DecisionTreeClassifier().fit(processed.drop(columns="y"), processed["y"])
+    S3Handler(BUCKET, config).save_model_to_s3(model, f"models/{config['project_name']}_model.pkl")
+
+    service = ScoringService(BUCKET, config)
+    server = _ScoringHTTPServer(("127.0.0.1", 0), service._handler_class())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    service.url = f"http://127.0.0.1:{server.server_address[1]}/predict"
+    yield service
+    server.shutdown()
+    server.server_close()
+    service.batcher.close()
+
+
+def post(url, body: bytes):
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def row():
+    return make_frame(1, seed=1).drop(columns="y").iloc[0].to_dict()
+
+
+def test_rows_are_scored_over_http(service):
+    status, body = post(service.url, json.dumps({**row(), "id": 7}, default=int).encode())
+    assert status == 200 and body["prediction"] in (0, 1)
+
+    status, body = post(service.url, json.dumps([row(), row()], default=int).encode())
+    assert status == 200 and len(body["predictions"]) == 2
+
+
+def test_bad_input_is_a_client_error(service):
+    assert post(service.url, b"{not json")[0] == 400
+    with mock.patch.object(service.processor, "transform", side_effect=KeyError("a")):
+        assert post(service.url, json.dumps(row(), default=int).encode())[0] == 400
+
+
+def test_model_failure_is_a_server_error(service):
+    with mock.patch.object(service.predictor, "predict", side_effect=RuntimeError("model failed")):
+        status, body = post(service.url, json.dumps(row(), default=int).encode())
+    assert (status, body["error"]) == (500, "model failed")
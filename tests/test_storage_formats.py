@@ -0,0 +1,67 @@
+import gzip
+from unittest import mock
+
+import boto3
+import pandas as pd
+import pytest
+from botocore.response import StreamingBody
+
+from conftest import BUCKET, make_frame
+from mlops_project.utils.s3_handler import S3Handler
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet", "arrow"])
+def test_datasets_round_trip_in_every_format(s3, config, fmt):
+    s3_handler = S3Handler(BUCKET, config)
+    df = make_frame(50).set_index("id")
+    s3_handler.save_dataframe_to_s3(df, f"datasets/test.{fmt}")
+
+    loaded = s3_handler.load_dataframe_from_s3(f"datasets/test.{fmt}")
+    if fmt == "csv":
+        loaded = loaded.set_index("id")
+    pd.testing.assert_frame_equal(loaded, df, check_exact=fmt != "csv")
+
+    chunks = list(s3_handler.iter_dataframe_from_s3(f"datasets/test.{fmt}", 20))
+    assert sum(len(chunk) for chunk in chunks) == 50
+
+
+def test_arrow_chunks_are_decoded_one_record_batch_at_a_time(s3, config, monkeypatch):
+    monkeypatch.setattr("mlops_project.utils.s3_handler.ARROW_BATCH_ROWS", 30)
+    s3_handler = S3Handler(BUCKET, config)
+    df = make_frame(100).set_index("id")
+    s3_handler.save_dataframe_to_s3(df, "datasets/test.arrow")
+
+    chunks = list(s3_handler.iter_dataframe_from_s3("datasets/test.arrow", 20))
+    assert [len(chunk) for chunk in chunks] == [20, 10, 20, 10, 20, 10, 10]  # Record batches of 30 rows
+    pd.testing.assert_frame_equal(pd.concat(chunks), df)
+
+
+def test_csv_columns_are_selected_by_the_parser(s3, config):
+    s3_handler = S3Handler(BUCKET, config)
+    df = make_frame(50)
+    s3_handler.save_dataframe_to_s3(df, "datasets/test.csv", index=False)
+
+    with mock.patch("pandas.read_csv", wraps=pd.read_csv) as read_csv:
+        loaded = s3_handler.load_dataframe_from_s3("datasets/test.csv", columns=["b", "a"])
+    assert read_csv.call_args.kwargs["usecols"] == ["b", "a"]
+    pd.testing.assert_frame_equal(loaded, df[["b", "a"]])
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_csv_is_parsed_from_the_body_stream(s3, config, compress):
+    df = make_frame(5000)
+    raw = df.to_csv(index=False).encode()
+    boto3.client("s3").put_object(Bucket=BUCKET, Key="datasets/raw.csv", Body=gzip.compress(raw) if compress else raw)
+    s3_handler = S3Handler(BUCKET, config)
+
+    read = StreamingBody.read
+    with mock.patch.object(StreamingBody, "read", autospec=True, side_effect=read) as body_read:
+        loaded = s3_handler.load_csv_from_s3("datasets/raw.csv")
+        chunks = list(s3_handler.load_csv_from_s3("datasets/raw.csv", chunksize=1000))
+
+    # Bounded reads of the body: the object is never read whole
+    sizes = [call.args[1] if len(call.args) > 1 else call.kwargs.get("amt") for call in body_read.call_args_list]
+    assert sizes and all(size is not None and size <= 1024 ** 2 for size in sizes)
+    pd.testing.assert_frame_equal(loaded, df)
+    assert [len(chunk) for chunk in chunks] == [1000] * 5
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), df)
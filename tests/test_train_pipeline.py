@@ -0,0 +1,76 @@
+from unittest import mock
+
+import boto3
+import pytest
+
+from conftest import BUCKET, make_frame
+from mlops_project import train_pipeline
+from mlops_project.utils.s3_handler import S3Handler
+from mlops_project.utils.stage_cache import StageCache
+
+
+def test_train_key_changes_with_the_model_artifact_format(s3, config):
+    stage_cache = StageCache.from_config({**config, "stage_cache": {"enabled": True}}, S3Handler(s3, config))
+    fingerprint = {"source": "csv_s3", "rows": len(make_frame(10))}
+    keys = {train_pipeline._train_key(stage_cache, fingerprint, {**config, "model_artifact": artifact})
+            for artifact in ({"compress": None}, {"compress": "zlib", "level": 3}, {"compress": "zlib", "level": 9})}
+    assert len(keys) == 3
+
+
+@pytest.mark.parametrize("source", ["csv_s3", "csv_url", "mysql"])
+def test_incremental_retrain_requires_incremental_loading(config, source):
+    config = {**config, "data_source": source, "retrain": {"mode": "incremental"}}
+    with mock.patch.object(train_pipeline, "load_config", return_value=config):
+        with pytest.raises(ValueError, match="mysql_incremental.enabled"):
+            train_pipeline.main()
+
+
+@pytest.fixture
+def cached_config(config, tmp_path):
+    return {**config, "s3_csv_key": "datasets/raw.csv", "stage_cache": {"enabled": True, "dir": str(tmp_path / "cache")}}
+
+
+def run_main(config):
+    caches = []
+    build = StageCache.from_config
+
+    def from_config(*args):
+        caches.append(build(*args))
+        return caches[-1]
+
+    with mock.patch.object(train_pipeline, "load_config", return_value=config), \
+            mock.patch.object(train_pipeline.StageCache, "from_config", side_effect=from_config):
+        train_pipeline.main()
+    return caches[0].stats()
+
+
+@pytest.mark.parametrize("backend", ["s3", "local"])
+def test_rerun_restores_the_cached_stages(s3, cached_config, tracking, backend):
+    config = {**cached_config, "stage_cache": {**cached_config["stage_cache"], "backend": backend}}
+    s3_handler = S3Handler(BUCKET, config)
+    s3_handler.save_dataframe_to_s3(make_frame(300), config["s3_csv_key"], index=False)
+    outputs = ["models/test-project_model.pkl", "models/test-project_model_lineage.json",
+               "datasets/test-project_X_train.csv"]
+
+    first = run_main(config)
+    assert first == {"process": {"hits": 0, "misses": 1}, "train": {"hits": 0, "misses": 1}}
+    run_id = s3_handler.load_json_from_s3(outputs[1])["run_id"]
+
+    client = boto3.client("s3")
+    for key in outputs:
+        client.delete_object(Bucket=BUCKET, Key=key)
+    with mock.patch.object(train_pipeline.ModelTrainer, "run") as train:
+        second = run_main(config)
+
+    train.assert_not_called()
+    assert second == {"process": {"hits": 1, "misses": 0}, "train": {"hits": 1, "misses": 0}}
+    assert all(client.head_object(Bucket=BUCKET, Key=key) for key in outputs)
+    assert s3_handler.load_json_from_s3(outputs[1])["run_id"] == run_id
+
+
+def test_changed_training_config_only_misses_the_train_stage(s3, cached_config, tracking):
+    S3Handler(BUCKET, cached_config).save_dataframe_to_s3(make_frame(300), cached_config["s3_csv_key"], index=False)
+    run_main(cached_config)
+
+    stats = run_main({**cached_config, "estimator": {"name": "random_forest", "params": {"n_estimators": 5}}})
+    assert stats == {"process": {"hits": 1, "misses": 0}, "train": {"hits": 0, "misses": 1}}